@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.utils.translation import gettext_lazy as _
 
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
@@ -43,7 +42,8 @@ class AssortmentAdmin(ImportExportModelAdmin):
     list_display = (
         "title",
         "consumable",
-        "count_categories",
+        "category_count",
+        "product_count",
         "modified",
     )
     list_filter = (
@@ -55,13 +55,6 @@ class AssortmentAdmin(ImportExportModelAdmin):
     ]
     resource_classes = [AssortmentResource]
 
-    def count_categories(self, obj):
-        """
-        Count related categories.
-        """
-        return obj.category_set.count()
-    count_categories.short_description = _("Categories")
-
 
 class AssortmentInline(admin.StackedInline):
     """
@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.utils.translation import gettext_lazy as _
 
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
@@ -45,7 +44,7 @@ class CategoryAdmin(ImportExportModelAdmin):
     list_display = (
         "title",
         "assortment",
-        "count_products",
+        "product_count",
         "modified",
     )
     list_filter = (
@@ -56,13 +55,6 @@ class CategoryAdmin(ImportExportModelAdmin):
     ]
     resource_classes = [CategoryResource]
 
-    def count_products(self, obj):
-        """
-        Count related products.
-        """
-        return obj.product_set.count()
-    count_products.short_description = _("Products")
-
 
 class CategoryInline(admin.StackedInline):
     """
@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.utils.translation import gettext_lazy as _
 
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
@@ -33,17 +32,12 @@ class ConsumableAdmin(ImportExportModelAdmin):
     ]
     list_display = (
         "title",
-        "count_assortments",
+        "assortment_count",
+        "category_count",
+        "product_count",
         "modified",
     )
     inlines = [
         AssortmentInline,
     ]
     resource_classes = [ConsumableResource]
-
-    def count_assortments(self, obj):
-        """
-        Count related assortments.
-        """
-        return obj.assortment_set.count()
-    count_assortments.short_description = _("Assortments")
@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.utils.translation import gettext_lazy as _
 
 from ..forms import ShoppingAdminForm, ShoppingItemInlineForm
@@ -35,7 +35,10 @@ class ShoppingAdmin(admin.ModelAdmin):
         "created",
         "planning",
         "done",
+        "template",
     )
+    list_filter = ["template", "done"]
+    actions = ["duplicate", "duplicate_undone", "merge"]
 
     def get_title(self, obj):
         """
@@ -44,6 +47,31 @@ class ShoppingAdmin(admin.ModelAdmin):
         return str(obj)
     get_title.short_description = _("Title")
 
+    def clone_queryset(self, request, queryset, skip_done=False):
+        """
+        Clone each Shopping object from queryset with its items.
+        """
+        for shopping in queryset:
+            shopping.clone(skip_done=skip_done)
+
+        self.message_user(
+            request,
+            _("{count} shopping list(s) have been duplicated.").format(
+                count=len(queryset)
+            ),
+            messages.SUCCESS,
+        )
+
+    @admin.action(description=_("Duplicate selected shopping lists"))
+    def duplicate(self, request, queryset):
+        self.clone_queryset(request, queryset)
+
+    @admin.action(
+        description=_("Duplicate selected shopping lists without their done items")
+    )
+    def duplicate_undone(self, request, queryset):
+        self.clone_queryset(request, queryset, skip_done=True)
+
     def save_formset(self, request, form, formset, change):
         """
         Customize inlines item saving (because it can not be done on the inline form
@@ -52,3 +80,35 @@ class ShoppingAdmin(admin.ModelAdmin):
         super().save_formset(request, form, formset, change)
 
         form.instance.update_shopping_done()
+
+    @admin.action(
+        description=_(
+            "Merge items of selected shopping lists into the one with the latest "
+            "planning date"
+        )
+    )
+    def merge(self, request, queryset):
+        """
+        Merge items of selected lists into the latest planned one, other lists are
+        left unchanged.
+        """
+        shoppings = list(queryset.order_by("-planning", "-id"))
+        if len(shoppings) < 2:
+            self.message_user(
+                request,
+                _("At least two shopping lists must be selected to merge them."),
+                messages.WARNING,
+            )
+            return
+
+        target = shoppings[0]
+        merged = target.merge(shoppings[1:])
+
+        self.message_user(
+            request,
+            _("{count} product(s) have been merged into '{target}'.").format(
+                count=len(merged),
+                target=target,
+            ),
+            messages.SUCCESS,
+        )
@@ -1,4 +1,4 @@
-from .models import Shopping
+from .utils.inventory import find_request_snapshot, get_shopping_inventory
 
 
 def session_data_processor(request):
@@ -6,6 +6,10 @@ def session_data_processor(request):
     A template context processor to discover for some references in session, resolve
     them and inject them in a template context.
 
+    The opened shopping inventory is resolved to the snapshot already built for the
+    request if any (like from the shopping detail view), else to its cached data so
+    it does not cost any query once it has been cached.
+
     Arguments:
         request (object): A Django Request object.
 
@@ -22,11 +26,12 @@ def session_data_processor(request):
         del request.session["atoum_shopping_inventory"]
     # Stored ID in session for an authenticated user
     elif shopping_id:
-        try:
-            shopping_obj = Shopping.objects.filter(**{"pk": shopping_id}).get()
-        except Shopping.DoesNotExist:
+        shopping_obj = (
+            find_request_snapshot(request, shopping_id) or
+            get_shopping_inventory(shopping_id)
+        )
+        if shopping_obj is None:
             # Purge session item if it does not exists anymore
             del request.session["atoum_shopping_inventory"]
-            shopping_obj = None
 
     return {"shopping_inventory": shopping_obj}
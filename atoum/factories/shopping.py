@@ -65,6 +65,7 @@ class ShoppingFactory(factory.django.DjangoModelFactory):
             # done because model doesn't do it itself
             if len(dones) == len(extracted):
                 self.done = True
+                self.save()
 
 
 class ShoppingItemFactory(factory.django.DjangoModelFactory):
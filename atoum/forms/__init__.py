@@ -1,7 +1,9 @@
 from .category import CategoryAdminForm
 from .product import ProductAdminForm
 from .search import GlobalSearchForm
-from .shopping import ShoppingAdminForm, ShoppingItemInlineForm
+from .shopping import (
+    ShoppingAdminForm, ShoppingItemInlineForm, ShoppingQuickAddForm,
+)
 
 
 __all__ = [
@@ -10,4 +12,5 @@ __all__ = [
     "ProductAdminForm",
     "ShoppingAdminForm",
     "ShoppingItemInlineForm",
+    "ShoppingQuickAddForm",
 ]
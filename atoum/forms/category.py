@@ -30,7 +30,7 @@ class CategoryAdminForm(autocomplete.FutureModelForm):
         # Override Assortment model form field to customize option label and enable
         # DAL autocompletion
         self.fields["assortment"] = AssortmentBreadcrumbChoiceField(
-            queryset=Assortment.objects.all().select_related("consumable"),
+            queryset=Assortment.objects.all(),
             required=True,
             blank=False,
             widget=autocomplete.ModelSelect2(
@@ -32,10 +32,7 @@ class ProductAdminForm(autocomplete.FutureModelForm):
         # DAL autocompletion
         self.fields["category"] = CategoryBreadcrumbChoiceField(
             label=_("Category"),
-            queryset=Category.objects.all().select_related(
-                "assortment",
-                "assortment__consumable"
-            ),
+            queryset=Category.objects.all(),
             required=True,
             blank=False,
             widget=autocomplete.ModelSelect2(
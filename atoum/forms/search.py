@@ -1,6 +1,5 @@
 from haystack.forms import ModelSearchForm
 
-from ..models import Assortment, Category, Product
 from ..form_helpers import AdvancedSearchFormHelper
 from ..utils.text import normalize_text
 
@@ -44,32 +43,10 @@ class GlobalSearchForm(ModelSearchForm):
         sqs = sqs.models(*self.get_models())
 
         if self.load_all:
-            # Get model objects from search result references
+            # Get model objects from search result references. Assortment parents
+            # come from the hierarchy snapshot and Category or Product parents from
+            # their denormalized hierarchy columns, so there is no relationship to
+            # select
             sqs = sqs.load_all()
 
-            # Define Assortment relationships to select in queryset instead of getting
-            # them on their own querysets
-            sqs = sqs.load_all_queryset(
-                Assortment,
-                Assortment.objects.all().select_related(
-                    *Assortment.HIERARCHY_SELECT_RELATED
-                )
-            )
-
-            # Define Category relationships to select
-            sqs = sqs.load_all_queryset(
-                Category,
-                Category.objects.all().select_related(
-                    *Category.HIERARCHY_SELECT_RELATED
-                )
-            )
-
-            # Define Product relationships to select
-            sqs = sqs.load_all_queryset(
-                Product,
-                Product.objects.all().select_related(
-                    *Product.HIERARCHY_SELECT_RELATED
-                )
-            )
-
         return sqs
@@ -1,8 +1,12 @@
+import re
+
 from django import forms
+from django.utils.translation import gettext_lazy as _
 
 from dal import autocomplete
 
 from ..models import Product, Shopping, ShoppingItem
+from ..models.mixins import sort_key_segment
 
 
 class ProductBreadcrumbChoiceField(forms.ModelChoiceField):
@@ -35,11 +39,7 @@ class ShoppingItemInlineForm(autocomplete.FutureModelForm):
         # Override Product model form field to customize option label and enable
         # DAL autocompletion
         self.fields["product"] = ProductBreadcrumbChoiceField(
-            queryset=Product.objects.all().select_related(
-                "category",
-                "category__assortment",
-                "category__assortment__consumable"
-            ),
+            queryset=Product.objects.all(),
             required=True,
             blank=False,
             widget=autocomplete.ModelSelect2(
@@ -47,3 +47,106 @@ class ShoppingItemInlineForm(autocomplete.FutureModelForm):
                 attrs={"data-html": True},
             ),
         )
+
+
+class ShoppingQuickAddForm(forms.Form):
+    """
+    Form to add products to a Shopping list from a pasted text.
+
+    Each line is a product name optionally starting with a quantity, like
+    ``2 Lait demi-écrémé`` or ``2x Lait demi-écrémé``. A line without quantity adds
+    a single product. Names are compared to Product titles once normalized (without
+    accents and in lowercase).
+
+    Arguments:
+        shopping (atoum.models.Shopping): The Shopping object to fill.
+    """
+    line_pattern = re.compile(r"^(?:(?P<quantity>[1-9]\d*)\s*[xX]?\s+)?(?P<name>.+)$")
+
+    text = forms.CharField(
+        label=_("Products"),
+        widget=forms.Textarea(attrs={"rows": 8}),
+        help_text=_(
+            "One product per line, optionally starting with a quantity like "
+            "'2 Milk'."
+        ),
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.shopping = kwargs.pop("shopping")
+
+        super().__init__(*args, **kwargs)
+
+    def clean_text(self):
+        """
+        Parse text lines.
+
+        Returns:
+            list: A tuple of line, quantity and normalized name for each non empty
+            line.
+
+        Raises:
+            django.forms.ValidationError: If a line quantity is greater than
+            ``ShoppingItem.MAX_QUANTITY``.
+        """
+        lines = []
+        oversized = []
+        for line in self.cleaned_data["text"].splitlines():
+            line = " ".join(line.split())
+            if not line:
+                continue
+
+            matched = self.line_pattern.match(line)
+            quantity = int(matched.group("quantity") or 1)
+            if quantity > ShoppingItem.MAX_QUANTITY:
+                oversized.append(line)
+                continue
+
+            lines.append((line, quantity, sort_key_segment(matched.group("name"))))
+
+        if oversized:
+            raise forms.ValidationError(
+                _("Quantity can not be greater than %(limit)s: %(lines)s"),
+                code="quantity",
+                params={
+                    "limit": ShoppingItem.MAX_QUANTITY,
+                    "lines": ", ".join(oversized),
+                },
+            )
+
+        return lines
+
+    def save(self):
+        """
+        Resolve all names with a single query then add the matched products with
+        ``Shopping.add_items()``.
+
+        A line is matched only if its name resolves to a single Product. Quantities
+        of a same Product are summed together and added to the quantity of an
+        existing item, which is set back as undone.
+
+        Returns:
+            tuple: The list of added Product ids and the list of unmatched lines.
+        """
+        lines = self.cleaned_data["text"]
+
+        resolved = {}
+        for title_key, product_id in Product.objects.filter(
+            title_key__in={key for line, quantity, key in lines}
+        ).order_by().values_list("title_key", "id"):
+            resolved.setdefault(title_key, []).append(product_id)
+
+        quantities = {}
+        unmatched = []
+        for line, quantity, key in lines:
+            product_ids = resolved.get(key, [])
+            if len(product_ids) != 1:
+                unmatched.append(line)
+                continue
+
+            product_id = product_ids[0]
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+        self.shopping.add_items(quantities)
+
+        return list(quantities), unmatched
@@ -0,0 +1,89 @@
+"""
+Command to backfill or verify denormalized hierarchy columns.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from atoum.models import Assortment, Category, Product
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the denormalized hierarchy columns (consumable, assortment, slug path,
+    title path and sort key) of all assortments, categories and products, or only
+    verify them.
+
+    Sort keys are rebuilt from the sort key of parent, the own segment of each
+    object is kept since it is normalized from its title on save.
+
+    Attributes:
+        HIERARCHY_MODELS (list): Models with denormalized hierarchy columns. Order
+            does matter since a level is computed from its parent level.
+    """
+    help = (
+        "Rebuild the denormalized hierarchy columns of all assortments, categories "
+        "and products."
+    )
+
+    HIERARCHY_MODELS = [
+        Assortment,
+        Category,
+        Product,
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help=(
+                "Only count objects with outdated hierarchy columns without any "
+                "change. The command fails if there is any."
+            ),
+        )
+
+    def verify(self):
+        """
+        Count objects with outdated hierarchy columns for each model.
+
+        Returns:
+            integer: Total of outdated objects.
+        """
+        total = 0
+
+        for model in self.HIERARCHY_MODELS:
+            count = model.objects.hierarchy_drift().count()
+            total += count
+            self.stdout.write(
+                "- {name} object(s) with outdated hierarchy: {count}".format(
+                    name=model.__name__,
+                    count=count,
+                )
+            )
+
+        return total
+
+    def rebuild(self):
+        """
+        Rebuild hierarchy columns of every objects with an update query per model.
+        """
+        with transaction.atomic():
+            for model in self.HIERARCHY_MODELS:
+                count = model.objects.all().update_hierarchy()
+                self.stdout.write(
+                    "- {name} object(s) rebuilt: {count}".format(
+                        name=model.__name__,
+                        count=count,
+                    )
+                )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("=== Hierarchy paths ==="))
+
+        if options["verify"]:
+            if self.verify() > 0:
+                raise CommandError(
+                    "Some hierarchy columns are outdated, run this command without "
+                    "'--verify' to rebuild them."
+                )
+        else:
+            self.rebuild()
@@ -0,0 +1,87 @@
+"""
+Command to repair or verify denormalized children counters.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from atoum.models import Assortment, Category, Consumable
+
+
+class Command(BaseCommand):
+    """
+    Update the children counters of all consumables, assortments and categories, or
+    only verify them.
+
+    Counters are computed from the denormalized hierarchy columns so these ones
+    must be correct, see the ``hierarchy_paths`` command.
+
+    Attributes:
+        COUNTER_MODELS (list): Models with children counter columns.
+    """
+    help = (
+        "Update the children counters of all consumables, assortments and "
+        "categories."
+    )
+
+    COUNTER_MODELS = [
+        Consumable,
+        Assortment,
+        Category,
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help=(
+                "Only count objects with wrong counters without any change. The "
+                "command fails if there is any."
+            ),
+        )
+
+    def verify(self):
+        """
+        Count objects with wrong counters for each model.
+
+        Returns:
+            integer: Total of wrong objects.
+        """
+        total = 0
+
+        for model in self.COUNTER_MODELS:
+            count = model.objects.counter_drift().count()
+            total += count
+            self.stdout.write(
+                "- {name} object(s) with wrong counters: {count}".format(
+                    name=model.__name__,
+                    count=count,
+                )
+            )
+
+        return total
+
+    def recount(self):
+        """
+        Update counters of every objects with an update query per model.
+        """
+        with transaction.atomic():
+            for model in self.COUNTER_MODELS:
+                count = model.objects.all().update_counters()
+                self.stdout.write(
+                    "- {name} object(s) recounted: {count}".format(
+                        name=model.__name__,
+                        count=count,
+                    )
+                )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("=== Recount ==="))
+
+        if options["verify"]:
+            if self.verify() > 0:
+                raise CommandError(
+                    "Some counters are wrong, run this command without '--verify' "
+                    "to repair them."
+                )
+        else:
+            self.recount()
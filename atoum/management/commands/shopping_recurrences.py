@@ -0,0 +1,62 @@
+"""
+Command to create the shopping lists of recurring templates.
+"""
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from atoum.models import Shopping
+
+
+class Command(BaseCommand):
+    """
+    Create the lists of every recurring template which planning date is reached.
+
+    A template late from many recurrences has all its missing lists created. Each
+    list is created with its items copied in a single bulk insert.
+    """
+    help = (
+        "Create the shopping lists of recurring templates which planning date is "
+        "reached."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=0,
+            help=(
+                "Also create the lists planned in the given number of next days. "
+                "Default to 0 so only the lists planned until now are created."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("=== Shopping recurrences ==="))
+
+        until = timezone.now() + datetime.timedelta(days=options["ahead"])
+        templates = Shopping.objects.filter(
+            template=True,
+            recurrence__gt=0,
+            planning__lte=until,
+        )
+
+        created = 0
+        for template in templates:
+            while template.planning <= until:
+                shopping = template.create_recurrence()
+                # Recurrence has been created from elsewhere in the meantime
+                if shopping is None:
+                    break
+
+                created += 1
+                self.stdout.write(
+                    "- Created list #{id} from '{template}' planned for {date}".format(
+                        id=shopping.id,
+                        template=template,
+                        date=shopping.planning.isoformat(),
+                    )
+                )
+
+        self.stdout.write("Created list(s): {}".format(created))
@@ -0,0 +1,51 @@
+"""
+Command to export the catalog tree as JSON or NDJSON.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from atoum.utils.tree import CatalogTreeStreamer
+
+
+class Command(BaseCommand):
+    """
+    Stream the full catalog tree from consumables to products as JSON or NDJSON
+    into the standard output or a file.
+    """
+    help = (
+        "Export the full catalog tree from consumables to products as JSON or "
+        "NDJSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=["json", "ndjson"],
+            default="json",
+            help="Output format.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.ATOUM_TREE_EXPORT_CHUNK_SIZE,
+            help="Number of rows fetched at once from database for each level.",
+        )
+        parser.add_argument(
+            "--output",
+            metavar="FILEPATH",
+            help="File path to write the export instead of the standard output.",
+        )
+
+    def handle(self, *args, **options):
+        streamer = CatalogTreeStreamer(chunk_size=options["chunk_size"])
+        chunks = streamer.stream(format_name=options["format"])
+
+        if options["output"]:
+            with Path(options["output"]).open("w") as fp:
+                for chunk in chunks:
+                    fp.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
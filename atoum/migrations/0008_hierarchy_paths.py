@@ -0,0 +1,147 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import CharField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def fill_hierarchy_paths(apps, schema_editor):
+    """
+    Fill the new denormalized hierarchy columns for existing categories then
+    products.
+    """
+    Assortment = apps.get_model("atoum", "Assortment")
+    Category = apps.get_model("atoum", "Category")
+    Product = apps.get_model("atoum", "Product")
+
+    assortments = Assortment.objects.filter(pk=OuterRef("assortment_id"))
+    Category.objects.update(
+        consumable_id=Subquery(assortments.values("consumable_id")[:1]),
+        slug_path=Concat(
+            Subquery(assortments.values("consumable__slug")[:1]),
+            Value("/"),
+            Subquery(assortments.values("slug")[:1]),
+            Value("/"),
+            F("slug"),
+            output_field=CharField(),
+        ),
+        title_path=Concat(
+            Subquery(assortments.values("consumable__title")[:1]),
+            Value("\x1f"),
+            Subquery(assortments.values("title")[:1]),
+            Value("\x1f"),
+            F("title"),
+            output_field=CharField(),
+        ),
+    )
+
+    categories = Category.objects.filter(pk=OuterRef("category_id"))
+    Product.objects.update(
+        consumable_id=Subquery(categories.values("consumable_id")[:1]),
+        assortment_id=Subquery(categories.values("assortment_id")[:1]),
+        slug_path=Concat(
+            Subquery(categories.values("slug_path")[:1]),
+            Value("/"),
+            F("slug"),
+            output_field=CharField(),
+        ),
+        title_path=Concat(
+            Subquery(categories.values("title_path")[:1]),
+            Value("\x1f"),
+            F("title"),
+            output_field=CharField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0007_shopping_products"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="consumable",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="atoum.consumable",
+                verbose_name="Consumable",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="slug_path",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=400,
+                verbose_name="slug path",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="title_path",
+            field=models.CharField(
+                default="", editable=False, max_length=310, verbose_name="title path"
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="assortment",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="atoum.assortment",
+                verbose_name="Assortment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="consumable",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="atoum.consumable",
+                verbose_name="Consumable",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="slug_path",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=530,
+                verbose_name="slug path",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="title_path",
+            field=models.CharField(
+                default="", editable=False, max_length=410, verbose_name="title path"
+            ),
+        ),
+        migrations.RunPython(
+            fill_hierarchy_paths,
+            migrations.RunPython.noop,
+        ),
+    ]
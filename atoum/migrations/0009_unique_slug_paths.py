@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0008_hierarchy_paths"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="category",
+            name="slug_path",
+            field=models.CharField(
+                default="",
+                editable=False,
+                max_length=400,
+                unique=True,
+                verbose_name="slug path",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="slug_path",
+            field=models.CharField(
+                default="",
+                editable=False,
+                max_length=530,
+                unique=True,
+                verbose_name="slug path",
+            ),
+        ),
+    ]
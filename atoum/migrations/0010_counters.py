@@ -0,0 +1,96 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef("pk")}).order_by().values(
+                field
+            ).annotate(total=Count("pk")).values("total")[:1]
+        ),
+        0,
+    )
+
+
+def fill_counters(apps, schema_editor):
+    """
+    Fill the new counter columns for existing consumables, assortments and
+    categories.
+    """
+    Consumable = apps.get_model("atoum", "Consumable")
+    Assortment = apps.get_model("atoum", "Assortment")
+    Category = apps.get_model("atoum", "Category")
+    Product = apps.get_model("atoum", "Product")
+
+    Consumable.objects.update(
+        assortment_count=count_subquery(Assortment, "consumable"),
+        category_count=count_subquery(Category, "consumable"),
+        product_count=count_subquery(Product, "consumable"),
+    )
+    Assortment.objects.update(
+        category_count=count_subquery(Category, "assortment"),
+        product_count=count_subquery(Product, "assortment"),
+    )
+    Category.objects.update(
+        product_count=count_subquery(Product, "category"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0009_unique_slug_paths"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assortment",
+            name="category_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="categories count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="assortment",
+            name="product_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="products count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="product_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="products count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="consumable",
+            name="assortment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="assortments count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="consumable",
+            name="category_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="categories count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="consumable",
+            name="product_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="products count"
+            ),
+        ),
+        migrations.RunPython(
+            fill_counters,
+            migrations.RunPython.noop,
+        ),
+    ]
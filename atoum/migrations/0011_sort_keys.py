@@ -0,0 +1,103 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:49
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def fill_sort_keys(apps, schema_editor):
+    """
+    Fill the new sort keys level by level since they are normalized from titles.
+    """
+    def segment(title):
+        return unicodedata.normalize("NFKD", title).encode(
+            "ascii", "ignore"
+        ).decode("ascii").lower()
+
+    levels = [
+        (apps.get_model("atoum", "Consumable"), None),
+        (apps.get_model("atoum", "Assortment"), "consumable_id"),
+        (apps.get_model("atoum", "Category"), "assortment_id"),
+        (apps.get_model("atoum", "Product"), "category_id"),
+    ]
+
+    parents = {}
+    for model, parent_field in levels:
+        keys = {}
+        batch = []
+        fields = ["id", "title"] + ([parent_field] if parent_field else [])
+        for obj in model.objects.only(*fields).iterator(chunk_size=2000):
+            obj.sort_key = segment(obj.title)
+            if parent_field:
+                obj.sort_key = parents[getattr(obj, parent_field)] + "\x1f" + (
+                    obj.sort_key
+                )
+            keys[obj.id] = obj.sort_key
+            batch.append(obj)
+
+            if len(batch) >= 500:
+                model.objects.bulk_update(batch, ["sort_key"])
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, ["sort_key"])
+
+        parents = keys
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0010_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assortment",
+            name="sort_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=210,
+                verbose_name="sort key",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="sort_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=310,
+                verbose_name="sort key",
+            ),
+        ),
+        migrations.AddField(
+            model_name="consumable",
+            name="sort_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=100,
+                verbose_name="sort key",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="sort_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=410,
+                verbose_name="sort key",
+            ),
+        ),
+        migrations.RunPython(
+            fill_sort_keys,
+            migrations.RunPython.noop,
+        ),
+    ]
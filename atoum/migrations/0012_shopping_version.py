@@ -0,0 +1,44 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:08
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_modified(apps, schema_editor):
+    """
+    Start modification date of existing shoppings from their creation date.
+    """
+    Shopping = apps.get_model("atoum", "Shopping")
+    Shopping.objects.update(modified=F("created"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0011_sort_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shopping",
+            name="modified",
+            field=models.DateTimeField(
+                db_index=True,
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="modification date",
+            ),
+        ),
+        migrations.AddField(
+            model_name="shopping",
+            name="version",
+            field=models.PositiveBigIntegerField(
+                default=1, editable=False, verbose_name="version"
+            ),
+        ),
+        migrations.RunPython(
+            fill_modified,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def fill_item_versions(apps, schema_editor):
+    """
+    Start existing items from their creation date and the current version of their
+    shopping.
+    """
+    Shopping = apps.get_model("atoum", "Shopping")
+    ShoppingItem = apps.get_model("atoum", "ShoppingItem")
+    ShoppingItem.objects.update(
+        modified=F("created"),
+        version=Subquery(
+            Shopping.objects.filter(pk=OuterRef("shopping_id")).values("version")[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0012_shopping_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShoppingItemTombstone",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("item", models.PositiveBigIntegerField(verbose_name="item id")),
+                ("product", models.PositiveBigIntegerField(verbose_name="product id")),
+                ("version", models.PositiveBigIntegerField(verbose_name="version")),
+                (
+                    "deleted",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="deletion date"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Shopping item tombstone",
+                "verbose_name_plural": "Shopping item tombstones",
+                "ordering": ["shopping", "version"],
+            },
+        ),
+        migrations.AddField(
+            model_name="shoppingitem",
+            name="modified",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="modification date",
+            ),
+        ),
+        migrations.AddField(
+            model_name="shoppingitem",
+            name="version",
+            field=models.PositiveBigIntegerField(
+                default=0, editable=False, verbose_name="version"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shoppingitem",
+            index=models.Index(
+                fields=["shopping", "version"], name="atoum_shoppingitem_version"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shoppingitem",
+            index=models.Index(
+                fields=["shopping", "modified"], name="atoum_shoppingitem_modified"
+            ),
+        ),
+        migrations.AddField(
+            model_name="shoppingitemtombstone",
+            name="shopping",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="atoum.shopping"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shoppingitemtombstone",
+            index=models.Index(
+                fields=["shopping", "version"], name="atoum_tombstone_version"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shoppingitemtombstone",
+            index=models.Index(
+                fields=["shopping", "deleted"], name="atoum_tombstone_deleted"
+            ),
+        ),
+        migrations.RunPython(
+            fill_item_versions,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0013_shopping_item_sync"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shopping",
+            index=models.Index(
+                fields=["done", "-planning", "-id"], name="atoum_shopping_done_planning"
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0014_shopping_index_order"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shopping",
+            name="recurrence",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                help_text="Number of days between the lists created from a template. The planning date of the template is the date of the next list.",
+                null=True,
+                verbose_name="recurrence",
+            ),
+        ),
+        migrations.AddField(
+            model_name="shopping",
+            name="template",
+            field=models.BooleanField(
+                blank=True,
+                default=False,
+                help_text="A template is not a list to shop, it is used to create new lists with its items.",
+                verbose_name="template",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.14 on 2026-10-18 13:36
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def fill_title_keys(apps, schema_editor):
+    """
+    Fill the new title keys since they are normalized from titles.
+    """
+    Product = apps.get_model("atoum", "Product")
+
+    batch = []
+    for obj in Product.objects.only("id", "title").iterator(chunk_size=2000):
+        obj.title_key = unicodedata.normalize("NFKD", obj.title).encode(
+            "ascii", "ignore"
+        ).decode("ascii").lower()
+        batch.append(obj)
+
+        if len(batch) >= 500:
+            Product.objects.bulk_update(batch, ["title_key"])
+            batch = []
+
+    if batch:
+        Product.objects.bulk_update(batch, ["title_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0015_shopping_template"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="title_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=100,
+                verbose_name="title key",
+            ),
+        ),
+        migrations.RunPython(fill_title_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("atoum", "0016_product_title_key"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="shopping",
+            name="atoum_shopping_done_planning",
+        ),
+        migrations.AddIndex(
+            model_name="shopping",
+            index=models.Index(
+                fields=["template", "done", "-planning", "-id"],
+                name="atoum_shopping_index_order",
+            ),
+        ),
+    ]
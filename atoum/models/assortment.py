@@ -1,13 +1,57 @@
 from django.db import models
+from django.db.models import OuterRef
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import format_html
 
+from ..utils.snapshot import (
+    ConsumableRow, catalog_post_change, get_hierarchy_snapshot,
+)
 from ..utils.text import normalize_text
+from .mixins import (
+    CounterQuerySetMixin, HierarchyQuerySetMixin, HierarchyTrackingMixin,
+    ParentCountersMixin, TITLE_PATH_SEPARATOR, count_subquery,
+    parent_counters_post_delete, parent_counters_pre_delete, sort_key_expression,
+    sort_key_segment,
+)
 
 
-class Assortment(models.Model):
+class AssortmentQuerySet(CounterQuerySetMixin, HierarchyQuerySetMixin,
+                         models.QuerySet):
+    def get_hierarchy_expressions(self):
+        """
+        Expected sort key is computed from the consumable sort key.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        from .consumable import Consumable
+
+        return dict(
+            sort_key=sort_key_expression(
+                Consumable.objects.filter(pk=OuterRef("consumable_id"))
+            ),
+        )
+
+    def get_counter_expressions(self):
+        """
+        Products are counted from their denormalized assortment column.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        from .category import Category
+        from .product import Product
+
+        return dict(
+            category_count=count_subquery(Category, "assortment"),
+            product_count=count_subquery(Product, "assortment"),
+        )
+
+
+class Assortment(ParentCountersMixin, HierarchyTrackingMixin, models.Model):
     """
     Assortment of consumables.
 
@@ -19,6 +63,12 @@ class Assortment(models.Model):
             filled.
         title (models.CharField): Required unique title string.
         slug (models.CharField): Required unique slug string.
+        category_count (models.PositiveIntegerField): Number of related
+            categories, automatically updated.
+        product_count (models.PositiveIntegerField): Number of products from
+            related categories, automatically updated.
+        sort_key (models.CharField): Normalized titles from consumable to assortment,
+            automatically filled. It is used to order objects on hierarchy.
     """
     consumable = models.ForeignKey(
         "atoum.consumable",
@@ -49,6 +99,26 @@ class Assortment(models.Model):
         default="",
         unique=True,
     )
+    category_count = models.PositiveIntegerField(
+        _("categories count"),
+        editable=False,
+        default=0,
+    )
+    product_count = models.PositiveIntegerField(
+        _("products count"),
+        editable=False,
+        default=0,
+    )
+
+    sort_key = models.CharField(
+        _("sort key"),
+        max_length=210,
+        db_index=True,
+        editable=False,
+        default="",
+    )
+
+    objects = AssortmentQuerySet.as_manager()
 
     COMMON_ORDER_BY = ["title"]
     """
@@ -70,6 +140,17 @@ class Assortment(models.Model):
     used when listing objects related to mixed consumables.
     """
 
+    HIERARCHY_TRACKED_FIELDS = ["consumable_id", "slug", "title"]
+    """
+    List of field names which changes need to be propagated to the denormalized
+    hierarchy columns of categories and products.
+    """
+
+    COUNTED_PARENTS = {"consumable_id": "atoum.Consumable"}
+    """
+    Parents with counters to update when an assortment is created, moved or deleted.
+    """
+
     class Meta:
         verbose_name = _("Assortment")
         verbose_name_plural = _("Assortments")
@@ -83,6 +164,30 @@ class Assortment(models.Model):
     def normalized_title(self):
         return normalize_text(self.title)
 
+    def get_consumable_row(self):
+        """
+        Return the parent consumable values.
+
+        Values come from the relation if it has already been fetched, else from the
+        process hierarchy snapshot so no query is required. The relation is still
+        used as a fallback for a consumable that would be missing from snapshot.
+
+        Returns:
+            ConsumableRow: Parent consumable values.
+        """
+        row = None
+        if not Assortment.consumable.is_cached(self):
+            row = get_hierarchy_snapshot().get_consumable(self.consumable_id)
+
+        if row is None:
+            row = ConsumableRow(
+                self.consumable.id,
+                self.consumable.slug,
+                self.consumable.title,
+            )
+
+        return row
+
     def get_absolute_url(self):
         """
         Return absolute URL to the detail view.
@@ -91,7 +196,7 @@ class Assortment(models.Model):
             string: An URL.
         """
         return reverse("atoum:assortment-detail", kwargs={
-            "consumable_slug": self.consumable.slug,
+            "consumable_slug": self.get_consumable_row().slug,
             "assortment_slug": self.slug,
         })
 
@@ -103,7 +208,7 @@ class Assortment(models.Model):
             list: List of crumb titles in order.
         """
         return [
-            self.consumable.title,
+            self.get_consumable_row().title,
             self.title
         ]
 
@@ -125,8 +230,57 @@ class Assortment(models.Model):
         """
         return self.category_set.all().prefetch_related("product_set")
 
+    def update_descendants_hierarchy(self):
+        """
+        Update denormalized hierarchy columns of all categories and products
+        related to the assortment.
+        """
+        from .product import Product
+
+        # Order does matter since a level is computed from its parent level
+        self.category_set.update_hierarchy()
+        Product.objects.filter(category__assortment=self).update_hierarchy()
+
     def save(self, *args, **kwargs):
         # Auto update 'modified' value on each save
         self.modified = timezone.now()
+        self.sort_key = TITLE_PATH_SEPARATOR.join([
+            self.consumable.sort_key,
+            sort_key_segment(self.title),
+        ])
+
+        recount = self._state.adding or self.hierarchy_has_changed()
+        propagate = not self._state.adding and recount
 
         super().save(*args, **kwargs)
+
+        if propagate:
+            self.update_descendants_hierarchy()
+
+        if recount:
+            self.update_parent_counters()
+
+        self.memorize_hierarchy()
+
+
+# Connect some signals
+post_save.connect(
+    catalog_post_change,
+    dispatch_uid="assortment_catalog_on_save",
+    sender=Assortment,
+)
+post_delete.connect(
+    catalog_post_change,
+    dispatch_uid="assortment_catalog_on_delete",
+    sender=Assortment,
+)
+pre_delete.connect(
+    parent_counters_pre_delete,
+    dispatch_uid="assortment_counters_before_delete",
+    sender=Assortment,
+)
+post_delete.connect(
+    parent_counters_post_delete,
+    dispatch_uid="assortment_counters_on_delete",
+    sender=Assortment,
+)
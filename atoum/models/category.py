@@ -1,30 +1,122 @@
 from django.db import models
+from django.db.models import CharField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import format_html
 
+from ..utils.snapshot import catalog_post_change
 from ..utils.text import normalize_text
+from .assortment import Assortment
+from .mixins import (
+    CounterQuerySetMixin, HierarchyQuerySetMixin, HierarchyTrackingMixin,
+    ParentCountersMixin, SLUG_PATH_SEPARATOR, TITLE_PATH_SEPARATOR, count_subquery,
+    parent_counters_post_delete, parent_counters_pre_delete, sort_key_expression,
+    sort_key_segment,
+)
 
 
-class Category(models.Model):
+class CategoryQuerySet(CounterQuerySetMixin, HierarchyQuerySetMixin,
+                       models.QuerySet):
+    def get_hierarchy_expressions(self):
+        """
+        Expected values of denormalized hierarchy columns are computed from the
+        assortment and its consumable.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        assortments = Assortment.objects.filter(pk=OuterRef("assortment_id"))
+
+        return dict(
+            consumable_id=Subquery(assortments.values("consumable_id")[:1]),
+            slug_path=Concat(
+                Subquery(
+                    assortments.annotate(
+                        path=Concat(
+                            "consumable__slug",
+                            Value(SLUG_PATH_SEPARATOR),
+                            "slug",
+                            output_field=CharField(),
+                        )
+                    ).values("path")[:1]
+                ),
+                Value(SLUG_PATH_SEPARATOR),
+                F("slug"),
+                output_field=CharField(),
+            ),
+            title_path=Concat(
+                Subquery(
+                    assortments.annotate(
+                        path=Concat(
+                            "consumable__title",
+                            Value(TITLE_PATH_SEPARATOR),
+                            "title",
+                            output_field=CharField(),
+                        )
+                    ).values("path")[:1]
+                ),
+                Value(TITLE_PATH_SEPARATOR),
+                F("title"),
+                output_field=CharField(),
+            ),
+            sort_key=sort_key_expression(assortments),
+        )
+
+    def get_counter_expressions(self):
+        """
+        Products are counted from their category.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        from .product import Product
+
+        return dict(
+            product_count=count_subquery(Product, "category"),
+        )
+
+
+class Category(ParentCountersMixin, HierarchyTrackingMixin, models.Model):
     """
     Category of a consumable assortment.
 
     Attributes:
         assortment (models.ForeignKey): Required Assortment object.
+        consumable (models.ForeignKey): Denormalized Consumable object from
+            assortment, automatically filled.
         created (models.DateTimeField): Required creation datetime, automatically
             filled.
         modified (models.DateTimeField): Required creation datetime, automatically
             filled.
         title (models.CharField): Required unique title string.
         slug (models.CharField): Required unique slug string.
+        slug_path (models.CharField): Denormalized slugs from consumable to
+            category, automatically filled.
+        title_path (models.CharField): Denormalized titles from consumable to
+            category, automatically filled.
+        product_count (models.PositiveIntegerField): Number of related products,
+            automatically updated.
+        sort_key (models.CharField): Normalized titles from consumable to category,
+            automatically filled. It is used to order objects on hierarchy.
     """
     assortment = models.ForeignKey(
         "atoum.assortment",
         verbose_name=_("Assortment"),
         on_delete=models.CASCADE
     )
+    consumable = models.ForeignKey(
+        "atoum.consumable",
+        verbose_name=_("Consumable"),
+        on_delete=models.CASCADE,
+        related_name="+",
+        editable=False,
+        blank=True,
+        null=True,
+        default=None,
+    )
     created = models.DateTimeField(
         _("creation date"),
         db_index=True,
@@ -47,6 +139,33 @@ class Category(models.Model):
         max_length=130,
         default="",
     )
+    slug_path = models.CharField(
+        _("slug path"),
+        max_length=400,
+        unique=True,
+        editable=False,
+        default="",
+    )
+    title_path = models.CharField(
+        _("title path"),
+        max_length=310,
+        editable=False,
+        default="",
+    )
+    product_count = models.PositiveIntegerField(
+        _("products count"),
+        editable=False,
+        default=0,
+    )
+    sort_key = models.CharField(
+        _("sort key"),
+        max_length=310,
+        db_index=True,
+        editable=False,
+        default="",
+    )
+
+    objects = CategoryQuerySet.as_manager()
 
     COMMON_ORDER_BY = ["title"]
     """
@@ -72,6 +191,20 @@ class Category(models.Model):
     used when listing objects related to mixed assortments.
     """
 
+    HIERARCHY_TRACKED_FIELDS = ["assortment_id", "consumable_id", "slug", "title"]
+    """
+    List of field names which changes need to be propagated to the denormalized
+    hierarchy columns of products.
+    """
+
+    COUNTED_PARENTS = {
+        "assortment_id": "atoum.Assortment",
+        "consumable_id": "atoum.Consumable",
+    }
+    """
+    Parents with counters to update when a category is created, moved or deleted.
+    """
+
     class Meta:
         verbose_name = _("Category")
         verbose_name_plural = _("Categories")
@@ -108,24 +241,37 @@ class Category(models.Model):
         Returns:
             string: An URL.
         """
+        consumable_slug, assortment_slug, category_slug = self.parenting_slugs()
+
         return reverse("atoum:category-detail", kwargs={
-            "consumable_slug": self.assortment.consumable.slug,
-            "assortment_slug": self.assortment.slug,
-            "category_slug": self.slug,
+            "consumable_slug": consumable_slug,
+            "assortment_slug": assortment_slug,
+            "category_slug": category_slug,
         })
 
     def parenting_crumbs(self):
         """
         Return parenting crumbs from Consumable to Assortment to Category.
 
+        Crumbs are read from denormalized title path so it does not need to get the
+        related objects.
+
         Returns:
             list: List of crumb titles in order.
         """
-        return [
-            self.assortment.consumable.title,
-            self.assortment.title,
-            self.title
-        ]
+        return self.title_path.split(TITLE_PATH_SEPARATOR)
+
+    def parenting_slugs(self):
+        """
+        Return parenting slugs from Consumable to Category.
+
+        Slugs are read from denormalized slug path so it does not need to get the
+        related objects.
+
+        Returns:
+            list: List of slugs in order.
+        """
+        return self.slug_path.split(SLUG_PATH_SEPARATOR)
 
     def parenting_crumbs_html(self):
         """
@@ -145,8 +291,65 @@ class Category(models.Model):
         """
         return self.product_set.all()
 
+    def set_hierarchy(self):
+        """
+        Fill denormalized hierarchy columns from the assortment and its consumable.
+        """
+        consumable = self.assortment.consumable
+
+        self.consumable = consumable
+        self.slug_path = SLUG_PATH_SEPARATOR.join([
+            consumable.slug,
+            self.assortment.slug,
+            self.slug,
+        ])
+        self.title_path = TITLE_PATH_SEPARATOR.join([
+            consumable.title,
+            self.assortment.title,
+            self.title,
+        ])
+        self.sort_key = TITLE_PATH_SEPARATOR.join([
+            self.assortment.sort_key,
+            sort_key_segment(self.title),
+        ])
+
     def save(self, *args, **kwargs):
         # Auto update 'modified' value on each save
         self.modified = timezone.now()
+        self.set_hierarchy()
+
+        recount = self._state.adding or self.hierarchy_has_changed()
+        propagate = not self._state.adding and recount
 
         super().save(*args, **kwargs)
+
+        if propagate:
+            self.product_set.update_hierarchy()
+
+        if recount:
+            self.update_parent_counters()
+
+        self.memorize_hierarchy()
+
+
+# Connect some signals
+post_save.connect(
+    catalog_post_change,
+    dispatch_uid="category_catalog_on_save",
+    sender=Category,
+)
+post_delete.connect(
+    catalog_post_change,
+    dispatch_uid="category_catalog_on_delete",
+    sender=Category,
+)
+pre_delete.connect(
+    parent_counters_pre_delete,
+    dispatch_uid="category_counters_before_delete",
+    sender=Category,
+)
+post_delete.connect(
+    parent_counters_post_delete,
+    dispatch_uid="category_counters_on_delete",
+    sender=Category,
+)
@@ -1,12 +1,39 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils import timezone
 
+from ..utils.snapshot import (
+    catalog_post_change, hierarchy_post_delete, hierarchy_post_save,
+)
 from ..utils.text import normalize_text
+from .mixins import (
+    CounterQuerySetMixin, HierarchyTrackingMixin, count_subquery, sort_key_segment,
+)
 
 
-class Consumable(models.Model):
+class ConsumableQuerySet(CounterQuerySetMixin, models.QuerySet):
+    def get_counter_expressions(self):
+        """
+        Categories and products are counted from their denormalized consumable
+        column.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        from .assortment import Assortment
+        from .category import Category
+        from .product import Product
+
+        return dict(
+            assortment_count=count_subquery(Assortment, "consumable"),
+            category_count=count_subquery(Category, "consumable"),
+            product_count=count_subquery(Product, "consumable"),
+        )
+
+
+class Consumable(HierarchyTrackingMixin, models.Model):
     """
     The very top level of consumable classification.
 
@@ -17,6 +44,14 @@ class Consumable(models.Model):
             filled.
         title (models.CharField): Required unique title string.
         slug (models.CharField): Required unique slug string.
+        assortment_count (models.PositiveIntegerField): Number of related
+            assortments, automatically updated.
+        category_count (models.PositiveIntegerField): Number of categories from
+            related assortments, automatically updated.
+        product_count (models.PositiveIntegerField): Number of products from
+            related assortments, automatically updated.
+        sort_key (models.CharField): Normalized title, automatically filled. It is
+            the first segment of sort keys from children.
     """
     created = models.DateTimeField(
         _("creation date"),
@@ -42,12 +77,43 @@ class Consumable(models.Model):
         default="",
         unique=True,
     )
+    assortment_count = models.PositiveIntegerField(
+        _("assortments count"),
+        editable=False,
+        default=0,
+    )
+    category_count = models.PositiveIntegerField(
+        _("categories count"),
+        editable=False,
+        default=0,
+    )
+    product_count = models.PositiveIntegerField(
+        _("products count"),
+        editable=False,
+        default=0,
+    )
+
+    sort_key = models.CharField(
+        _("sort key"),
+        max_length=100,
+        db_index=True,
+        editable=False,
+        default="",
+    )
+
+    objects = ConsumableQuerySet.as_manager()
 
     COMMON_ORDER_BY = ["title"]
     """
     List of field order commonly used in frontend view/api
     """
 
+    HIERARCHY_TRACKED_FIELDS = ["slug", "title"]
+    """
+    List of field names which changes need to be propagated to the denormalized
+    hierarchy columns of categories and products.
+    """
+
     class Meta:
         verbose_name = _("Consumable")
         verbose_name_plural = _("Consumables")
@@ -81,8 +147,54 @@ class Consumable(models.Model):
             "slug": self.slug,
         })
 
+    def update_descendants_hierarchy(self):
+        """
+        Update denormalized hierarchy columns of all assortments, categories and
+        products related to the consumable.
+        """
+        from .category import Category
+        from .product import Product
+
+        # Order does matter since a level is computed from its parent level
+        self.assortment_set.update_hierarchy()
+        Category.objects.filter(assortment__consumable=self).update_hierarchy()
+        Product.objects.filter(
+            category__assortment__consumable=self
+        ).update_hierarchy()
+
     def save(self, *args, **kwargs):
         # Auto update 'modified' value on each save
         self.modified = timezone.now()
+        self.sort_key = sort_key_segment(self.title)
+
+        propagate = not self._state.adding and self.hierarchy_has_changed()
 
         super().save(*args, **kwargs)
+
+        if propagate:
+            self.update_descendants_hierarchy()
+
+        self.memorize_hierarchy()
+
+
+# Connect some signals
+post_save.connect(
+    hierarchy_post_save,
+    dispatch_uid="consumable_hierarchy_on_save",
+    sender=Consumable,
+)
+post_delete.connect(
+    hierarchy_post_delete,
+    dispatch_uid="consumable_hierarchy_on_delete",
+    sender=Consumable,
+)
+post_save.connect(
+    catalog_post_change,
+    dispatch_uid="consumable_catalog_on_save",
+    sender=Consumable,
+)
+post_delete.connect(
+    catalog_post_change,
+    dispatch_uid="consumable_catalog_on_delete",
+    sender=Consumable,
+)
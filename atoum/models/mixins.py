@@ -0,0 +1,308 @@
+from django.apps import apps
+from django.db.models import (
+    DEFERRED, CharField, Count, F, OuterRef, Q, Subquery, Value
+)
+from django.db.models.functions import Coalesce, Concat, Reverse, Right, StrIndex
+
+from ..utils.text import normalize_text
+
+
+SLUG_PATH_SEPARATOR = "/"
+"""
+Separator used to join slugs in denormalized slug paths. A slug can not contain it.
+"""
+
+TITLE_PATH_SEPARATOR = "\x1f"
+"""
+Separator used to join titles in denormalized title paths. This is the ASCII unit
+separator so it can not collide with any character from a title.
+"""
+
+
+def sort_key_segment(title):
+    """
+    Normalize a title to be a segment of a hierarchy sort key.
+
+    Arguments:
+        title (string): Title to normalize.
+
+    Returns:
+        string: Title without accents and in lowercase.
+    """
+    return normalize_text(title).lower()
+
+
+def sort_key_expression(parents):
+    """
+    Build an expression to compute the expected sort key of an object from the sort
+    key of its parent.
+
+    The own segment of object is kept from its current sort key (everything after
+    the last separator) since it is normalized from title on save.
+
+    Arguments:
+        parents (Queryset): Queryset filtered on the parent of outer object.
+
+    Returns:
+        django.db.models.Expression: Concatenation of parent sort key and the own
+        segment.
+    """
+    return Concat(
+        Subquery(parents.values("sort_key")[:1]),
+        Value(TITLE_PATH_SEPARATOR),
+        Right(
+            F("sort_key"),
+            StrIndex(Reverse(F("sort_key")), Value(TITLE_PATH_SEPARATOR)) - 1,
+        ),
+        output_field=CharField(),
+    )
+
+
+def count_subquery(model, field, **filters):
+    """
+    Build an expression to count objects from a model related to the outer object.
+
+    Arguments:
+        model (django.db.models.Model): Model of objects to count.
+        field (string): Name of the model field which relates to the outer object.
+        **filters: Lookups to count only some of the related objects.
+
+    Returns:
+        django.db.models.Expression: Subquery expression which resolves to ``0``
+        when there is no related object.
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(
+                **{field: OuterRef("pk")}, **filters
+            ).order_by().values(
+                field
+            ).annotate(total=Count("pk")).values("total")[:1]
+        ),
+        0,
+    )
+
+
+def filter_drift(queryset, expressions):
+    """
+    Filter a queryset on objects with columns that differ from their expected values.
+
+    Arguments:
+        queryset (Queryset): Queryset to filter.
+        expressions (dict): Expressions to compute the expected values indexed on
+            their column name.
+
+    Returns:
+        Queryset: Filtered queryset.
+    """
+    drifted = Q()
+    for name in expressions.keys():
+        drifted |= ~Q(**{name: F("expected_" + name)})
+
+    return queryset.annotate(**{
+        "expected_" + name: expression
+        for name, expression in expressions.items()
+    }).filter(drifted)
+
+
+class HierarchyQuerySetMixin:
+    """
+    Queryset methods to maintain the denormalized hierarchy columns.
+
+    Inheriting queryset must implement ``get_hierarchy_expressions()``.
+    """
+    def get_hierarchy_expressions(self):
+        """
+        Return expressions to compute the expected values of denormalized hierarchy
+        columns.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        raise NotImplementedError
+
+    def update_hierarchy(self):
+        """
+        Update denormalized hierarchy columns of all objects from queryset in a
+        single query.
+
+        Returns:
+            integer: Number of updated rows.
+        """
+        return self.update(**self.get_hierarchy_expressions())
+
+    def hierarchy_drift(self):
+        """
+        Filter queryset on objects with denormalized hierarchy columns that differ
+        from their expected values.
+
+        Returns:
+            Queryset: Filtered queryset.
+        """
+        return filter_drift(self, self.get_hierarchy_expressions())
+
+
+class CounterQuerySetMixin:
+    """
+    Queryset methods to maintain the denormalized children counter columns.
+
+    Inheriting queryset must implement ``get_counter_expressions()``.
+    """
+    def get_counter_expressions(self):
+        """
+        Return expressions to compute the expected values of counter columns.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        raise NotImplementedError
+
+    def update_counters(self):
+        """
+        Update counter columns of all objects from queryset in a single query.
+
+        Returns:
+            integer: Number of updated rows.
+        """
+        return self.update(**self.get_counter_expressions())
+
+    def counter_drift(self):
+        """
+        Filter queryset on objects with counter columns that differ from their
+        expected values.
+
+        Returns:
+            Queryset: Filtered queryset.
+        """
+        return filter_drift(self, self.get_counter_expressions())
+
+
+class HierarchyTrackingMixin:
+    """
+    Memorize the values of hierarchy fields when an object is loaded from database,
+    so we are able to know if changes have to be propagated to children objects
+    when it is saved.
+
+    Attributes:
+        HIERARCHY_TRACKED_FIELDS (list): Attribute names to memorize. Their changes
+            will require to update the denormalized hierarchy columns of children.
+    """
+    HIERARCHY_TRACKED_FIELDS = []
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # Deferred fields are not memorized and so will be assumed as changed
+        loaded = dict(zip(field_names, values))
+        instance._loaded_hierarchy = {
+            name: loaded[name]
+            for name in cls.HIERARCHY_TRACKED_FIELDS
+            if name in loaded and loaded[name] is not DEFERRED
+        }
+
+        return instance
+
+    def memorize_hierarchy(self):
+        """
+        Memorize current values of hierarchy fields.
+        """
+        self._loaded_hierarchy = {
+            name: getattr(self, name)
+            for name in self.HIERARCHY_TRACKED_FIELDS
+        }
+
+    def hierarchy_has_changed(self):
+        """
+        Compare current values of hierarchy fields to the memorized ones.
+
+        Returns:
+            boolean: True if any hierarchy field value has changed or if values
+            have never been memorized.
+        """
+        loaded = getattr(self, "_loaded_hierarchy", {})
+
+        return any([
+            name not in loaded or loaded[name] != getattr(self, name)
+            for name in self.HIERARCHY_TRACKED_FIELDS
+        ])
+
+
+class ParentCountersMixin:
+    """
+    Update counter columns of parent objects.
+
+    This relies on memorized values from ``HierarchyTrackingMixin`` to update the
+    previous parents too when an object has been moved.
+
+    Attributes:
+        COUNTED_PARENTS (dict): Model labels of parents with counters indexed on the
+            attribute name which holds their id.
+    """
+    COUNTED_PARENTS = {}
+
+    def get_counted_parents(self):
+        """
+        Return ids of current and previous parents.
+
+        Returns:
+            dict: Set of parent ids indexed on parent model label.
+        """
+        loaded = getattr(self, "_loaded_hierarchy", {})
+
+        return {
+            label: {getattr(self, name), loaded.get(name)} - {None}
+            for name, label in self.COUNTED_PARENTS.items()
+        }
+
+    def update_parent_counters(self):
+        """
+        Update counters of current and previous parents with a query per parent
+        model.
+        """
+        update_counted_parents(self.get_counted_parents())
+
+
+def update_counted_parents(parents):
+    """
+    Update counters of parents with a query per parent model.
+
+    Arguments:
+        parents (dict): Set of parent ids indexed on parent model label.
+    """
+    for label, ids in parents.items():
+        if ids:
+            apps.get_model(label).objects.filter(pk__in=ids).update_counters()
+
+
+def parent_counters_pre_delete(sender, instance, origin=None, **kwargs):
+    """
+    Signal receiver to collect the parents of an object to delete.
+
+    Every object of a deletion (including cascading ones) is signaled before any
+    deletion, so parents are collected on the deletion origin for all objects of
+    the same model and ``parent_counters_post_delete`` updates them once.
+    """
+    holder = instance if origin is None else origin
+    collected = holder.__dict__.setdefault("_counted_parents", {}).setdefault(
+        sender, {}
+    )
+
+    for label, ids in instance.get_counted_parents().items():
+        collected.setdefault(label, set()).update(ids)
+
+
+def parent_counters_post_delete(sender, instance, origin=None, **kwargs):
+    """
+    Signal receiver to update parent counters when objects are deleted.
+
+    This is a signal so it is also performed for bulk and cascading deletions.
+    Objects of a model are all deleted before their signals are sent, so parents
+    collected by ``parent_counters_pre_delete`` are updated from the first signal
+    with a query per parent model and the other signals do nothing.
+    """
+    holder = instance if origin is None else origin
+    parents = holder.__dict__.get("_counted_parents", {}).pop(sender, None)
+
+    if parents is not None:
+        update_counted_parents(parents)
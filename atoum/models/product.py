@@ -1,5 +1,7 @@
 from django.db import models
-from django.db.models.signals import post_delete, pre_save
+from django.db.models import CharField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils import timezone
@@ -9,10 +11,48 @@ from smart_media.mixins import SmartFormatMixin
 from smart_media.modelfields import SmartMediaField
 from smart_media.signals import auto_purge_files_on_change, auto_purge_files_on_delete
 
+from ..utils.snapshot import catalog_post_change
 from ..utils.text import normalize_text
+from .category import Category
+from .mixins import (
+    HierarchyQuerySetMixin, HierarchyTrackingMixin, ParentCountersMixin,
+    SLUG_PATH_SEPARATOR, TITLE_PATH_SEPARATOR, parent_counters_post_delete,
+    parent_counters_pre_delete, sort_key_expression, sort_key_segment,
+)
+
+
+class ProductQuerySet(HierarchyQuerySetMixin, models.QuerySet):
+    def get_hierarchy_expressions(self):
+        """
+        Expected values of denormalized hierarchy columns are copied from the
+        denormalized columns of the category.
+
+        Returns:
+            dict: Expressions indexed on their column name.
+        """
+        categories = Category.objects.filter(pk=OuterRef("category_id"))
+
+        return dict(
+            consumable_id=Subquery(categories.values("consumable_id")[:1]),
+            assortment_id=Subquery(categories.values("assortment_id")[:1]),
+            slug_path=Concat(
+                Subquery(categories.values("slug_path")[:1]),
+                Value(SLUG_PATH_SEPARATOR),
+                F("slug"),
+                output_field=CharField(),
+            ),
+            title_path=Concat(
+                Subquery(categories.values("title_path")[:1]),
+                Value(TITLE_PATH_SEPARATOR),
+                F("title"),
+                output_field=CharField(),
+            ),
+            sort_key=sort_key_expression(categories),
+        )
 
 
-class Product(SmartFormatMixin, models.Model):
+class Product(ParentCountersMixin, HierarchyTrackingMixin, SmartFormatMixin,
+              models.Model):
     """
     Product of a Category.
 
@@ -22,6 +62,10 @@ class Product(SmartFormatMixin, models.Model):
 
     Attributes:
         category (models.ForeignKey): Required Assortment object.
+        consumable (models.ForeignKey): Denormalized Consumable object from
+            category, automatically filled.
+        assortment (models.ForeignKey): Denormalized Assortment object from
+            category, automatically filled.
         brand (models.ForeignKey): Optional Brand object.
         created (models.DateTimeField): Required creation datetime, automatically
             filled.
@@ -31,12 +75,40 @@ class Product(SmartFormatMixin, models.Model):
         slug (models.CharField): Required unique slug string.
         description (models.TextField): Optional description long string.
         cover (SmartMediaField): Optional cover image file.
+        slug_path (models.CharField): Denormalized slugs from consumable to
+            product, automatically filled.
+        title_path (models.CharField): Denormalized titles from consumable to
+            product, automatically filled.
+        sort_key (models.CharField): Normalized titles from consumable to product,
+            automatically filled. It is used to order objects on hierarchy.
+        title_key (models.CharField): Normalized title, automatically filled. It
+            is used to resolve products from typed names.
     """
     category = models.ForeignKey(
         "atoum.category",
         verbose_name=_("Category"),
         on_delete=models.CASCADE
     )
+    consumable = models.ForeignKey(
+        "atoum.consumable",
+        verbose_name=_("Consumable"),
+        on_delete=models.CASCADE,
+        related_name="+",
+        editable=False,
+        blank=True,
+        null=True,
+        default=None,
+    )
+    assortment = models.ForeignKey(
+        "atoum.assortment",
+        verbose_name=_("Assortment"),
+        on_delete=models.CASCADE,
+        related_name="+",
+        editable=False,
+        blank=True,
+        null=True,
+        default=None,
+    )
     brand = models.ForeignKey(
         "atoum.brand",
         verbose_name=_("brand"),
@@ -81,6 +153,35 @@ class Product(SmartFormatMixin, models.Model):
         blank=True,
         default="",
     )
+    slug_path = models.CharField(
+        _("slug path"),
+        max_length=530,
+        unique=True,
+        editable=False,
+        default="",
+    )
+    title_path = models.CharField(
+        _("title path"),
+        max_length=410,
+        editable=False,
+        default="",
+    )
+    sort_key = models.CharField(
+        _("sort key"),
+        max_length=410,
+        db_index=True,
+        editable=False,
+        default="",
+    )
+    title_key = models.CharField(
+        _("title key"),
+        max_length=100,
+        db_index=True,
+        editable=False,
+        default="",
+    )
+
+    objects = ProductQuerySet.as_manager()
 
     COMMON_ORDER_BY = ["title"]
     """
@@ -108,6 +209,20 @@ class Product(SmartFormatMixin, models.Model):
     used when listing assortments related to mixed consumables.
     """
 
+    HIERARCHY_TRACKED_FIELDS = ["category_id", "assortment_id", "consumable_id"]
+    """
+    List of field names which changes need to update the parent counters.
+    """
+
+    COUNTED_PARENTS = {
+        "category_id": "atoum.Category",
+        "assortment_id": "atoum.Assortment",
+        "consumable_id": "atoum.Consumable",
+    }
+    """
+    Parents with counters to update when a product is created, moved or deleted.
+    """
+
     class Meta:
         verbose_name = _("Product")
         verbose_name_plural = _("Products")
@@ -131,26 +246,40 @@ class Product(SmartFormatMixin, models.Model):
         Returns:
             string: An URL.
         """
+        consumable_slug, assortment_slug, category_slug, product_slug = (
+            self.parenting_slugs()
+        )
+
         return reverse("atoum:product-detail", kwargs={
-            "consumable_slug": self.category.assortment.consumable.slug,
-            "assortment_slug": self.category.assortment.slug,
-            "category_slug": self.category.slug,
-            "product_slug": self.slug,
+            "consumable_slug": consumable_slug,
+            "assortment_slug": assortment_slug,
+            "category_slug": category_slug,
+            "product_slug": product_slug,
         })
 
     def parenting_crumbs(self):
         """
         Return parenting crumbs from Consumable to Assortment to Category to Product.
 
+        Crumbs are read from denormalized title path so it does not need to get the
+        related objects.
+
         Returns:
             list: List of crumb titles in order.
         """
-        return [
-            self.category.assortment.consumable.title,
-            self.category.assortment.title,
-            self.category.title,
-            self.title
-        ]
+        return self.title_path.split(TITLE_PATH_SEPARATOR)
+
+    def parenting_slugs(self):
+        """
+        Return parenting slugs from Consumable to Product.
+
+        Slugs are read from denormalized slug path so it does not need to get the
+        related objects.
+
+        Returns:
+            list: List of slugs in order.
+        """
+        return self.slug_path.split(SLUG_PATH_SEPARATOR)
 
     def parenting_crumbs_html(self):
         """
@@ -161,12 +290,38 @@ class Product(SmartFormatMixin, models.Model):
         """
         return format_html("{0} &gt; {1} &gt; {2} &gt; {3}", *self.parenting_crumbs())
 
+    def set_hierarchy(self):
+        """
+        Fill denormalized hierarchy columns from the denormalized columns of the
+        category.
+        """
+        self.consumable_id = self.category.consumable_id
+        self.assortment_id = self.category.assortment_id
+        self.slug_path = SLUG_PATH_SEPARATOR.join([self.category.slug_path, self.slug])
+        self.title_path = TITLE_PATH_SEPARATOR.join([
+            self.category.title_path,
+            self.title,
+        ])
+        self.sort_key = TITLE_PATH_SEPARATOR.join([
+            self.category.sort_key,
+            sort_key_segment(self.title),
+        ])
+
     def save(self, *args, **kwargs):
         # Auto update 'modified' value on each save
         self.modified = timezone.now()
+        self.title_key = sort_key_segment(self.title)
+        self.set_hierarchy()
+
+        recount = self._state.adding or self.hierarchy_has_changed()
 
         super().save(*args, **kwargs)
 
+        if recount:
+            self.update_parent_counters()
+
+        self.memorize_hierarchy()
+
 
 # Connect some signals
 post_delete.connect(
@@ -175,6 +330,26 @@ post_delete.connect(
     sender=Product,
     weak=False,
 )
+pre_delete.connect(
+    parent_counters_pre_delete,
+    dispatch_uid="product_counters_before_delete",
+    sender=Product,
+)
+post_delete.connect(
+    parent_counters_post_delete,
+    dispatch_uid="product_counters_on_delete",
+    sender=Product,
+)
+post_save.connect(
+    catalog_post_change,
+    dispatch_uid="product_catalog_on_save",
+    sender=Product,
+)
+post_delete.connect(
+    catalog_post_change,
+    dispatch_uid="product_catalog_on_delete",
+    sender=Product,
+)
 pre_save.connect(
     auto_purge_files_on_change(["cover"]),
     dispatch_uid="product_cover_on_change",
@@ -1,4 +1,13 @@
-from django.db import models
+import datetime
+
+from django.db import models, transaction
+from django.db.models import (
+    Case, Count, Exists, F, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Least
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete,
+)
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.utils import timezone
@@ -6,6 +15,98 @@ from django.utils.dateformat import format as date_format
 from django.utils.functional import cached_property
 from django.utils.text import capfirst
 
+from ..utils.events import publish_shopping_event
+from ..utils.inventory import (
+    invalidate_shopping_inventory, shopping_inventory_post_change,
+)
+from .mixins import count_subquery
+
+
+STATUS_AGGREGATES = {
+    "dones": Count("shoppingitem", filter=Q(shoppingitem__done=True)),
+    "opens": Count("shoppingitem", filter=Q(shoppingitem__done=False)),
+}
+"""
+Conditional aggregates to count done and open items of Shopping objects.
+"""
+
+
+def shopping_version(shopping_id):
+    """
+    Return an expression for the current version of a Shopping object, to stamp
+    its changed items from the same query.
+
+    Arguments:
+        shopping_id (integer): Shopping object id.
+
+    Returns:
+        django.db.models.Subquery: The version subquery.
+    """
+    return Subquery(
+        Shopping.objects.filter(pk=shopping_id).values("version")[:1]
+    )
+
+
+class ShoppingQuerySet(models.QuerySet):
+    def touch(self):
+        """
+        Increment the version and update the modification date of Shopping objects.
+
+        This must be used for any change on their items.
+
+        Returns:
+            integer: Number of updated Shopping objects.
+        """
+        return self.update(version=F("version") + 1, modified=timezone.now())
+
+    def seek(self, done, planning, pk):
+        """
+        Filter Shopping objects which come after a given one in the index order
+        (``done``, descending ``planning`` then descending ``id``).
+
+        This is the keyset pagination condition, it is resolved from the index on
+        this order whatever the position of the given object.
+
+        Arguments:
+            done (boolean): Done value of the last object of the previous page.
+            planning (datetime.datetime): Planning date of the last object of the
+                previous page.
+            pk (integer): Id of the last object of the previous page.
+
+        Returns:
+            ShoppingQuerySet: Filtered queryset.
+        """
+        return self.filter(
+            Q(done__gt=done) |
+            Q(done=done, planning__lt=planning) |
+            Q(done=done, planning=planning, pk__lt=pk)
+        )
+
+    def with_status(self):
+        """
+        Annotate Shopping objects with their status, done items and open items,
+        the same values than ``Shopping.get_status()``.
+
+        Items are counted with subqueries in the same query than the Shopping
+        objects. There is no join to group, so a sliced queryset only counts the
+        items of the selected objects.
+
+        Returns:
+            ShoppingQuerySet: Queryset annotated with ``status``, ``dones`` and
+            ``opens``.
+        """
+        return self.annotate(
+            dones=count_subquery(ShoppingItem, "shopping", done=True),
+            opens=count_subquery(ShoppingItem, "shopping", done=False),
+        ).annotate(
+            status=Case(
+                When(done=True, then=Value("done")),
+                When(dones__gt=0, then=Value("ongoing")),
+                default=Value("open"),
+                output_field=models.CharField(),
+            )
+        )
+
 
 class Shopping(models.Model):
     """
@@ -16,8 +117,14 @@ class Shopping(models.Model):
             filled.
         planning (models.DateTimeField): Required planning datetime, automatically
             filled.
+        modified (models.DateTimeField): Last modification datetime, automatically
+            updated on each save and item change.
+        version (models.PositiveBigIntegerField): Version number, automatically
+            incremented on each save and item change.
         title (models.CharField): Optional title string.
         done (models.CharField): Optional boolean.
+        template (models.BooleanField): Optional boolean.
+        recurrence (models.PositiveSmallIntegerField): Optional number of days.
         products (models.ManyToManyField): Optional product selection
     """
     created = models.DateTimeField(
@@ -30,6 +137,17 @@ class Shopping(models.Model):
         db_index=True,
         default=timezone.now,
     )
+    modified = models.DateTimeField(
+        _("modification date"),
+        db_index=True,
+        default=timezone.now,
+        editable=False,
+    )
+    version = models.PositiveBigIntegerField(
+        _("version"),
+        default=1,
+        editable=False,
+    )
     title = models.CharField(
         _("title"),
         blank=True,
@@ -41,6 +159,24 @@ class Shopping(models.Model):
         default=False,
         blank=True,
     )
+    template = models.BooleanField(
+        verbose_name=_("template"),
+        default=False,
+        blank=True,
+        help_text=_(
+            "A template is not a list to shop, it is used to create new lists "
+            "with its items."
+        ),
+    )
+    recurrence = models.PositiveSmallIntegerField(
+        _("recurrence"),
+        null=True,
+        blank=True,
+        help_text=_(
+            "Number of days between the lists created from a template. The "
+            "planning date of the template is the date of the next list."
+        ),
+    )
     products = models.ManyToManyField(
         "atoum.Product",
         verbose_name=_("items"),
@@ -50,16 +186,21 @@ class Shopping(models.Model):
         through_fields=("shopping", "product"),
     )
 
+    objects = ShoppingQuerySet.as_manager()
+
     COMMON_ORDER_BY = ["-planning"]
     """
     List of field order commonly used in frontend view/api
     """
 
+    INDEX_ORDER_BY = ["done", "-planning", "-id"]
+    """
+    List of field order used in the Shopping lists index, undone lists first. It
+    ends with the id so it is an unique order as required by keyset pagination.
+    """
+
     HIERARCHY_SELECT_RELATED = [
         "product",
-        "product__category",
-        "product__category__assortment",
-        "product__category__assortment__consumable",
     ]
     """
     List of foreign-key relationships field names to "follow" in queryset to avoid
@@ -72,6 +213,14 @@ class Shopping(models.Model):
         ordering = [
             "title",
         ]
+        indexes = [
+            # Covers the index order of lists (excluding templates) for keyset
+            # pagination
+            models.Index(
+                fields=["template", "done", "-planning", "-id"],
+                name="atoum_shopping_index_order",
+            ),
+        ]
 
     def __str__(self):
         """
@@ -92,26 +241,30 @@ class Shopping(models.Model):
         """
         Get a status computed from 'done' state and number of done items.
 
+        Values annotated from ``ShoppingQuerySet.with_status()`` are used if any,
+        else items are counted with a single aggregate query.
+
         Returns:
-            dict:
+            dict: The status name (either ``open``, ``ongoing`` or ``done``) and the
+            numbers of done and open items.
         """
-        computed = _("done") if self.done is True else _("open")
-        states = self.shoppingitem_set.values_list(
-            "done",
-            flat=True
-        )
-        dones = len([v for v in states if v is True])
+        if hasattr(self, "dones") and hasattr(self, "opens"):
+            counts = {"dones": self.dones, "opens": self.opens}
+        else:
+            counts = Shopping.objects.filter(pk=self.pk).aggregate(
+                **STATUS_AGGREGATES
+            )
 
         computed = "open"
         if self.done is True:
             computed = "done"
-        elif dones > 0:
+        elif counts["dones"] > 0:
             computed = "ongoing"
 
         return {
             "status": computed,
-            "dones": dones,
-            "opens": len([v for v in states if v is False]),
+            "dones": counts["dones"],
+            "opens": counts["opens"],
         }
 
     def get_items(self):
@@ -145,23 +298,76 @@ class Shopping(models.Model):
         """
         return self.get_items()
 
+    @cached_property
+    def current_item_index(self):
+        """
+        Return an index of related ShoppingItem objects on their product id.
+
+        Depends on cached property ``Shopping.current_items``. Items give the item
+        id, quantity and done state so every lookup on a product is done in constant
+        time. Index is kept up to date from ``Shopping.index_item()`` and
+        ``Shopping.unindex_product()``.
+
+        Returns:
+            dict: ShoppingItem objects indexed on their product id.
+        """
+        return {item.product_id: item for item in self.current_items}
+
     @cached_property
     def current_item_ids(self):
         """
-        Return a tuple of related ShoppingItem object ids.
+        Return a tuple of product ids from related ShoppingItem objects.
 
-        Depends on cached property ``Shopping.current_items``.
+        Depends on cached property ``Shopping.current_item_index``.
 
         Returns:
-            tuple: Tuple of ShoppingItem ids.
+            tuple: Tuple of Product ids.
         """
-        return tuple([v.product.id for v in self.current_items])
+        return tuple(self.current_item_index)
+
+    def _purge_item_caches(self):
+        """
+        Remove cached item list and ids so they are fetched again on next usage.
+        """
+        self.__dict__.pop("current_items", None)
+        self.__dict__.pop("current_item_ids", None)
+
+    def index_item(self, item):
+        """
+        Add or replace a ShoppingItem in the item index if it has already been built.
+
+        This should be used after an item has been created or edited so the cached
+        properties stay coherent during the same thread.
+
+        Arguments:
+            item (ShoppingItem): Item object of the Shopping object.
+        """
+        if "current_item_index" in self.__dict__:
+            self.current_item_index[item.product_id] = item
+
+        self._purge_item_caches()
+
+    def unindex_product(self, product):
+        """
+        Remove the item of a Product from the item index if it has already been
+        built.
+
+        This should be used after an item has been deleted so the cached properties
+        stay coherent during the same thread.
+
+        Arguments:
+            product (atoum.models.Product): Product object.
+        """
+        if "current_item_index" in self.__dict__:
+            self.current_item_index.pop(product.id, None)
+
+        self._purge_item_caches()
 
     def is_product_shopped(self, product):
         """
         Check if given Product is an item of the Shopping object.
 
-        Depends on cached property ``Shopping.current_items``.
+        Depends on cached property ``Shopping.current_item_index``.
 
         Arguments:
             product (atoum.models.Product): Product object.
@@ -169,13 +375,13 @@ class Shopping(models.Model):
         Returns:
             boolean: True if product is in list else None.
         """
-        return product.id in self.current_item_ids
+        return product.id in self.current_item_index
 
     def item_for_product(self, product):
         """
         Return the shopping item for a product in shopping list.
 
-        Depends on cached property ``Shopping.current_items``.
+        Depends on cached property ``Shopping.current_item_index``.
 
         Arguments:
             product (atoum.models.Product): Product object.
@@ -184,18 +390,13 @@ class Shopping(models.Model):
             ShoppingItem: The item object for given Product if it is an item of the
             Shopping object else it returns ``None``.
         """
-        if self.is_product_shopped(product):
-            for item in self.current_items:
-                if item.product.id == product.id:
-                    return item
-
-        return None
+        return self.current_item_index.get(product.id)
 
     def quantity_for_product(self, product):
         """
         Return the saved item quantity for the given Product.
 
-        Depends on cached property ``Shopping.current_items``.
+        Depends on cached property ``Shopping.current_item_index``.
 
         Arguments:
             product (atoum.models.Product): Product object.
@@ -208,48 +409,426 @@ class Shopping(models.Model):
 
         return item.quantity if item else None
 
+    @classmethod
+    def record_item_changes(cls, shopping_id, changed=None, deleted=None):
+        """
+        Touch a Shopping object, stamp its changed items with the new version and
+        record deleted items, for changes which have not been made with the
+        ShoppingItem ``save()`` and ``delete()`` methods.
+
+        The version and its records are committed together so a synchronization
+        client can not see the new version without them. The changes should be made
+        in the same transaction.
+
+        Arguments:
+            shopping_id (integer): Shopping object id.
+
+        Keyword Arguments:
+            changed (list): Product ids of created or edited items.
+            deleted (list): A tuple of item id and Product id for each deleted item.
+        """
+        with transaction.atomic():
+            cls.objects.filter(pk=shopping_id).touch()
+
+            if changed:
+                items = ShoppingItem.objects.filter(
+                    shopping_id=shopping_id,
+                    product_id__in=changed,
+                )
+                items.update(
+                    version=shopping_version(shopping_id),
+                    modified=timezone.now(),
+                )
+
+                # Created and edited items can not be distinguished here, event
+                # subscribers handle an edition of an unknown item as an addition
+                for item_id, product_id, quantity, done in items.order_by(
+                ).values_list("id", "product_id", "quantity", "done"):
+                    publish_shopping_event(
+                        shopping_id, "edit",
+                        item=item_id, product=product_id, quantity=quantity,
+                        done=done,
+                    )
+
+            if deleted:
+                ShoppingItemTombstone.objects.bulk_create([
+                    ShoppingItemTombstone(
+                        shopping_id=shopping_id,
+                        item=item_id,
+                        product=product_id,
+                        version=shopping_version(shopping_id),
+                    )
+                    for item_id, product_id in deleted
+                ])
+
+                for item_id, product_id in deleted:
+                    publish_shopping_event(
+                        shopping_id, "delete", item=item_id, product=product_id
+                    )
+
+        invalidate_shopping_inventory(shopping_id)
+
+    def set_items_done(self, done, product_ids=None):
+        """
+        Change the ``done`` value of all or some items with a single ``UPDATE`` query
+        then update the Shopping ``done`` value once.
+
+        Arguments:
+            done (boolean): Value to set on items.
+
+        Keyword Arguments:
+            product_ids (list): If given, only items for these Product ids are changed.
+
+        Returns:
+            list: A tuple of item id and Product id for each changed item.
+        """
+        items = ShoppingItem.objects.filter(shopping=self).exclude(done=done)
+        if product_ids is not None:
+            items = items.filter(product_id__in=product_ids)
+
+        with transaction.atomic():
+            changed = list(items.values_list("id", "product_id"))
+
+            if changed:
+                Shopping.objects.filter(pk=self.pk).touch()
+                items.filter(pk__in=[v[0] for v in changed]).update(
+                    done=done,
+                    version=shopping_version(self.pk),
+                    modified=timezone.now(),
+                )
+
+        if changed:
+            # Cached items are outdated
+            self.__dict__.pop("current_item_index", None)
+            self._purge_item_caches()
+            invalidate_shopping_inventory(self.pk)
+
+            for item_id, product_id in changed:
+                publish_shopping_event(
+                    self.pk, "done", item=item_id, product=product_id, done=done
+                )
+
+        self.update_shopping_done()
+
+        return changed
+
+    def clone(self, title=None, planning=None, skip_done=False):
+        """
+        Create a new Shopping object with a copy of the items.
+
+        Items are read with a single query and copied with a single bulk insert
+        whatever their amount. Copied items are not done since the new list has not
+        been shopped yet.
+
+        Keyword Arguments:
+            title (string): Title of the new list. On default it is the same title.
+            planning (datetime.datetime): Planning date of the new list. On default
+                it is the current date.
+            skip_done (boolean): If enabled, done items are not copied.
+
+        Returns:
+            Shopping: The new Shopping object.
+        """
+        # Default item ordering would join the Shopping table for nothing
+        items = ShoppingItem.objects.filter(shopping_id=self.pk).order_by()
+        if skip_done:
+            items = items.filter(done=False)
+
+        with transaction.atomic():
+            clone = Shopping.objects.create(
+                title=self.title if title is None else title,
+                planning=planning or timezone.now(),
+            )
+
+            now = timezone.now()
+            ShoppingItem.objects.bulk_create([
+                ShoppingItem(
+                    shopping=clone,
+                    product_id=product_id,
+                    quantity=quantity,
+                    created=now,
+                    modified=now,
+                    version=clone.version,
+                )
+                for product_id, quantity in items.values_list(
+                    "product_id", "quantity"
+                )
+            ])
+
+        return clone
+
+    def merge(self, sources):
+        """
+        Merge the items of other Shopping objects into this one.
+
+        Quantities of a same Product are summed (up to the field limit) and a merged
+        item is done only if all the summed items are done. Items are aggregated
+        with a single query then inserted or updated with a single bulk upsert on
+        the unique couple of Shopping and Product, so the number of queries does not
+        depend on the number of lists or items. Source lists are not changed.
+
+        Arguments:
+            sources (list): Shopping objects or ids to merge. This object is ignored
+                if it is included.
+
+        Returns:
+            list: Product ids of merged items.
+        """
+        source_ids = [getattr(v, "pk", v) for v in sources]
+        source_ids = [v for v in source_ids if v != self.pk]
+        if not source_ids:
+            return []
+
+        # Only products from sources, with the target quantity when it has them
+        rows = ShoppingItem.objects.filter(
+            shopping_id__in=source_ids + [self.pk],
+            product_id__in=ShoppingItem.objects.filter(
+                shopping_id__in=source_ids
+            ).values("product_id"),
+        ).order_by().values("product_id").annotate(
+            total=Sum("quantity"),
+            opens=Count("id", filter=Q(done=False)),
+        )
+
+        items = {
+            row["product_id"]: (row["total"], row["opens"] == 0)
+            for row in rows
+        }
+
+        self.upsert_items(items)
+
+        return list(items)
+
+    def upsert_items(self, items):
+        """
+        Create or update items with a single bulk upsert on the unique couple of
+        Shopping and Product, then record the changes and update the Shopping
+        ``done`` value once.
+
+        Arguments:
+            items (dict): Tuples of quantity and done value indexed on Product id.
+                Quantities are limited to ``ShoppingItem.MAX_QUANTITY``.
+        """
+        if not items:
+            return
+
+        with transaction.atomic():
+            ShoppingItem.objects.bulk_create(
+                [
+                    ShoppingItem(
+                        shopping_id=self.pk,
+                        product_id=product_id,
+                        quantity=min(quantity, ShoppingItem.MAX_QUANTITY),
+                        done=done,
+                    )
+                    for product_id, (quantity, done) in items.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["shopping", "product"],
+                update_fields=["quantity", "done"],
+            )
+            Shopping.record_item_changes(self.pk, changed=list(items))
+
+        # Cached items are outdated
+        self.__dict__.pop("current_item_index", None)
+        self._purge_item_caches()
+        self.update_shopping_done()
+
+    def add_items(self, quantities):
+        """
+        Add quantities to items, then record the changes and update the Shopping
+        ``done`` value once.
+
+        Missing items are created with a single bulk insert which ignores the
+        existing ones, then all items are incremented and set as undone with a
+        single ``UPDATE`` query. Quantities are added by the database so a
+        concurrent addition can not be lost.
+
+        Each item quantity is lowered to the limit minus the added quantity before
+        the addition, so the sum never exceeds the column range.
+
+        Arguments:
+            quantities (dict): Quantity to add indexed on Product id. Added and
+                resulting quantities are limited to ``ShoppingItem.MAX_QUANTITY``.
+        """
+        if not quantities:
+            return
+
+        with transaction.atomic():
+            ShoppingItem.objects.bulk_create(
+                [
+                    ShoppingItem(
+                        shopping_id=self.pk,
+                        product_id=product_id,
+                        quantity=0,
+                        done=False,
+                    )
+                    for product_id in quantities
+                ],
+                ignore_conflicts=True,
+            )
+            increments = {
+                product_id: min(quantity, ShoppingItem.MAX_QUANTITY)
+                for product_id, quantity in quantities.items()
+            }
+            ShoppingItem.objects.filter(
+                shopping_id=self.pk,
+                product_id__in=increments.keys(),
+            ).update(
+                quantity=Case(
+                    *[
+                        When(
+                            product_id=product_id,
+                            then=Least(
+                                F("quantity"),
+                                Value(ShoppingItem.MAX_QUANTITY - increment),
+                            ) + Value(increment),
+                        )
+                        for product_id, increment in increments.items()
+                    ],
+                    output_field=models.PositiveSmallIntegerField(),
+                ),
+                done=False,
+            )
+            Shopping.record_item_changes(self.pk, changed=list(quantities))
+
+        # Cached items are outdated
+        self.__dict__.pop("current_item_index", None)
+        self._purge_item_caches()
+        self.update_shopping_done()
+
+    def create_recurrence(self):
+        """
+        Create the next list of a recurring template, planned on the template
+        planning date which is then moved to the following recurrence.
+
+        The planning date is moved with a conditional ``UPDATE`` query so a same
+        recurrence can not be created twice from concurrent calls.
+
+        Returns:
+            Shopping: The new Shopping object or ``None`` if this is not a
+            recurring template or if the recurrence has already been created.
+        """
+        if not self.template or not self.recurrence:
+            return None
+
+        planning = self.planning
+
+        with transaction.atomic():
+            moved = Shopping.objects.filter(pk=self.pk, planning=planning).update(
+                planning=F("planning") + datetime.timedelta(days=self.recurrence),
+                version=F("version") + 1,
+                modified=timezone.now(),
+            )
+            if not moved:
+                return None
+
+            clone = self.clone(planning=planning)
+
+        self.refresh_from_db(fields=["planning", "version", "modified"])
+
+        return clone
+
     def update_shopping_done(self, commit=True):
         """
         Update the field ``done`` of a Shopping object depending its current value and
         its items.
 
+        Items are allowed to make the shopping done if they are all done themselves
+        and to make it undone if at least one of them is undone.
+
+        On commit the change is made with a conditional ``UPDATE`` query to the value
+        opposite to the object one, where the undone items are checked with an
+        ``EXISTS`` subquery. The query only depends on database values (not on the
+        object ones which may be outdated), so the value can not be wrong even if
+        items or the Shopping are concurrently edited. When nothing has been updated
+        the database values are read to know if the object was outdated and must be
+        fixed. Item changes must have been saved (and committed) before.
+
         TODO: When creating a new fresh Shopping object, if no items have been added
         the following cause the Shopping object to be directly marked as 'done'. It's
         not what would be expected, at least a new object without initial items should
         let it be 'undone'.
 
+        Keyword Arguments:
+            commit (boolean): If disabled, the new value is only set on object
+                without to be saved.
+
         Returns:
-            boolean: True if an update of ``done`` value has been done else False.
+            boolean: The new value of ``done`` if it has been changed else ``None``.
         """
-        new_value = None
+        undone_items = Exists(
+            ShoppingItem.objects.filter(shopping=OuterRef("pk"), done=False)
+        )
 
-        # Items are allowed to make the shopping done if they are all done themselves
-        if (
-            self.done is False and
-            ShoppingItem.objects.filter(shopping=self, done=False).count() == 0
-        ):
-            new_value = True
-        # Items are allowed to make the shopping undone if at least one of them is
-        # undone
-        elif (
-            self.done is True and
-            ShoppingItem.objects.filter(shopping=self, done=False).count() > 0
-        ):
-            new_value = False
+        def apply(value):
+            """
+            Set the given done value only if the database one does not match the
+            items, the returned number of updated rows tells if it has been set.
+            """
+            return Shopping.objects.filter(pk=self.pk, done=not value).filter(
+                ~undone_items if value else undone_items
+            ).update(
+                done=value,
+                version=F("version") + 1,
+                modified=timezone.now(),
+            )
+
+        # The common case is a change from the object value
+        if commit and apply(not self.done):
+            self.done = not self.done
+            invalidate_shopping_inventory(self.pk)
+
+            return self.done
+
+        row = Shopping.objects.filter(pk=self.pk).annotate(
+            expected=~undone_items
+        ).values_list("done", "expected").first()
+        if row is None:
+            return None
+
+        current, expected = row
+        if not commit:
+            if expected == self.done:
+                return None
 
-        if new_value is not None:
-            self.done = new_value
+            self.done = expected
 
-            if commit:
-                self.save()
+            return expected
 
-        return new_value
+        # The object was outdated
+        self.done = current
+        if current == expected:
+            return None
+
+        if not apply(expected):
+            # Concurrently changed since the read, the value can not be known
+            self.refresh_from_db(fields=["done"])
+            return None
+
+        self.done = expected
+        invalidate_shopping_inventory(self.pk)
+
+        return expected
 
     def save(self, *args, **kwargs):
         # Auto update 'modified' value on each save
         self.modified = timezone.now()
 
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        # Version is incremented from database value so it can not go back even from
+        # an outdated object
+        self.version = F("version") + 1
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = set(kwargs["update_fields"]) | {
+                "modified", "version"
+            }
+
         super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["version"])
 
 
 class ShoppingItem(models.Model):
@@ -262,6 +841,10 @@ class ShoppingItem(models.Model):
     Attributes:
         created (models.DateTimeField): Required creation datetime, automatically
             filled.
+        modified (models.DateTimeField): Last modification datetime, automatically
+            updated on each change.
+        version (models.PositiveBigIntegerField): Version of the Shopping object
+            from its last change, automatically filled.
         shopping (atoum.models.Shopping): Required
         product (atoum.models.Product): Required
         quantity (models.PositiveSmallIntegerField): Required positive small integer.
@@ -271,6 +854,16 @@ class ShoppingItem(models.Model):
         _("creation date"),
         default=timezone.now,
     )
+    modified = models.DateTimeField(
+        _("modification date"),
+        default=timezone.now,
+        editable=False,
+    )
+    version = models.PositiveBigIntegerField(
+        _("version"),
+        default=0,
+        editable=False,
+    )
     shopping = models.ForeignKey(
         "atoum.Shopping",
         on_delete=models.CASCADE
@@ -286,6 +879,11 @@ class ShoppingItem(models.Model):
         blank=True,
     )
 
+    MAX_QUANTITY = 32767
+    """
+    Highest quantity value allowed on all database backends.
+    """
+
     class Meta:
         verbose_name = _("Shopping item")
         verbose_name_plural = _("Shopping items")
@@ -299,6 +897,191 @@ class ShoppingItem(models.Model):
                 name="atoum_unique_shoppingitem_shopping_product"
             ),
         ]
+        indexes = [
+            # Changes of a Shopping since a version
+            models.Index(
+                fields=["shopping", "version"],
+                name="atoum_shoppingitem_version",
+            ),
+            # Changes of a Shopping since a date
+            models.Index(
+                fields=["shopping", "modified"],
+                name="atoum_shoppingitem_modified",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        """
+        Touch the Shopping object, stamp the item with the new Shopping version,
+        invalidate the cached inventory and publish the item event.
+
+        The event is ``add`` for a new item, ``done`` when only the ``done`` field is
+        saved and ``edit`` for any other change.
+
+        .. Note::
+            This is done from ``save()`` and ``delete()`` instead of signals since
+            any signal receiver would disable the fast deletion of querysets. So
+            queryset deletions, updates and bulk operations must use
+            ``Shopping.record_item_changes()`` (or the equivalent queries).
+        """
+        event = "add" if self._state.adding else "edit"
+        if kwargs.get("update_fields") is not None and (
+            set(kwargs["update_fields"]) == {"done"}
+        ):
+            event = "done"
+
+        self.modified = timezone.now()
+        self.version = shopping_version(self.shopping_id)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = set(kwargs["update_fields"]) | {
+                "modified", "version"
+            }
+
+        # Version and item are committed together
+        with transaction.atomic():
+            Shopping.objects.filter(pk=self.shopping_id).touch()
+            super().save(*args, **kwargs)
+        # Drop the version expression, value will be loaded again from database on
+        # demand
+        del self.version
+
+        invalidate_shopping_inventory(self.shopping_id)
+
+        publish_shopping_event(
+            self.shopping_id, event,
+            item=self.id,
+            product=self.product_id,
+            quantity=self.quantity,
+            done=self.done,
+        )
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the item and record it as a tombstone for synchronization clients,
+        this publishes the ``delete`` item event.
+        """
+        item_id, product_id = self.id, self.product_id
+
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+
+            Shopping.record_item_changes(
+                self.shopping_id,
+                deleted=[(item_id, product_id)],
+            )
+
+        return deleted
+
+
+class ShoppingItemTombstone(models.Model):
+    """
+    Record of a deleted Shopping item, it is used by synchronization clients to
+    know about deletions since their last synchronization.
+
+    Attributes:
+        shopping (atoum.models.Shopping): Required Shopping of the deleted item.
+        item (models.PositiveBigIntegerField): Required deleted item id.
+        product (models.PositiveBigIntegerField): Required product id of the deleted
+            item, it is not a relation since the Product may be deleted also.
+        version (models.PositiveBigIntegerField): Version of the Shopping object
+            from the deletion.
+        deleted (models.DateTimeField): Deletion datetime, automatically filled.
+    """
+    shopping = models.ForeignKey(
+        "atoum.Shopping",
+        on_delete=models.CASCADE
+    )
+    item = models.PositiveBigIntegerField(_("item id"))
+    product = models.PositiveBigIntegerField(_("product id"))
+    version = models.PositiveBigIntegerField(_("version"))
+    deleted = models.DateTimeField(
+        _("deletion date"),
+        default=timezone.now,
+    )
+
+    class Meta:
+        verbose_name = _("Shopping item tombstone")
+        verbose_name_plural = _("Shopping item tombstones")
+        ordering = ["shopping", "version"]
+        indexes = [
+            models.Index(
+                fields=["shopping", "version"],
+                name="atoum_tombstone_version",
+            ),
+            models.Index(
+                fields=["shopping", "deleted"],
+                name="atoum_tombstone_deleted",
+            ),
+        ]
+
+
+def shopping_products_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Signal receiver to record item changes made through the ``Shopping.products``
+    relation manager (or its reverse ``Product.shoppings``), since it creates and
+    deletes items without their ``save()`` and ``delete()`` methods.
+    """
+    if action in ("pre_remove", "pre_clear"):
+        # Memorize items before their deletion to record them
+        items = ShoppingItem.objects.filter(
+            **{"product" if reverse else "shopping": instance}
+        )
+        if pk_set:
+            items = items.filter(
+                **{"shopping_id__in" if reverse else "product_id__in": pk_set}
+            )
+        instance._removed_shopping_items = list(
+            items.values_list("shopping_id", "id", "product_id")
+        )
+    elif action == "post_add" and pk_set:
+        if reverse:
+            for shopping_id in pk_set:
+                Shopping.record_item_changes(shopping_id, changed=[instance.pk])
+        else:
+            Shopping.record_item_changes(instance.pk, changed=list(pk_set))
+    elif action in ("post_remove", "post_clear"):
+        deleted = {}
+        for shopping_id, item_id, product_id in instance.__dict__.pop(
+            "_removed_shopping_items", []
+        ):
+            deleted.setdefault(shopping_id, []).append((item_id, product_id))
+
+        for shopping_id, items in deleted.items():
+            Shopping.record_item_changes(shopping_id, deleted=items)
+
+
+def shopping_product_pre_delete(sender, instance, **kwargs):
+    """
+    Signal receiver to record the items of a deleted Product, since they are
+    deleted by the cascade without their ``delete()`` method.
+    """
+    deleted = {}
+    for shopping_id, item_id in ShoppingItem.objects.filter(
+        product=instance
+    ).values_list("shopping_id", "id"):
+        deleted.setdefault(shopping_id, []).append((item_id, instance.pk))
+
+    for shopping_id, items in deleted.items():
+        Shopping.record_item_changes(shopping_id, deleted=items)
+
+
+post_save.connect(
+    shopping_inventory_post_change,
+    dispatch_uid="shopping_inventory_on_save",
+    sender=Shopping,
+)
+post_delete.connect(
+    shopping_inventory_post_change,
+    dispatch_uid="shopping_inventory_on_delete",
+    sender=Shopping,
+)
+pre_delete.connect(
+    shopping_product_pre_delete,
+    dispatch_uid="shopping_product_on_delete",
+    sender="atoum.Product",
+)
+m2m_changed.connect(
+    shopping_products_changed,
+    dispatch_uid="shopping_products_on_change",
+    sender=Shopping.products.through,
+)
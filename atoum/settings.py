@@ -55,3 +55,44 @@ ATOUM_SHOPPING_PRODUCT_CONTROLS_TEMPLATE = "atoum/product/partials/controls.html
 """
 Template path used to render product controls for a possible opened Shopping list.
 """
+
+ATOUM_SHOPPING_INVENTORY_CACHE_TIMEOUT = 60 * 60 * 24
+"""
+Time in seconds to keep the data of an opened Shopping list in cache. Data is
+removed from cache when the Shopping list or its items change, this timeout is only
+to purge the data of lists which are not opened anymore.
+"""
+
+ATOUM_SHOPPING_EVENTS_ENABLED = False
+"""
+Enable the live events of Shopping lists. The events view holds its connection
+open as long as the page is displayed, so this must only be enabled for a project
+served with ASGI. When disabled, the events view responds with a HTTP 404 and the
+shopping list detail does not listen to events.
+"""
+
+ATOUM_SHOPPING_EVENTS_BROKER = "atoum.utils.events.LocalEventBroker"
+"""
+Python path to the broker class used to send the live events of Shopping lists to
+their subscribers. The default broker only works within a single process, a project
+served with multiple processes must use a broker on a shared service.
+"""
+
+ATOUM_SHOPPING_EVENTS_KEEPALIVE = 15
+"""
+Time in seconds without any event after which a comment is sent to the shopping
+list events subscribers to keep their connection alive.
+"""
+
+ATOUM_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+"""
+Time in seconds to keep the rendered catalog tree in cache. Rendered tree is cached
+for the current catalog version so it is never outdated, this timeout is only to
+purge the renders from previous versions.
+"""
+
+ATOUM_TREE_EXPORT_CHUNK_SIZE = 2000
+"""
+Number of rows fetched at once from database for each tree level when streaming the
+catalog tree export.
+"""
@@ -112,7 +112,8 @@ def product_shopping_controls(context, product, **kwargs):
 
     Keyword Arguments:
         shopping (atoum.models.Shopping): Shopping object to use instead of inventory
-            from session.
+            from session. A ``ShoppingSnapshot`` can be given instead so the items
+            already loaded for the request are used.
 
     Returns:
         string: Rendered template tag fragment.
@@ -148,7 +149,6 @@ def product_shopping_controls(context, product, **kwargs):
         tag_context["current_shopping"] = shopping_inventory
 
     if tag_context["current_shopping"]:
-        tag_context["current_shopping"] = tag_context["current_shopping"]
         tag_context["is_product_shopped"] = (
             tag_context["current_shopping"].is_product_shopped(product)
         )
@@ -4,6 +4,7 @@ from .views import (
     AssortmentAutocompleteView,
     AssortmentDetailView,
     AssortmentIndexView,
+    CatalogTreeExportView,
     CategoryAutocompleteView,
     CategoryDetailView,
     CategoryIndexView,
@@ -12,12 +13,21 @@ from .views import (
     DashboardView,
     DummyView,
     GlobalSearchView,
+    LazyTreeChildrenView,
+    LazyTreeView,
     ProductAutocompleteView,
     ProductDetailView,
     ProductIndexView,
     RecursiveTreeView,
+    ShoppinglistBatchView,
+    ShoppinglistCloneView,
     ShoppinglistDetailView,
+    ShoppinglistEventsView,
     ShoppinglistIndexView,
+    ShoppinglistInventoryView,
+    ShoppinglistItemsDoneView,
+    ShoppinglistQuickAddView,
+    ShoppinglistSyncView,
     ShoppinglistToggleSelectionView,
     ShoppinglistManageProductView,
 )
@@ -31,6 +41,15 @@ urlpatterns = [
 
     # Full recursive tree of everything
     path("tree/", RecursiveTreeView.as_view(), name="tree"),
+    path("tree/export/", CatalogTreeExportView.as_view(), name="tree-export"),
+
+    # Catalog tree with children loaded on demand
+    path("tree/lazy/", LazyTreeView.as_view(), name="tree-lazy"),
+    path(
+        "tree/lazy/<slug:level>/<int:pk>/",
+        LazyTreeChildrenView.as_view(),
+        name="tree-children"
+    ),
 
     path(
         "consumables/",
@@ -93,6 +112,11 @@ urlpatterns = [
         ShoppinglistIndexView.as_view(),
         name="shopping-list-index"
     ),
+    path(
+        "shopping/inventory/",
+        ShoppinglistInventoryView.as_view(),
+        name="shopping-list-inventory"
+    ),
     # TODO: Rename with "inventory" instead
     path(
         "shopping/close-selection/",
@@ -115,6 +139,36 @@ urlpatterns = [
         ShoppinglistManageProductView.as_view(),
         name="shopping-list-product"
     ),
+    path(
+        "shopping/<int:pk>/batch/",
+        ShoppinglistBatchView.as_view(),
+        name="shopping-list-batch"
+    ),
+    path(
+        "shopping/<int:pk>/done/",
+        ShoppinglistItemsDoneView.as_view(),
+        name="shopping-list-items-done"
+    ),
+    path(
+        "shopping/<int:pk>/clone/",
+        ShoppinglistCloneView.as_view(),
+        name="shopping-list-clone"
+    ),
+    path(
+        "shopping/<int:pk>/quick-add/",
+        ShoppinglistQuickAddView.as_view(),
+        name="shopping-list-quick-add"
+    ),
+    path(
+        "shopping/<int:pk>/sync/",
+        ShoppinglistSyncView.as_view(),
+        name="shopping-list-sync"
+    ),
+    path(
+        "shopping/<int:pk>/events/",
+        ShoppinglistEventsView.as_view(),
+        name="shopping-list-events"
+    ),
 
     # Autocomplete views for various models, only for staff users
     path(
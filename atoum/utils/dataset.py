@@ -2,6 +2,8 @@ import json
 
 from dataclasses import dataclass, field
 
+from ..models import Assortment, Category, Consumable, Product
+
 
 @dataclass
 class InitialCatalog:
@@ -10,9 +12,14 @@ class InitialCatalog:
 
     .. Note::
         The tree methods purpose is mostly for debugging. Their behavior is to start
-        from stored objects then recursively list their children directly from database
+        from stored objects then list their children directly from database
         instead of those from this dataclass because retrieving children is more
-        difficult from store than from db.
+        difficult from store than from db. Children are fetched with a single query
+        per level whatever the amount of objects.
+
+    Attributes:
+        LEVELS (tuple): Level definitions in hierarchy order, each item is a tuple of
+            model and the field name of the foreign key to the parent level.
     """
     assortments: dict = field(default_factory=dict)
     brands: dict = field(default_factory=dict)
@@ -20,6 +27,13 @@ class InitialCatalog:
     categories: dict = field(default_factory=dict)
     products: dict = field(default_factory=dict)
 
+    LEVELS = (
+        (Consumable, None),
+        (Assortment, "consumable"),
+        (Category, "assortment"),
+        (Product, "category"),
+    )
+
     def get_repr(self, value, attr=None):
         """
         Return representation of an object.
@@ -35,6 +49,80 @@ class InitialCatalog:
             return getattr(value, attr)
         return repr(value)
 
+    def _get_descendant_trees(self, depth, parent=None, attr=None):
+        """
+        Build trees of descendants for nodes of a level with a single query per
+        level.
+
+        Each descendant level is fetched at once then grouped on parent id. Trees
+        are assembled from the deepest level up to the nodes so there is no
+        recursion.
+
+        Arguments:
+            depth (integer): Index of nodes level from ``LEVELS``.
+
+        Keyword Arguments:
+            parent (object): Parent object of the nodes, descendant levels are
+                filtered on it. If not given, descendant levels are fetched without
+                any filter since the nodes are the whole stored level. So there is
+                never a filter on a list of ids which could exceed the query
+                parameters limit of database.
+            attr (string): Representation attribute, see ``get_repr()``.
+
+        Returns:
+            dict: Trees of children indexed on node id. A node without children
+            has no item.
+        """
+        levels = []
+        path = [self.LEVELS[depth][1]]
+        for model, parent_field in self.LEVELS[depth + 1:]:
+            path.insert(0, parent_field)
+            objects = model.objects.all()
+            if parent is not None:
+                objects = objects.filter(**{"__".join(path): parent.pk})
+            levels.append((parent_field, objects))
+
+        trees = {}
+        # Walk from the deepest level where trees of children are already built,
+        # only objects of the last level of hierarchy have no children tree
+        for position, (parent_field, objects) in enumerate(reversed(levels)):
+            leaf = position == 0
+            grouped = {}
+            for obj in objects:
+                children = None if leaf else trees.get(obj.pk, [])
+                grouped.setdefault(getattr(obj, parent_field + "_id"), []).append(
+                    (self.get_repr(obj, attr=attr), children)
+                )
+            trees = grouped
+
+        return trees
+
+    def _get_level_tree(self, depth, nodes, parent=None, attr=None):
+        """
+        Build tree for given nodes with their descendants.
+
+        Arguments:
+            depth (integer): Index of nodes level from ``LEVELS``.
+            nodes (list): Model objects of the same level.
+
+        Keyword Arguments:
+            parent (object): Parent object of the nodes when they are its children
+                from database, else nodes are the whole stored level.
+            attr (string): Representation attribute, see ``get_repr()``.
+
+        Returns:
+            list: List of tuples, each tuple contains the node representation and its
+            children tree or a null value for the last level.
+        """
+        nodes = list(nodes)
+
+        if depth == len(self.LEVELS) - 1:
+            return [(self.get_repr(v, attr=attr), None) for v in nodes]
+
+        trees = self._get_descendant_trees(depth, parent=parent, attr=attr)
+
+        return [(self.get_repr(v, attr=attr), trees.get(v.pk, [])) for v in nodes]
+
     def get_product_tree(self, category, attr=None):
         """
         Get recursive tree of all Product objects.
@@ -57,10 +145,7 @@ class InitialCatalog:
             if category
             else self.products.values()
         )
-        return [
-            (self.get_repr(v, attr=attr), None)
-            for v in products
-        ]
+        return self._get_level_tree(3, products, parent=category, attr=attr)
 
     def get_category_tree(self, assortment=None, attr=None):
         """
@@ -78,15 +163,13 @@ class InitialCatalog:
             list: List of tuples, each tuple contains the object slug and its possible
                 children products.
         """
+        # Products are already fetched for all categories at once
         categories = (
-            assortment.get_categories()
+            assortment.get_categories().prefetch_related(None)
             if assortment
             else self.categories.values()
         )
-        return [
-            (self.get_repr(v, attr=attr), self.get_product_tree(v, attr=attr))
-            for v in categories
-        ]
+        return self._get_level_tree(2, categories, parent=assortment, attr=attr)
 
     def get_assortment_tree(self, consumable=None, attr=None):
         """
@@ -109,10 +192,7 @@ class InitialCatalog:
             if consumable
             else self.assortments.values()
         )
-        return [
-            (self.get_repr(v, attr=attr), self.get_category_tree(v, attr=attr))
-            for v in assortments
-        ]
+        return self._get_level_tree(1, assortments, parent=consumable, attr=attr)
 
     def get_consumable_tree(self, attr=None):
         """
@@ -128,10 +208,7 @@ class InitialCatalog:
             list: List of tuples, each tuple contains the object slug and its possible
                 children assortments.
         """
-        return [
-            (self.get_repr(v, attr=attr), self.get_assortment_tree(v, attr=attr))
-            for v in self.consumables.values()
-        ]
+        return self._get_level_tree(0, self.consumables.values(), attr=attr)
 
     def get_brand_tree(self, attr=None):
         """
@@ -174,13 +251,6 @@ class InitialCatalog:
         """
         return json.dumps(self.get_consumable_tree(attr=attr), indent=4)
 
-    def _recursive_walk(self, nodes, items, level=1, attr=None):
-        if items:
-            indent = ("   " * level) + "└─"
-            for key, children in items:
-                nodes.append(indent + key)
-                self._recursive_walk(nodes, children, level=level + 1)
-
     def get_ascii_tree(self, attr=None):
         """
         Build a basic recursive ascii tree starting from consumables.
@@ -195,8 +265,20 @@ class InitialCatalog:
             string: An ascii tree.
         """
         nodes = []
-        for key, children in self.get_consumable_tree(attr=attr):
-            nodes.append("───" + key)
-            self._recursive_walk(nodes, children)
+        # Stack of item iterators with their level, it is walked depth first
+        stack = [(0, iter(self.get_consumable_tree(attr=attr)))]
+        while stack:
+            level, items = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                continue
+
+            key, children = item
+            nodes.append(
+                (("   " * level) + "└─" + key) if level else ("───" + key)
+            )
+            if children:
+                stack.append((level + 1, iter(children)))
 
         return "\n".join(nodes)
@@ -0,0 +1,231 @@
+import asyncio
+import functools
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+SHOPPING_EVENTS_CHANNEL = "atoum-shopping-{shopping_id}"
+"""
+Channel name template for the events of a Shopping object.
+"""
+
+
+class BaseEventBroker:
+    """
+    Interface of an event broker which fans out published events to the
+    subscribers of a channel.
+
+    An event is a dictionnary with an ``event`` item for the event name and a
+    ``data`` item for its JSON serializable payload.
+    """
+    def publish(self, channel, event):
+        """
+        Send an event to all current subscribers of a channel.
+
+        Arguments:
+            channel (string): Channel name.
+            event (dict): Event to send.
+        """
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        """
+        Subscribe to a channel from the current event loop.
+
+        Arguments:
+            channel (string): Channel name.
+
+        Returns:
+            object: A subscription object with an asynchronous ``get(timeout)``
+            method which returns the next event or ``None`` when the timeout is
+            reached, and a ``close()`` method to unsubscribe.
+        """
+        raise NotImplementedError
+
+
+class LocalSubscription:
+    """
+    Subscription of a ``LocalEventBroker`` channel, events are queued in the event
+    loop of the subscriber.
+
+    When the queue is full because the subscriber does not consume events fast
+    enough, queued events are dropped and the next one is a ``reset`` event so the
+    subscriber knows it has to reload its data.
+
+    Arguments:
+        broker (LocalEventBroker): The broker.
+        channel (string): Channel name.
+        loop (asyncio.AbstractEventLoop): Event loop of the subscriber.
+
+    Keyword Arguments:
+        size (integer): Maximum number of queued events.
+    """
+    def __init__(self, broker, channel, loop, size=100):
+        self.broker = broker
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+        self.overflow = False
+
+    def push(self, event):
+        """
+        Queue an event, it must be called from the subscriber event loop.
+
+        Arguments:
+            event (dict): Event to queue.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflow = True
+
+    async def get(self, timeout=None):
+        """
+        Wait for the next event.
+
+        Keyword Arguments:
+            timeout (integer): Time in seconds to wait for an event.
+
+        Returns:
+            dict: The event or ``None`` if the timeout has been reached.
+        """
+        if self.overflow:
+            self.overflow = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return {"event": "reset", "data": {}}
+
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        """
+        Unsubscribe from the broker.
+        """
+        self.broker.unsubscribe(self)
+
+
+class LocalEventBroker(BaseEventBroker):
+    """
+    In-memory event broker.
+
+    Events are only sent to the subscribers of the current process, so with
+    multiple server processes a broker on a shared service (like a Redis Pub/Sub)
+    has to be used instead.
+
+    Publishing is thread safe so events can be published from synchronous code
+    running in other threads than the subscriber event loops.
+    """
+    def __init__(self):
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # Event loop has been closed without unsubscribing
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel):
+        subscription = LocalSubscription(self, channel, asyncio.get_running_loop())
+
+        with self.lock:
+            self.subscriptions.setdefault(channel, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription from its channel.
+
+        Arguments:
+            subscription (LocalSubscription): Subscription to remove.
+        """
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.channel, None)
+
+
+@functools.cache
+def load_event_broker(path):
+    """
+    Load and instanciate an event broker once per process.
+
+    Arguments:
+        path (string): Python path to the broker class.
+
+    Returns:
+        BaseEventBroker: Broker instance.
+    """
+    return import_string(path)()
+
+
+def get_event_broker():
+    """
+    Get the event broker from setting ``ATOUM_SHOPPING_EVENTS_BROKER``.
+
+    Returns:
+        BaseEventBroker: Broker instance.
+    """
+    return load_event_broker(settings.ATOUM_SHOPPING_EVENTS_BROKER)
+
+
+def get_shopping_channel(shopping_id):
+    """
+    Return the events channel name of a Shopping object.
+
+    Arguments:
+        shopping_id (integer): Shopping object id.
+
+    Returns:
+        string: Channel name.
+    """
+    return SHOPPING_EVENTS_CHANNEL.format(shopping_id=shopping_id)
+
+
+def publish_shopping_event(shopping_id, name, **data):
+    """
+    Publish an item event of a Shopping object once the current transaction is
+    committed, or immediately without any transaction.
+
+    Arguments:
+        shopping_id (integer): Shopping object id.
+        name (string): Event name, either ``add``, ``edit``, ``delete`` or ``done``.
+        **data: Event payload.
+    """
+    transaction.on_commit(
+        functools.partial(
+            get_event_broker().publish,
+            get_shopping_channel(shopping_id),
+            {"event": name, "data": data},
+        )
+    )
+
+
+def format_server_event(event):
+    """
+    Format an event as a Server-Sent Events message.
+
+    Arguments:
+        event (dict): Event to format.
+
+    Returns:
+        string: Message.
+    """
+    return "event: {name}\ndata: {data}\n\n".format(
+        name=event["event"],
+        data=json.dumps(event["data"], separators=(",", ":")),
+    )
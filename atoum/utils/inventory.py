@@ -0,0 +1,336 @@
+import functools
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils.dateformat import format as date_format
+from django.utils.text import capfirst
+
+from .snapshot import get_catalog_version
+
+
+INVENTORY_CACHE_KEY = "atoum-shopping-inventory-{shopping_id}-{version}"
+"""
+Cache key template for the opened inventory data of a Shopping object. The catalog
+version is included so a renamed or removed Product is never displayed from cache.
+"""
+
+ProductRow = namedtuple("ProductRow", ["id", "title"])
+InventoryItemRow = namedtuple(
+    "InventoryItemRow", ["id", "quantity", "done", "product"]
+)
+
+
+class ShoppingLookupMixin:
+    """
+    Product lookup methods for objects with a ``current_item_index`` dictionnary of
+    items indexed on their Product id, they behave like the Shopping ones.
+    """
+    def is_product_shopped(self, product):
+        """
+        Check if given Product is an item of the Shopping object.
+
+        Arguments:
+            product (atoum.models.Product): Product object.
+
+        Returns:
+            boolean: True if product is in list else None.
+        """
+        return product.id in self.current_item_index
+
+    def item_for_product(self, product):
+        """
+        Return the item row for a product in shopping list.
+
+        Arguments:
+            product (atoum.models.Product): Product object.
+
+        Returns:
+            object: The item for given Product if it is an item of the Shopping
+            object else it returns ``None``.
+        """
+        return self.current_item_index.get(product.id)
+
+    def quantity_for_product(self, product):
+        """
+        Return the saved item quantity for the given Product.
+
+        Arguments:
+            product (atoum.models.Product): Product object.
+
+        Returns:
+            integer: The quantity of Product if it is an item of the Shopping object
+            else it returns ``None``.
+        """
+        item = self.item_for_product(product)
+
+        return item.quantity if item else None
+
+
+class ShoppingInventory(ShoppingLookupMixin):
+    """
+    Render ready data of an opened Shopping object with its items.
+
+    It exposes the same attributes and methods than a Shopping object for the
+    templates of the opened inventory and the product controls, so it can be used
+    in their place without any query.
+
+    Arguments:
+        id (integer): Shopping object id.
+        title (string): Shopping object title.
+        created (datetime.datetime): Shopping object creation date.
+        done (boolean): Shopping object done value.
+        items (list): List of ``InventoryItemRow`` for Shopping items.
+    """
+    def __init__(self, id, title, created, done, items):
+        self.id = id
+        self.pk = id
+        self.title = title
+        self.created = created
+        self.done = done
+        self.items = items
+        self.current_item_index = {item.product.id: item for item in items}
+
+    def __str__(self):
+        """
+        Display title if not empty else the creation date, like ``Shopping``.
+        """
+        return self.title or capfirst(date_format(self.created, "l d F Y"))
+
+    @classmethod
+    def build(cls, shopping_id):
+        """
+        Build inventory data from database.
+
+        Arguments:
+            shopping_id (integer): Shopping object id.
+
+        Returns:
+            ShoppingInventory: Inventory data or ``None`` if the Shopping object does
+            not exist.
+        """
+        # Avoid circular import since models connect signals to this module
+        from ..models import Shopping, ShoppingItem
+
+        shopping = Shopping.objects.filter(pk=shopping_id).values(
+            "id", "title", "created", "done"
+        ).first()
+        if shopping is None:
+            return None
+
+        items = [
+            InventoryItemRow(id, quantity, done, ProductRow(product_id, title))
+            for id, quantity, done, product_id, title in (
+                ShoppingItem.objects.filter(shopping_id=shopping_id).values_list(
+                    "id", "quantity", "done", "product_id", "product__title"
+                )
+            )
+        ]
+
+        return cls(items=items, **shopping)
+
+    def get_absolute_url(self):
+        """
+        Return absolute URL to the Shopping detail view.
+
+        Returns:
+            string: An URL.
+        """
+        return reverse("atoum:shopping-list-detail", args=[self.id])
+
+    @property
+    def current_items(self):
+        """
+        Shopping items, named like the Shopping property.
+
+        Returns:
+            list: List of ``InventoryItemRow``.
+        """
+        return self.items
+
+
+class ShoppingSnapshot(ShoppingLookupMixin):
+    """
+    Items of a Shopping object loaded once and shared for a request.
+
+    It is used in place of the Shopping object from the shopping detail view, the
+    context processor and the template tags so they all use the same items from a
+    single query. Status counts are computed from these items.
+
+    Arguments:
+        shopping (atoum.models.Shopping): Shopping object.
+        items (list): List of ShoppingItem objects with their Product.
+    """
+    def __init__(self, shopping, items):
+        self.object = shopping
+        self.id = shopping.id
+        self.pk = shopping.pk
+        self.done = shopping.done
+        self.items = items
+        self.current_item_index = {item.product_id: item for item in items}
+        self.dones = len([v for v in items if v.done is True])
+        self.opens = len(items) - self.dones
+
+    def __str__(self):
+        return str(self.object)
+
+    @classmethod
+    def build(cls, shopping):
+        """
+        Build snapshot with a single query for the items.
+
+        Arguments:
+            shopping (atoum.models.Shopping): Shopping object.
+
+        Returns:
+            ShoppingSnapshot: The snapshot.
+        """
+        return cls(shopping, list(shopping.get_items()))
+
+    def get_absolute_url(self):
+        """
+        Return absolute URL to the Shopping detail view.
+
+        Returns:
+            string: An URL.
+        """
+        return self.object.get_absolute_url()
+
+    @property
+    def current_items(self):
+        """
+        Shopping items, named like the Shopping property.
+
+        Returns:
+            list: List of ShoppingItem objects.
+        """
+        return self.items
+
+    def get_status(self):
+        """
+        Get the same status than ``Shopping.get_status()`` without any query.
+
+        Returns:
+            dict: The status name (either ``open``, ``ongoing`` or ``done``) and the
+            numbers of done and open items.
+        """
+        computed = "open"
+        if self.done is True:
+            computed = "done"
+        elif self.dones > 0:
+            computed = "ongoing"
+
+        return {
+            "status": computed,
+            "dones": self.dones,
+            "opens": self.opens,
+        }
+
+
+def get_request_snapshot(request, shopping):
+    """
+    Get the snapshot of a Shopping object for the current request, it is built once
+    then stored on the request.
+
+    Arguments:
+        request (object): A Django Request object.
+        shopping (atoum.models.Shopping): Shopping object.
+
+    Returns:
+        ShoppingSnapshot: The snapshot.
+    """
+    snapshots = request.__dict__.setdefault("_atoum_shopping_snapshots", {})
+
+    if shopping.id not in snapshots:
+        snapshots[shopping.id] = ShoppingSnapshot.build(shopping)
+
+    return snapshots[shopping.id]
+
+
+def find_request_snapshot(request, shopping_id):
+    """
+    Find an already built snapshot of a Shopping object for the current request.
+
+    Arguments:
+        request (object): A Django Request object.
+        shopping_id (integer): Shopping object id.
+
+    Returns:
+        ShoppingSnapshot: The snapshot or ``None`` if it has not been built.
+    """
+    return request.__dict__.get("_atoum_shopping_snapshots", {}).get(shopping_id)
+
+
+def get_inventory_cache_key(shopping_id):
+    """
+    Return the cache key of a Shopping inventory for the current catalog version.
+
+    Arguments:
+        shopping_id (integer): Shopping object id.
+
+    Returns:
+        string: Cache key.
+    """
+    return INVENTORY_CACHE_KEY.format(
+        shopping_id=shopping_id,
+        version=get_catalog_version(),
+    )
+
+
+def get_shopping_inventory(shopping_id):
+    """
+    Get inventory data of a Shopping object from cache or build it.
+
+    Arguments:
+        shopping_id (integer): Shopping object id.
+
+    Returns:
+        ShoppingInventory: Inventory data or ``None`` if the Shopping object does not
+        exist.
+    """
+    key = get_inventory_cache_key(shopping_id)
+    inventory = cache.get(key)
+
+    if inventory is None:
+        inventory = ShoppingInventory.build(shopping_id)
+        if inventory is not None:
+            cache.set(key, inventory, settings.ATOUM_SHOPPING_INVENTORY_CACHE_TIMEOUT)
+
+    return inventory
+
+
+def delete_shopping_inventory(shopping_id):
+    """
+    Remove inventory data of a Shopping object from cache.
+
+    Arguments:
+        shopping_id (integer): Shopping object id.
+    """
+    cache.delete(get_inventory_cache_key(shopping_id))
+
+
+def invalidate_shopping_inventory(shopping_id):
+    """
+    Remove inventory data of a Shopping object from cache once the current
+    transaction is committed, or immediately without any transaction. Removing it
+    before the commit would let a concurrent request cache the data again from the
+    previous state.
+
+    This must be called for any change on a Shopping object or its items which is not
+    made with a model ``save()`` or ``delete()`` (like queryset updates or bulk
+    operations), since only them invalidate the data.
+
+    Arguments:
+        shopping_id (integer): Shopping object id.
+    """
+    transaction.on_commit(functools.partial(delete_shopping_inventory, shopping_id))
+
+
+def shopping_inventory_post_change(sender, instance, **kwargs):
+    """
+    Signal receiver to invalidate the inventory data of a saved or deleted Shopping
+    object.
+    """
+    invalidate_shopping_inventory(instance.pk)
@@ -0,0 +1,188 @@
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+HIERARCHY_GENERATION_CACHE_KEY = "atoum-hierarchy-generation"
+"""
+Cache key for the hierarchy generation counter shared by all processes.
+"""
+
+CATALOG_VERSION_CACHE_KEY = "atoum-catalog-version"
+"""
+Cache key for the catalog version shared by all processes.
+"""
+
+ConsumableRow = namedtuple("ConsumableRow", ["id", "slug", "title"])
+
+
+def get_hierarchy_generation():
+    """
+    Get the current hierarchy generation from cache.
+
+    If there is no generation yet it is initialized from the current time so a
+    flushed cache can not restart from a value some process may already know.
+
+    Returns:
+        integer: Current generation.
+    """
+    generation = cache.get(HIERARCHY_GENERATION_CACHE_KEY)
+
+    if generation is None:
+        cache.add(HIERARCHY_GENERATION_CACHE_KEY, time.time_ns(), None)
+        generation = cache.get(HIERARCHY_GENERATION_CACHE_KEY)
+
+    return generation
+
+
+def bump_hierarchy_generation():
+    """
+    Increment the hierarchy generation so every process will rebuild its snapshot
+    on its next usage.
+    """
+    try:
+        cache.incr(HIERARCHY_GENERATION_CACHE_KEY)
+    except ValueError:
+        # Key does not exist yet or anymore
+        cache.add(HIERARCHY_GENERATION_CACHE_KEY, time.time_ns(), None)
+
+
+def get_catalog_version():
+    """
+    Get the current catalog version from cache.
+
+    The catalog version is the timestamp in nanoseconds of the last change on any
+    Consumable, Assortment, Category or Product object. If there is no version yet
+    it is initialized from the current time.
+
+    Returns:
+        integer: Current version.
+    """
+    version = cache.get(CATALOG_VERSION_CACHE_KEY)
+
+    if version is None:
+        cache.add(CATALOG_VERSION_CACHE_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_CACHE_KEY)
+
+    return version
+
+
+def bump_catalog_version():
+    """
+    Set a new catalog version from the current time. It is always greater than the
+    previous one even if the clock would be late.
+    """
+    version = cache.get(CATALOG_VERSION_CACHE_KEY) or 0
+    cache.set(CATALOG_VERSION_CACHE_KEY, max(time.time_ns(), version + 1), None)
+
+
+class HierarchySnapshot:
+    """
+    Read-only snapshot of the Consumable rows, the top level of hierarchy which is
+    small and used by every Assortment.
+
+    Rows are stored as compact named tuples indexed on their primary key.
+
+    Arguments:
+        generation (integer): Hierarchy generation the snapshot has been built
+            for.
+        consumables (dict): ``ConsumableRow`` items indexed on their id.
+    """
+    def __init__(self, generation, consumables):
+        self.generation = generation
+        self.consumables = consumables
+
+    @classmethod
+    def build(cls, generation):
+        """
+        Build a snapshot from database with a single query.
+
+        Arguments:
+            generation (integer): Hierarchy generation to attach to the snapshot.
+
+        Returns:
+            HierarchySnapshot: The new snapshot.
+        """
+        from ..models import Consumable
+
+        return cls(
+            generation,
+            consumables={
+                row[0]: ConsumableRow(*row)
+                for row in Consumable.objects.order_by().values_list(
+                    "id", "slug", "title"
+                )
+            },
+        )
+
+    def get_consumable(self, pk):
+        """
+        Get a consumable row.
+
+        Arguments:
+            pk (integer): Consumable id.
+
+        Returns:
+            ConsumableRow: Row if found else ``None``.
+        """
+        return self.consumables.get(pk)
+
+
+_snapshot = None
+
+
+def get_hierarchy_snapshot():
+    """
+    Return the process snapshot, it is rebuilt first if it has never been built or if
+    the shared generation has changed since its build.
+
+    Returns:
+        HierarchySnapshot: The current snapshot.
+    """
+    global _snapshot
+
+    generation = get_hierarchy_generation()
+    snapshot = _snapshot
+
+    if snapshot is None or snapshot.generation != generation:
+        snapshot = HierarchySnapshot.build(generation)
+        _snapshot = snapshot
+
+    return snapshot
+
+
+def hierarchy_post_save(sender, instance, created, **kwargs):
+    """
+    Signal receiver to bump generation when a Consumable object is created or when
+    its hierarchy fields have changed.
+
+    This must be connected to ``post_save`` of models using
+    ``HierarchyTrackingMixin`` since it relies on its changes detection.
+
+    The generation is bumped once the current transaction is committed, else a
+    process could build its snapshot from the previous state for the new
+    generation.
+    """
+    if created or instance.hierarchy_has_changed():
+        transaction.on_commit(bump_hierarchy_generation)
+
+
+def hierarchy_post_delete(sender, instance, **kwargs):
+    """
+    Signal receiver to bump generation once a Consumable object deletion is
+    committed.
+    """
+    transaction.on_commit(bump_hierarchy_generation)
+
+
+def catalog_post_change(sender, instance, **kwargs):
+    """
+    Signal receiver to bump catalog version when a catalog object is saved or
+    deleted.
+
+    The version is bumped once the current transaction is committed, else a
+    concurrent request could cache data from the previous state with the new version.
+    """
+    transaction.on_commit(bump_catalog_version)
@@ -0,0 +1,301 @@
+import json
+
+from dataclasses import dataclass, field
+
+from ..models import Assortment, Category, Consumable, Product
+
+
+@dataclass
+class TreeNode:
+    """
+    Lightweight node of a resolved catalog tree.
+
+    Nodes are built from raw rows instead of model objects so a tree of tens of
+    thousands of products stays cheap to build and hold in memory.
+
+    Attributes:
+        model (class): The model class the node has been built from.
+        id (integer): Object primary key.
+        title (string): Object title.
+        slug (string): Object slug.
+        parent_id (integer): Primary key of the parent object, it is ``None`` for
+            a Consumable.
+        children (list): List of children ``TreeNode`` objects.
+    """
+    model: type
+    id: int
+    title: str
+    slug: str
+    parent_id: int = None
+    children: list = field(default_factory=list)
+
+    def __str__(self):
+        return self.title
+
+    def __repr__(self):
+        # Mimic the model object representation
+        return "<{}: {}>".format(self.model.__name__, self.title)
+
+
+class CatalogTreeResolver:
+    """
+    Resolve the whole catalog hierarchy from Consumable to Product with a single
+    query per level, no matter how many objects there are.
+
+    Every level is fetched at once then attached to its parents in memory, so there
+    is never a query per node.
+
+    Keyword Arguments:
+        depth (integer): Number of levels to resolve starting from consumables. On
+            default every levels are resolved down to products.
+
+    Attributes:
+        LEVELS (tuple): Level definitions in hierarchy order, each item is a tuple of
+            model and the field name of the foreign key to the parent level.
+    """
+    LEVELS = (
+        (Consumable, None),
+        (Assortment, "consumable_id"),
+        (Category, "assortment_id"),
+        (Product, "category_id"),
+    )
+
+    def __init__(self, depth=None):
+        self.depth = depth or len(self.LEVELS)
+
+    def get_level_queryset(self, model, parent_field=None):
+        """
+        Build the queryset to get all rows of a level.
+
+        Arguments:
+            model (class): Level model.
+
+        Keyword Arguments:
+            parent_field (string): Foreign key field name to the parent level.
+
+        Returns:
+            Queryset: A ``values_list`` queryset ordered with the model common order.
+        """
+        fields = ["id", "title", "slug"]
+        if parent_field:
+            fields.append(parent_field)
+
+        return model.objects.order_by(*model.COMMON_ORDER_BY).values_list(*fields)
+
+    def get_level_nodes(self, model, parent_field=None):
+        """
+        Get all nodes of a level.
+
+        Arguments:
+            model (class): Level model.
+
+        Keyword Arguments:
+            parent_field (string): Foreign key field name to the parent level.
+
+        Returns:
+            list: List of ``TreeNode`` for the level.
+        """
+        return [
+            TreeNode(model, *row)
+            for row in self.get_level_queryset(model, parent_field=parent_field)
+        ]
+
+    def resolve(self):
+        """
+        Resolve the tree.
+
+        Returns:
+            list: List of ``TreeNode`` for consumables with their children resolved
+            recursively.
+        """
+        roots = None
+        parents = {}
+
+        for model, parent_field in self.LEVELS[:self.depth]:
+            nodes = self.get_level_nodes(model, parent_field=parent_field)
+
+            if roots is None:
+                roots = nodes
+            else:
+                for node in nodes:
+                    # Orphans can not happen with cascading relations but ignore them
+                    # instead of failing
+                    if node.parent_id in parents:
+                        parents[node.parent_id].children.append(node)
+
+            parents = {node.id: node for node in nodes}
+
+        return roots or []
+
+
+class CatalogTreeStreamer:
+    """
+    Stream the whole catalog hierarchy from Consumable to Product as JSON or
+    NDJSON.
+
+    Each level is read with a single query through a database iterator and all
+    levels are ordered on their hierarchy so they can be walked together, only
+    the current row of each level is kept in memory.
+
+    Keyword Arguments:
+        chunk_size (integer): Number of rows fetched at once from database by each
+            level iterator.
+        buffer_size (integer): Number of nodes to render before yielding them as a
+            single string.
+
+    Attributes:
+        LEVELS (tuple): Level definitions in hierarchy order, each item is a tuple of
+            model, the field name of the foreign key to the parent level and the key
+            name for node children in JSON.
+    """
+    LEVELS = (
+        (Consumable, None, "assortments"),
+        (Assortment, "consumable_id", "categories"),
+        (Category, "assortment_id", "products"),
+        (Product, "category_id", None),
+    )
+
+    def __init__(self, chunk_size=2000, buffer_size=500):
+        self.chunk_size = chunk_size
+        self.buffer_size = buffer_size
+
+    def get_level_queryset(self, model, parent_field=None):
+        """
+        Build the queryset to get all rows of a level in hierarchy order.
+
+        Arguments:
+            model (class): Level model.
+
+        Keyword Arguments:
+            parent_field (string): Foreign key field name to the parent level.
+
+        Returns:
+            Queryset: A ``values_list`` queryset which returns tuples of id, title,
+            slug and parent id.
+        """
+        fields = ["id", "title", "slug"]
+        if parent_field:
+            fields.append(parent_field)
+
+        # Primary key ends ordering so it is always deterministic
+        order = getattr(model, "HIERARCHY_ORDER", model.COMMON_ORDER_BY) + ["id"]
+
+        return model.objects.order_by(*order).values_list(*fields)
+
+    def walk(self):
+        """
+        Walk on every nodes from the whole tree, depth first.
+
+        Yields:
+            tuple: For each node, a first tuple ``(True, depth, row)`` when it is
+            opened then another one ``(False, depth, row)`` when it is closed, after
+            all of its children have been walked. Row is a tuple of id, title, slug
+            and parent id except for consumables which have no parent.
+        """
+        iterators = [
+            iter(
+                self.get_level_queryset(model, parent_field=parent_field).iterator(
+                    chunk_size=self.chunk_size
+                )
+            )
+            for model, parent_field, children_key in self.LEVELS
+        ]
+        # Current row for each level, they are consumed only once they belong to the
+        # walked parent
+        heads = [next(iterator, None) for iterator in iterators]
+
+        def walk_level(depth, parent_id):
+            while (
+                heads[depth] is not None and
+                (depth == 0 or heads[depth][3] == parent_id)
+            ):
+                row = heads[depth]
+                heads[depth] = next(iterators[depth], None)
+
+                yield True, depth, row
+                if depth + 1 < len(self.LEVELS):
+                    yield from walk_level(depth + 1, row[0])
+                yield False, depth, row
+
+        return walk_level(0, None)
+
+    def buffered(self, parts):
+        """
+        Join rendered parts into bigger strings to avoid yielding tiny chunks.
+
+        Arguments:
+            parts (iterable): Rendered strings.
+
+        Yields:
+            string: Joined parts.
+        """
+        buffer = []
+        for part in parts:
+            buffer.append(part)
+            if len(buffer) >= self.buffer_size:
+                yield "".join(buffer)
+                buffer = []
+
+        if buffer:
+            yield "".join(buffer)
+
+    def render_json(self):
+        """
+        Render the tree as a JSON list of nested objects.
+
+        Yields:
+            string: Rendered JSON parts.
+        """
+        # Whether the next node is the first one from its list, for each level
+        firsts = [True] * len(self.LEVELS)
+
+        yield "["
+        for opening, depth, row in self.walk():
+            children_key = self.LEVELS[depth][2]
+
+            if opening:
+                # Closing brace is dropped so children can be appended
+                yield ("" if firsts[depth] else ", ") + json.dumps({
+                    "id": row[0],
+                    "title": row[1],
+                    "slug": row[2],
+                })[:-1]
+                firsts[depth] = False
+                if children_key:
+                    yield ", {}: [".format(json.dumps(children_key))
+                    firsts[depth + 1] = True
+            else:
+                yield "]}" if children_key else "}"
+        yield "]"
+
+    def render_ndjson(self):
+        """
+        Render the tree as newline delimited JSON where each line is a node.
+
+        Yields:
+            string: Rendered JSON lines.
+        """
+        for opening, depth, row in self.walk():
+            if opening:
+                yield json.dumps({
+                    "model": self.LEVELS[depth][0]._meta.model_name,
+                    "id": row[0],
+                    "title": row[1],
+                    "slug": row[2],
+                    "parent": row[3] if depth else None,
+                }) + "\n"
+
+    def stream(self, format_name="json"):
+        """
+        Stream the rendered tree.
+
+        Keyword Arguments:
+            format_name (string): Either ``json`` or ``ndjson``.
+
+        Returns:
+            generator: Generator of rendered strings.
+        """
+        if format_name == "ndjson":
+            return self.buffered(self.render_ndjson())
+
+        return self.buffered(self.render_json())
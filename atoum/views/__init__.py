@@ -12,16 +12,21 @@ from .product import (
 )
 from .search import GlobalSearchView
 from .shopping import (
-    ShoppinglistDetailView, ShoppinglistIndexView, ShoppinglistToggleSelectionView,
-    ShoppinglistManageProductView,
+    ShoppinglistBatchView, ShoppinglistCloneView, ShoppinglistDetailView,
+    ShoppinglistEventsView, ShoppinglistIndexView, ShoppinglistInventoryView,
+    ShoppinglistItemsDoneView, ShoppinglistQuickAddView, ShoppinglistSyncView,
+    ShoppinglistToggleSelectionView, ShoppinglistManageProductView,
+)
+from .tree import (
+    CatalogTreeExportView, LazyTreeChildrenView, LazyTreeView, RecursiveTreeView,
 )
-from .tree import RecursiveTreeView
 
 
 __all__ = [
     "AssortmentAutocompleteView",
     "AssortmentDetailView",
     "AssortmentIndexView",
+    "CatalogTreeExportView",
     "CategoryAutocompleteView",
     "CategoryDetailView",
     "CategoryIndexView",
@@ -30,12 +35,21 @@ __all__ = [
     "DashboardView",
     "DummyView",
     "GlobalSearchView",
+    "LazyTreeChildrenView",
+    "LazyTreeView",
     "ProductAutocompleteView",
     "ProductDetailView",
     "ProductIndexView",
     "RecursiveTreeView",
+    "ShoppinglistBatchView",
+    "ShoppinglistCloneView",
     "ShoppinglistDetailView",
+    "ShoppinglistEventsView",
     "ShoppinglistIndexView",
+    "ShoppinglistInventoryView",
+    "ShoppinglistItemsDoneView",
+    "ShoppinglistQuickAddView",
+    "ShoppinglistSyncView",
     "ShoppinglistToggleSelectionView",
     "ShoppinglistManageProductView",
 ]
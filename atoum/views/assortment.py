@@ -1,6 +1,5 @@
 from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db.models import Count
 from django.http import Http404, HttpResponseBadRequest
 from django.views.generic import ListView
 from django.views.generic.detail import SingleObjectMixin
@@ -26,11 +25,7 @@ class AssortmentIndexView(AtoumBreadcrumMixin, ListView):
     crumb_urlname = "atoum:assortment-index"
 
     def get_queryset(self):
-        return self.model.objects.order_by("title").select_related(
-            *Assortment.HIERARCHY_SELECT_RELATED
-        ).annotate(
-            category_count=Count("category")
-        )
+        return self.model.objects.order_by("title")
 
     @property
     def crumbs(self):
@@ -54,17 +49,19 @@ class AssortmentDetailView(AtoumBreadcrumMixin, SingleObjectMixin, ListView):
 
     @property
     def crumbs(self):
+        consumable = self.object.get_consumable_row()
+
         return [
             (
-                self.object.consumable.title,
+                consumable.title,
                 reverse(ConsumableDetailView.crumb_urlname, kwargs={
-                    "slug": self.object.consumable.slug,
+                    "slug": consumable.slug,
                 })
             ),
             (
                 self.object.title,
                 reverse(self.crumb_urlname, kwargs={
-                    "consumable_slug": self.object.consumable.slug,
+                    "consumable_slug": consumable.slug,
                     "assortment_slug": self.object.slug,
                 })
             ),
@@ -74,9 +71,7 @@ class AssortmentDetailView(AtoumBreadcrumMixin, SingleObjectMixin, ListView):
         """
         Queryset to list sub relations
         """
-        return self.object.category_set.annotate(
-            product_count=Count("product")
-        ).order_by("title")
+        return self.object.category_set.order_by("title")
 
     def get_object(self):
         """
@@ -89,7 +84,7 @@ class AssortmentDetailView(AtoumBreadcrumMixin, SingleObjectMixin, ListView):
             obj = Assortment.objects.filter(**{
                 "consumable__slug": consumable_slug,
                 "slug": assortment_slug,
-            }).select_related(*Assortment.HIERARCHY_SELECT_RELATED).get()
+            }).get()
         except Assortment.DoesNotExist:
             raise Http404(
                 _("No {} found matching the query").format(
@@ -119,8 +114,8 @@ class AssortmentAutocompleteView(UserPassesTestMixin, autocomplete.Select2QueryS
         """
         Build list queryset.
 
-        Enable ``select_related`` on relation ``consumable`` because we intend to use
-        it commonly in labels.
+        Consumable titles used in labels come from the hierarchy snapshot so there
+        is no relation to select.
         """
         if not self.request.user.is_authenticated:
             return Assortment.objects.none()
@@ -128,11 +123,9 @@ class AssortmentAutocompleteView(UserPassesTestMixin, autocomplete.Select2QueryS
         qs = Assortment.objects.all()
 
         if self.q:
-            qs = qs.filter(title__istartswith=self.q).select_related(
-                *Assortment.HIERARCHY_SELECT_RELATED
-            )
+            qs = qs.filter(title__istartswith=self.q)
 
-        return qs.order_by(*Assortment.HIERARCHY_ORDER)
+        return qs.order_by("sort_key", "id")
 
     def get_result_label(self, result):
         """
@@ -140,7 +133,7 @@ class AssortmentAutocompleteView(UserPassesTestMixin, autocomplete.Select2QueryS
         """
         return format_html(
             "<small>{consumable}</small><br>{assortment}",
-            consumable=result.consumable.title,
+            consumable=result.get_consumable_row().title,
             assortment=result.title,
         )
 
@@ -1,6 +1,5 @@
 from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db.models import Count
 from django.http import Http404, HttpResponseBadRequest
 from django.views.generic import ListView
 from django.views.generic.detail import SingleObjectMixin
@@ -11,6 +10,7 @@ from django.utils.translation import gettext_lazy as _
 from dal import autocomplete
 
 from ..models import Category
+from ..models.mixins import SLUG_PATH_SEPARATOR
 from .consumable import ConsumableDetailView
 from .assortment import AssortmentDetailView
 from .mixins import AtoumBreadcrumMixin
@@ -27,11 +27,7 @@ class CategoryIndexView(AtoumBreadcrumMixin, ListView):
     crumb_urlname = "atoum:category-index"
 
     def get_queryset(self):
-        return self.model.objects.order_by("title").select_related(
-            *Category.HIERARCHY_SELECT_RELATED
-        ).annotate(
-            product_count=Count("product")
-        )
+        return self.model.objects.order_by("title")
 
     @property
     def crumbs(self):
@@ -55,26 +51,33 @@ class CategoryDetailView(AtoumBreadcrumMixin, SingleObjectMixin, ListView):
 
     @property
     def crumbs(self):
+        consumable_title, assortment_title, category_title = (
+            self.object.parenting_crumbs()
+        )
+        consumable_slug, assortment_slug, category_slug = (
+            self.object.parenting_slugs()
+        )
+
         return [
             (
-                self.object.assortment.consumable.title,
+                consumable_title,
                 reverse(ConsumableDetailView.crumb_urlname, kwargs={
-                    "slug": self.object.assortment.consumable.slug,
+                    "slug": consumable_slug,
                 })
             ),
             (
-                self.object.assortment.title,
+                assortment_title,
                 reverse(AssortmentDetailView.crumb_urlname, kwargs={
-                    "consumable_slug": self.object.assortment.consumable.slug,
-                    "assortment_slug": self.object.assortment.slug,
+                    "consumable_slug": consumable_slug,
+                    "assortment_slug": assortment_slug,
                 })
             ),
             (
-                self.object.title,
+                category_title,
                 reverse(self.crumb_urlname, kwargs={
-                    "consumable_slug": self.object.assortment.consumable.slug,
-                    "assortment_slug": self.object.assortment.slug,
-                    "category_slug": self.object.slug,
+                    "consumable_slug": consumable_slug,
+                    "assortment_slug": assortment_slug,
+                    "category_slug": category_slug,
                 })
             ),
         ]
@@ -87,20 +90,18 @@ class CategoryDetailView(AtoumBreadcrumMixin, SingleObjectMixin, ListView):
 
     def get_object(self):
         """
-        Get the Category object for details
+        Get the Category object for details.
+
+        Object is resolved from its unique slug path with a single lookup.
         """
-        consumable_slug = self.kwargs.get("consumable_slug")
-        assortment_slug = self.kwargs.get("assortment_slug")
-        category_slug = self.kwargs.get("category_slug")
+        slug_path = SLUG_PATH_SEPARATOR.join([
+            self.kwargs.get("consumable_slug"),
+            self.kwargs.get("assortment_slug"),
+            self.kwargs.get("category_slug"),
+        ])
 
         try:
-            obj = Category.objects.filter(**{
-                "assortment__consumable__slug": consumable_slug,
-                "assortment__slug": assortment_slug,
-                "slug": category_slug,
-            }).select_related(
-                *Category.HIERARCHY_SELECT_RELATED
-            ).get()
+            obj = Category.objects.get(slug_path=slug_path)
         except Category.DoesNotExist:
             raise Http404(
                 _("No {} found matching the query").format(
@@ -130,8 +131,8 @@ class CategoryAutocompleteView(UserPassesTestMixin, autocomplete.Select2QuerySet
         """
         Build list queryset.
 
-        Enable ``select_related`` on relation ``assortment`` because we intend to use
-        it commonly in labels.
+        There is no need of ``select_related`` since labels use the denormalized
+        hierarchy columns.
         """
         if not self.request.user.is_authenticated:
             return Category.objects.none()
@@ -139,21 +140,21 @@ class CategoryAutocompleteView(UserPassesTestMixin, autocomplete.Select2QuerySet
         qs = Category.objects.all()
 
         if self.q:
-            qs = qs.filter(title__istartswith=self.q).select_related(
-                *Category.HIERARCHY_SELECT_RELATED
-            )
+            qs = qs.filter(title__istartswith=self.q)
 
-        return qs.order_by(*Category.HIERARCHY_ORDER)
+        return qs.order_by("sort_key", "id")
 
     def get_result_label(self, result):
         """
         Format a better list result display.
         """
+        consumable, assortment, category = result.parenting_crumbs()
+
         return format_html(
             "<small>{consumable} &gt; {assortment}</small><br>{category}",
-            consumable=result.assortment.consumable.title,
-            assortment=result.assortment.title,
-            category=result.title,
+            consumable=consumable,
+            assortment=assortment,
+            category=category,
         )
 
     def get_selected_result_label(self, result):
@@ -1,5 +1,4 @@
 from django.conf import settings
-from django.db.models import Count
 from django.views.generic import ListView
 from django.views.generic.detail import SingleObjectMixin
 from django.urls import reverse
@@ -29,9 +28,7 @@ class ConsumableIndexView(AtoumBreadcrumMixin, ListView):
         ]
 
     def get_queryset(self):
-        return self.model.objects.annotate(
-            assortment_count=Count("assortment")
-        ).order_by("title")
+        return self.model.objects.order_by("title")
 
 
 class ConsumableDetailView(AtoumBreadcrumMixin, SingleObjectMixin, ListView):
@@ -54,9 +51,7 @@ class ConsumableDetailView(AtoumBreadcrumMixin, SingleObjectMixin, ListView):
         ]
 
     def get_queryset(self):
-        return self.object.assortment_set.annotate(
-            category_count=Count("category")
-        ).order_by("title")
+        return self.object.assortment_set.order_by("title")
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object(queryset=Consumable.objects.all())
@@ -10,6 +10,7 @@ from django.utils.translation import gettext_lazy as _
 from dal import autocomplete
 
 from ..models import Product
+from ..models.mixins import SLUG_PATH_SEPARATOR
 from .category import CategoryDetailView
 from .consumable import ConsumableDetailView
 from .assortment import AssortmentDetailView
@@ -27,9 +28,7 @@ class ProductIndexView(AtoumBreadcrumMixin, ListView):
     crumb_urlname = "atoum:product-index"
 
     def get_queryset(self):
-        return self.model.objects.order_by("title").select_related(
-            *Product.HIERARCHY_SELECT_RELATED
-        )
+        return self.model.objects.order_by("title")
 
     @property
     def crumbs(self):
@@ -52,57 +51,61 @@ class ProductDetailView(AtoumBreadcrumMixin, SingleObjectMixin, TemplateView):
 
     @property
     def crumbs(self):
+        consumable_title, assortment_title, category_title, product_title = (
+            self.object.parenting_crumbs()
+        )
+        consumable_slug, assortment_slug, category_slug, product_slug = (
+            self.object.parenting_slugs()
+        )
+
         return [
             (
-                self.object.category.assortment.consumable.title,
+                consumable_title,
                 reverse(ConsumableDetailView.crumb_urlname, kwargs={
-                    "slug": self.object.category.assortment.consumable.slug,
+                    "slug": consumable_slug,
                 })
             ),
             (
-                self.object.category.assortment.title,
+                assortment_title,
                 reverse(AssortmentDetailView.crumb_urlname, kwargs={
-                    "consumable_slug": self.object.category.assortment.consumable.slug,
-                    "assortment_slug": self.object.category.assortment.slug,
+                    "consumable_slug": consumable_slug,
+                    "assortment_slug": assortment_slug,
                 })
             ),
             (
-                self.object.category.title,
+                category_title,
                 reverse(CategoryDetailView.crumb_urlname, kwargs={
-                    "consumable_slug": self.object.category.assortment.consumable.slug,
-                    "assortment_slug": self.object.category.assortment.slug,
-                    "category_slug": self.object.category.slug,
+                    "consumable_slug": consumable_slug,
+                    "assortment_slug": assortment_slug,
+                    "category_slug": category_slug,
                 })
             ),
             (
-                self.object.title,
+                product_title,
                 reverse(self.crumb_urlname, kwargs={
-                    "consumable_slug": self.object.category.assortment.consumable.slug,
-                    "assortment_slug": self.object.category.assortment.slug,
-                    "category_slug": self.object.category.slug,
-                    "product_slug": self.object.slug,
+                    "consumable_slug": consumable_slug,
+                    "assortment_slug": assortment_slug,
+                    "category_slug": category_slug,
+                    "product_slug": product_slug,
                 })
             ),
         ]
 
     def get_object(self):
         """
-        Get the Product object for details
+        Get the Product object for details.
+
+        Object is resolved from its unique slug path with a single lookup.
         """
-        consumable_slug = self.kwargs.get("consumable_slug")
-        assortment_slug = self.kwargs.get("assortment_slug")
-        category_slug = self.kwargs.get("category_slug")
-        product_slug = self.kwargs.get("product_slug")
+        slug_path = SLUG_PATH_SEPARATOR.join([
+            self.kwargs.get("consumable_slug"),
+            self.kwargs.get("assortment_slug"),
+            self.kwargs.get("category_slug"),
+            self.kwargs.get("product_slug"),
+        ])
 
         try:
-            obj = Product.objects.filter(**{
-                "category__assortment__consumable__slug": consumable_slug,
-                "category__assortment__slug": assortment_slug,
-                "category__slug": category_slug,
-                "slug": product_slug,
-            }).select_related(
-                *Product.HIERARCHY_SELECT_RELATED
-            ).get()
+            obj = Product.objects.get(slug_path=slug_path)
         except Product.DoesNotExist:
             raise Http404(
                 _("No {} found matching the query").format(
@@ -132,7 +135,8 @@ class ProductAutocompleteView(UserPassesTestMixin, autocomplete.Select2QuerySetV
         """
         Build list queryset.
 
-        Enable ``select_related`` on deep relations.
+        There is no need of ``select_related`` since labels use the denormalized
+        hierarchy columns.
         """
         if not self.request.user.is_authenticated:
             return Product.objects.none()
@@ -140,11 +144,9 @@ class ProductAutocompleteView(UserPassesTestMixin, autocomplete.Select2QuerySetV
         qs = Product.objects.all()
 
         if self.q:
-            qs = qs.filter(title__istartswith=self.q).select_related(
-                *Product.HIERARCHY_SELECT_RELATED
-            )
+            qs = qs.filter(title__istartswith=self.q)
 
-        return qs.order_by(*Product.HIERARCHY_ORDER)
+        return qs.order_by("sort_key", "id")
 
     def get_result_label(self, result):
         """
@@ -153,12 +155,14 @@ class ProductAutocompleteView(UserPassesTestMixin, autocomplete.Select2QuerySetV
         template = (
             "<small>{consumable} &gt; {assortment} &gt; {category}</small><br>{product}"
         )
+        consumable, assortment, category, product = result.parenting_crumbs()
+
         return format_html(
             template,
-            consumable=result.category.assortment.consumable.title,
-            assortment=result.category.assortment.title,
-            category=result.category.title,
-            product=result.title,
+            consumable=consumable,
+            assortment=assortment,
+            category=category,
+            product=product,
         )
 
     def get_selected_result_label(self, result):
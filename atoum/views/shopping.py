@@ -1,33 +1,297 @@
+import datetime
+import hashlib
+import re
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import RedirectURLMixin
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponseRedirect, HttpResponseBadRequest, QueryDict
+from django.core.exceptions import PermissionDenied
+from django.http import (
+    Http404, HttpResponseRedirect, HttpResponseBadRequest, JsonResponse, QueryDict,
+    StreamingHttpResponse,
+)
+from django.utils.decorators import method_decorator
 from django.views import View
-from django.views.generic import TemplateView
+from django.views.decorators.http import condition
+from django.views.generic import FormView, TemplateView
 from django.views.generic import ListView
 from django.urls import reverse
-from django.utils.translation import gettext_lazy as _
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import get_language, gettext_lazy as _
 
-from ..models import Product, Shopping, ShoppingItem
+from ..forms import ShoppingQuickAddForm
+from ..models import Product, Shopping, ShoppingItem, ShoppingItemTombstone
+from ..models.shopping import shopping_version
+from ..utils.events import (
+    format_server_event, get_event_broker, get_shopping_channel,
+    publish_shopping_event,
+)
+from ..utils.inventory import get_request_snapshot, invalidate_shopping_inventory
+from ..utils.snapshot import get_catalog_version
 from .mixins import AtoumBreadcrumMixin
 
 
+def get_page_state(request):
+    """
+    Return the state shared by all shopping pages which is not related to the
+    displayed Shopping objects.
+
+    Pages depend on the catalog for product titles and crumbs, on the user, on the
+    opened inventory and on the current language.
+
+    Arguments:
+        request (object): A Django Request object.
+
+    Returns:
+        string: Page state.
+    """
+    return "{catalog}-{user}-{inventory}-{language}".format(
+        catalog=get_catalog_version(),
+        user=getattr(getattr(request, "user", None), "pk", None),
+        inventory=request.session.get("atoum_shopping_inventory"),
+        language=get_language(),
+    )
+
+
+def get_inventory_version(request, versions):
+    """
+    Return the version of the opened inventory.
+
+    Arguments:
+        request (object): A Django Request object.
+        versions (dict): Already known versions indexed on Shopping id.
+
+    Returns:
+        integer: Opened inventory version or ``None`` if there is no opened
+        inventory or it does not exist.
+    """
+    inventory_id = request.session.get("atoum_shopping_inventory")
+    if not inventory_id:
+        return None
+
+    if inventory_id not in versions:
+        versions.update(
+            Shopping.objects.filter(pk=inventory_id).values_list("id", "version")
+        )
+
+    return versions.get(inventory_id)
+
+
+def shopping_index_etag(request, *args, **kwargs):
+    """
+    Build the ETag of Shopping index from the ids and versions of the displayed
+    Shopping objects and the version of opened inventory.
+
+    Displayed objects are the ones of the requested page (with the first one of the
+    next page) selected from the index order, and the templates. So it only reads
+    the displayed rows whatever the number of Shopping objects. Since versions are
+    only incremented, any change on a displayed Shopping or its items changes the
+    ETag, like any change of the page composition.
+
+    Arguments:
+        request (object): A Django Request object.
+
+    Returns:
+        string: The ETag value or ``None`` if the page cursor is invalid.
+    """
+    queryset = Shopping.objects.filter(template=False).order_by(
+        *Shopping.INDEX_ORDER_BY
+    )
+
+    after = request.GET.get("after")
+    if after:
+        position = ShoppinglistIndexView.decode_cursor(after)
+        if position is None:
+            return None
+
+        queryset = queryset.seek(*position)
+
+    rows = list(
+        queryset.values_list("id", "version")[:ShoppinglistIndexView.paginate_by + 1]
+    )
+    rows.extend(
+        Shopping.objects.filter(template=True).order_by("id").values_list(
+            "id", "version"
+        )
+    )
+    digest = hashlib.md5(
+        ",".join(["{}.{}".format(*row) for row in rows]).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+    return "shoppings-{digest}-{inventory}-{state}".format(
+        digest=digest,
+        inventory=get_inventory_version(request, dict(rows)),
+        state=get_page_state(request),
+    )
+
+
+def shopping_detail_etag(request, *args, **kwargs):
+    """
+    Build the ETag of a Shopping detail from its version and the version of opened
+    inventory, with a single query.
+
+    Arguments:
+        request (object): A Django Request object.
+
+    Returns:
+        string: The ETag value or ``None`` if the Shopping does not exist.
+    """
+    pk = kwargs.get("pk")
+    inventory_id = request.session.get("atoum_shopping_inventory")
+
+    versions = dict(
+        Shopping.objects.filter(
+            pk__in=[v for v in (pk, inventory_id) if v]
+        ).values_list("id", "version")
+    )
+    if pk not in versions:
+        return None
+
+    return "shopping-{pk}-{version}-{inventory}-{state}".format(
+        pk=pk,
+        version=versions[pk],
+        inventory=get_inventory_version(request, versions),
+        state=get_page_state(request),
+    )
+
+
+def shopping_inventory_etag(request, *args, **kwargs):
+    """
+    Build the ETag of opened inventory fragment from its version.
+
+    Arguments:
+        request (object): A Django Request object.
+
+    Returns:
+        string: The ETag value.
+    """
+    return "inventory-{version}-{state}".format(
+        version=get_inventory_version(request, {}),
+        state=get_page_state(request),
+    )
+
+
+@method_decorator(condition(etag_func=shopping_index_etag), name="get")
 class ShoppinglistIndexView(AtoumBreadcrumMixin, LoginRequiredMixin, ListView):
     """
     List of Shopping lists
+
+    Lists are paginated with a keyset (or seek) pagination: the ``after`` argument
+    is a cursor on the last list of the previous page and a page is selected with
+    a condition on the index order instead of an offset. So there is no count query
+    and any page costs the same than the first one. An invalid cursor leads to a
+    HTTP 404 response.
+
+    Response has an ``ETag`` header so a client gets a "Not modified" response
+    without any query on the lists until a Shopping has changed.
     """
     model = Shopping
     template_name = "atoum/shopping/index.html"
     paginate_by = settings.ATOUM_SHOPPINGLIST_PAGINATION
     crumb_title = _("Shopping lists")
     crumb_urlname = "atoum:shopping-list-index"
+    cursor_pattern = re.compile(
+        r"^(?P<done>[01])\.(?P<planning>-?\d+)\.(?P<pk>\d+)$"
+    )
+    cursor_epoch = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    next_cursor = None
 
     def get_queryset(self):
-        # Append 'done' field over the common ordering fields so the undone lists
-        # have higher priority
-        ordering = ["done"] + self.model.COMMON_ORDER_BY
-        return self.model.objects.order_by(*ordering)
+        # Undone lists have higher priority
+        return self.model.objects.filter(template=False).with_status().order_by(
+            *self.model.INDEX_ORDER_BY
+        )
+
+    def encode_cursor(self, shopping):
+        """
+        Encode the position of a Shopping object in the index order.
+
+        Arguments:
+            shopping (atoum.models.Shopping): Shopping object.
+
+        Returns:
+            string: The cursor made of done value, planning date in microseconds
+            since epoch and id.
+        """
+        return "{done}.{planning}.{pk}".format(
+            done=int(shopping.done),
+            planning=(
+                (shopping.planning - self.cursor_epoch) //
+                datetime.timedelta(microseconds=1)
+            ),
+            pk=shopping.pk,
+        )
+
+    @classmethod
+    def decode_cursor(cls, value):
+        """
+        Decode a cursor from ``encode_cursor()``.
+
+        Arguments:
+            value (string): The cursor.
+
+        Returns:
+            tuple: Done value, planning date and id or ``None`` if cursor is invalid.
+        """
+        matched = cls.cursor_pattern.match(value)
+        if matched is None:
+            return None
+
+        try:
+            planning = cls.cursor_epoch + datetime.timedelta(
+                microseconds=int(matched.group("planning"))
+            )
+        except OverflowError:
+            return None
+
+        return (
+            matched.group("done") == "1",
+            planning,
+            int(matched.group("pk")),
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Select the page after the cursor from request.
+
+        A row more than the page size is fetched to know if there is a next page.
+
+        Returns:
+            tuple: The same values than ``MultipleObjectMixin.paginate_queryset()``
+            except there is no paginator and page objects.
+        """
+        after = self.request.GET.get("after")
+        if after:
+            position = self.decode_cursor(after)
+            if position is None:
+                raise Http404(_("Invalid page cursor."))
+
+            queryset = queryset.seek(*position)
+
+        object_list = list(queryset[:page_size + 1])
+        is_paginated = len(object_list) > page_size
+        object_list = object_list[:page_size]
+
+        if is_paginated:
+            self.next_cursor = self.encode_cursor(object_list[-1])
+
+        return (None, None, object_list, is_paginated)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            "next_cursor": self.next_cursor,
+            "shopping_templates": self.model.objects.filter(template=True).order_by(
+                "planning", "title"
+            ),
+        })
+
+        return context
 
     @property
     def crumbs(self):
@@ -39,9 +303,13 @@ class ShoppinglistIndexView(AtoumBreadcrumMixin, LoginRequiredMixin, ListView):
         ]
 
 
+@method_decorator(condition(etag_func=shopping_detail_etag), name="get")
 class ShoppinglistDetailView(AtoumBreadcrumMixin, LoginRequiredMixin, TemplateView):
     """
     Shopping list detail
+
+    Response has an ``ETag`` header built from the Shopping version so a client gets
+    a "Not modified" response before any query on the items until it has changed.
     """
     model = Shopping
     template_name = "atoum/shopping/detail.html"
@@ -75,16 +343,37 @@ class ShoppinglistDetailView(AtoumBreadcrumMixin, LoginRequiredMixin, TemplateVi
         context.update({
             "object": self.object,
             self.context_object_name: self.object,
+            "shopping_snapshot": self.snapshot,
+            "shopping_events": settings.ATOUM_SHOPPING_EVENTS_ENABLED,
         })
 
         return context
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
+        # Items are loaded once for the whole page, including the opened inventory
+        # from context processor and the product controls
+        self.snapshot = get_request_snapshot(request, self.object)
 
         return super().get(request, *args, **kwargs)
 
 
+@method_decorator(condition(etag_func=shopping_inventory_etag), name="get")
+class ShoppinglistInventoryView(LoginRequiredMixin, TemplateView):
+    """
+    Opened shopping inventory fragment, the same one than the aside content from
+    template tag ``shopping_list_html``.
+
+    This has been done for usage from htmx so it won't return a proper HTML page
+    document. Response has an ``ETag`` header built from the inventory version so
+    polling clients get a "Not modified" response until it has changed.
+    """
+    raise_exception = True
+
+    def get_template_names(self):
+        return [settings.ATOUM_SHOPPING_ASIDE_TEMPLATE]
+
+
 class ShoppinglistToggleSelectionView(LoginRequiredMixin, RedirectURLMixin, View):
     """
     View to open or close a Shopping list for product selection.
@@ -117,6 +406,99 @@ class ShoppinglistToggleSelectionView(LoginRequiredMixin, RedirectURLMixin, View
         return HttpResponseRedirect(url)
 
 
+class ShoppinglistCloneView(LoginRequiredMixin, View):
+    """
+    View to create a new Shopping list with the items of another one, like a
+    template.
+
+    Done items are not copied if the ``skip_done`` POST argument is ``true``. The
+    response redirects to the new Shopping list.
+    """
+    model = Shopping
+    raise_exception = True
+
+    def post(self, request, *args, **kwargs):
+        self.object = get_object_or_404(self.model, pk=self.kwargs.get("pk"))
+
+        clone = self.object.clone(
+            skip_done=request.POST.get("skip_done") == "true"
+        )
+
+        return HttpResponseRedirect(clone.get_absolute_url())
+
+
+class ShoppinglistQuickAddView(AtoumBreadcrumMixin, LoginRequiredMixin, FormView):
+    """
+    View to add products to a Shopping list from a pasted text.
+
+    Each line is resolved to a Product from its normalized title, all lines are
+    resolved with a single query and matched products are added with a single bulk
+    upsert. The response reports the number of added products and gives back the
+    unmatched lines so they can be fixed.
+    """
+    model = Shopping
+    form_class = ShoppingQuickAddForm
+    template_name = "atoum/shopping/quick_add.html"
+    crumb_title = _("Paste a list")
+    crumb_urlname = "atoum:shopping-list-quick-add"
+
+    @property
+    def crumbs(self):
+        return [
+            (
+                ShoppinglistIndexView.crumb_title,
+                reverse(ShoppinglistIndexView.crumb_urlname)
+            ),
+            (
+                str(self.object),
+                self.object.get_absolute_url(),
+            ),
+            (
+                self.crumb_title,
+                reverse(self.crumb_urlname, kwargs={
+                    "pk": self.object.id,
+                })
+            ),
+        ]
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["shopping"] = self.object
+
+        return kwargs
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["shopping_object"] = self.object
+
+        return context
+
+    def get(self, request, *args, **kwargs):
+        self.object = get_object_or_404(self.model, pk=self.kwargs.get("pk"))
+
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        self.object = get_object_or_404(self.model, pk=self.kwargs.get("pk"))
+
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        """
+        Add the matched products then render a new form with unmatched lines.
+        """
+        added, unmatched = form.save()
+
+        return self.render_to_response(self.get_context_data(
+            form=self.form_class(
+                shopping=self.object,
+                initial={"text": "\n".join(unmatched)},
+            ),
+            added=len(added),
+            unmatched=unmatched,
+        ))
+
+
 class ShoppinglistManageProductView(LoginRequiredMixin, TemplateView):
     """
     View to add, edit or remove a product of a Shopping list.
@@ -175,6 +557,7 @@ class ShoppinglistManageProductView(LoginRequiredMixin, TemplateView):
         memorized = {"id": obj.id, "quantity": obj.quantity}
         # Finally deletes the item
         obj.delete()
+        self.object.unindex_product(self.product)
         self.operation_name = "deletion"
 
         return memorized
@@ -208,6 +591,7 @@ class ShoppinglistManageProductView(LoginRequiredMixin, TemplateView):
                 )
                 obj.full_clean()
                 obj.save()
+                self.object.index_item(obj)
                 self.operation_name = "addition"
             else:
                 obj = None
@@ -216,6 +600,7 @@ class ShoppinglistManageProductView(LoginRequiredMixin, TemplateView):
                 obj.quantity = quantity
                 obj.full_clean()
                 obj.save()
+                self.object.index_item(obj)
                 self.operation_name = "edition"
 
         return obj
@@ -233,10 +618,12 @@ class ShoppinglistManageProductView(LoginRequiredMixin, TemplateView):
             product=self.product
         )
 
-        # NOTE: We can use the update() method instead
         obj.done = done
-        obj.save()
+        obj.save(update_fields=["done"])
+        self.object.index_item(obj)
 
+        # Item change is committed before so a concurrent item change can not be
+        # missed by the Shopping update
         self.object.update_shopping_done()
 
         self.operation_name = "patch_field_done"
@@ -310,3 +697,502 @@ class ShoppinglistManageProductView(LoginRequiredMixin, TemplateView):
         GET verb is not supported.
         """
         return HttpResponseBadRequest()
+
+
+class ShoppinglistItemsDoneView(LoginRequiredMixin, TemplateView):
+    """
+    View to mark all or selected items of a Shopping list as done or undone.
+
+    The ``done`` POST argument is either ``true`` or ``false``. Items are changed with
+    a single query, optionally restricted to the Product ids given with ``product``
+    POST arguments.
+
+    This has been done for usage from htmx so it won't return a proper HTML page
+    document, response contains the list status and out-of-band fragments for
+    changed items.
+    """
+    model = Shopping
+    template_name = "atoum/shopping/manage_done.html"
+    raise_exception = True
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            "shopping_object": self.object,
+            "done": self.done,
+            "changed_items": self.changed_items,
+        })
+
+        return context
+
+    def parse_product_ids(self):
+        """
+        Parse selected Product ids from POST arguments.
+
+        Returns:
+            list: List of Product ids or a null value if there is no selection.
+
+        Raises:
+            ValueError: If a value is not a valid integer.
+        """
+        values = self.request.POST.getlist("product")
+        if not values:
+            return None
+
+        return [int(v) for v in values]
+
+    def post(self, request, *args, **kwargs):
+        """
+        POST verb applies the done value on items.
+
+        Invalid values will return a HTTP 400 response.
+        """
+        self.object = get_object_or_404(self.model, pk=self.kwargs.get("pk"))
+
+        if request.POST.get("done") not in ("true", "false"):
+            return HttpResponseBadRequest()
+        self.done = request.POST["done"] == "true"
+
+        try:
+            product_ids = self.parse_product_ids()
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        self.changed_items = self.object.set_items_done(
+            self.done,
+            product_ids=product_ids
+        )
+
+        return self.render_to_response(self.get_context_data(**kwargs))
+
+    def get(self, request, *args, **kwargs):
+        """
+        GET verb is not supported.
+        """
+        return HttpResponseBadRequest()
+
+
+class ShoppinglistBatchView(LoginRequiredMixin, TemplateView):
+    """
+    View to add, edit or remove many products of a Shopping list at once.
+
+    Operations are posted as form fields named after the product id:
+
+    * ``quantity-<product_id>``: A quantity greater than zero adds the product or
+      edits its quantity, a null quantity removes it;
+    * ``done-<product_id>``: Either ``true`` or ``false`` to edit the done state of
+      an added or existing item.
+
+    All changes are saved in a single transaction with one query per kind of change
+    then the Shopping ``done`` value is updated once.
+
+    This has been done for usage from htmx so it won't return a proper HTML page
+    document, response only contains the out-of-band fragments of changed rows.
+    """
+    model = Shopping
+    template_name = "atoum/shopping/manage_batch.html"
+    raise_exception = True
+    field_pattern = re.compile(r"^(?P<name>quantity|done)-(?P<product_id>\d+)$")
+    change_events = {
+        "addition": "add",
+        "edition": "edit",
+        "patch_field_done": "done",
+    }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            "shopping_object": self.object,
+            "changes": self.changes,
+        })
+
+        return context
+
+    def parse_operations(self):
+        """
+        Parse operations from POST arguments.
+
+        Returns:
+            dict: Operations indexed on product id, each operation is a dictionnary
+            with ``quantity`` and ``done`` items, an item is ``None`` when it was not
+            given. Returns a null value if any value is invalid, including a quantity
+            out of the range from zero to ``ShoppingItem.MAX_QUANTITY``.
+        """
+        operations = {}
+        for key, value in self.request.POST.items():
+            matched = self.field_pattern.match(key)
+            if not matched:
+                continue
+
+            operation = operations.setdefault(
+                int(matched.group("product_id")),
+                {"quantity": None, "done": None}
+            )
+
+            if matched.group("name") == "quantity":
+                try:
+                    operation["quantity"] = int(value)
+                except ValueError:
+                    return None
+
+                if not 0 <= operation["quantity"] <= ShoppingItem.MAX_QUANTITY:
+                    return None
+            elif value in ("true", "false"):
+                operation["done"] = value == "true"
+            else:
+                return None
+
+        return operations
+
+    def apply_operations(self, operations, products):
+        """
+        Save changes from operations on Shopping items.
+
+        Existing items are read in the same transaction than the changes, once the
+        Shopping row has been locked until the commit, so a concurrent change can not
+        add or remove an item between the read and the changes. The Shopping is only
+        touched when there is at least one item change, operations without effect
+        leave its version unchanged.
+
+        Arguments:
+            operations (dict): Operations as returned from ``parse_operations()``.
+            products (dict): Product objects indexed on their id.
+
+        Returns:
+            list: A dictionnary for each changed item, with the operation name, the
+            Product object and the item object. For a deletion the item is a
+            dictionnary of the removed item id and quantity.
+        """
+        changes = []
+        created = []
+        edited = []
+        deleted = []
+
+        with transaction.atomic():
+            list(
+                Shopping.objects.select_for_update().filter(
+                    pk=self.object.id
+                ).values_list("pk", flat=True)
+            )
+
+            existing = {
+                item.product_id: item
+                for item in ShoppingItem.objects.select_for_update().filter(
+                    shopping=self.object,
+                    product_id__in=operations.keys(),
+                )
+            }
+
+            for product_id, operation in operations.items():
+                product = products[product_id]
+                item = existing.get(product_id)
+                quantity = operation["quantity"]
+                done = operation["done"]
+
+                if item is None:
+                    # Done state alone or null quantity have no effect on missing
+                    # item
+                    if not quantity:
+                        continue
+
+                    item = ShoppingItem(
+                        shopping=self.object,
+                        product=product,
+                        quantity=quantity,
+                        done=done or False,
+                    )
+                    created.append(item)
+                    changes.append({
+                        "operation": "addition", "product": product, "item": item,
+                    })
+                elif quantity == 0:
+                    deleted.append((item.id, product_id))
+                    changes.append({
+                        "operation": "deletion",
+                        "product": product,
+                        "item": {"id": item.id, "quantity": item.quantity},
+                    })
+                else:
+                    # Operation without any value change is ignored
+                    if (
+                        (not quantity or quantity == item.quantity) and
+                        (done is None or done == item.done)
+                    ):
+                        continue
+
+                    item.product = product
+                    if quantity:
+                        item.quantity = quantity
+                    if done is not None:
+                        item.done = done
+                    edited.append(item)
+                    changes.append({
+                        "operation": "edition" if quantity else "patch_field_done",
+                        "product": product,
+                        "item": item,
+                    })
+
+            if not changes:
+                return changes
+
+            # Bulk operations do not use item save() and delete() methods so the
+            # Shopping is touched and changed items are stamped with its new version
+            Shopping.objects.filter(pk=self.object.id).touch()
+            version = shopping_version(self.object.id)
+            modified = timezone.now()
+
+            for item in created + edited:
+                item.version = version
+                item.modified = modified
+
+            if created:
+                ShoppingItem.objects.bulk_create(created)
+            if edited:
+                ShoppingItem.objects.bulk_update(
+                    edited,
+                    ["quantity", "done", "version", "modified"]
+                )
+            if deleted:
+                ShoppingItem.objects.filter(pk__in=[v[0] for v in deleted]).delete()
+                ShoppingItemTombstone.objects.bulk_create([
+                    ShoppingItemTombstone(
+                        shopping_id=self.object.id,
+                        item=item_id,
+                        product=product_id,
+                        version=version,
+                    )
+                    for item_id, product_id in deleted
+                ])
+
+        # Drop the version expression, value will be loaded again from database on
+        # demand
+        for item in created + edited:
+            del item.version
+
+        invalidate_shopping_inventory(self.object.id)
+
+        for change in changes:
+            if change["operation"] == "deletion":
+                self.object.unindex_product(change["product"])
+                publish_shopping_event(
+                    self.object.id, "delete",
+                    item=change["item"]["id"], product=change["product"].id,
+                )
+            else:
+                self.object.index_item(change["item"])
+                publish_shopping_event(
+                    self.object.id, self.change_events[change["operation"]],
+                    item=change["item"].id,
+                    product=change["product"].id,
+                    quantity=change["item"].quantity,
+                    done=change["item"].done,
+                )
+
+        return changes
+
+    def post(self, request, *args, **kwargs):
+        """
+        POST verb applies all posted operations.
+
+        Invalid values or unknown products will return a HTTP 400 response without
+        any change.
+        """
+        self.object = get_object_or_404(self.model, pk=self.kwargs.get("pk"))
+
+        operations = self.parse_operations()
+        if not operations:
+            return HttpResponseBadRequest()
+
+        products = Product.objects.in_bulk(operations.keys())
+        if len(products) != len(operations):
+            return HttpResponseBadRequest()
+
+        self.changes = self.apply_operations(operations, products)
+
+        # Items changes are committed before so Shopping update can not miss a
+        # concurrent item change
+        if self.changes:
+            self.object.update_shopping_done()
+
+        return self.render_to_response(self.get_context_data(**kwargs))
+
+    def get(self, request, *args, **kwargs):
+        """
+        GET verb is not supported.
+        """
+        return HttpResponseBadRequest()
+
+
+class ShoppinglistSyncView(LoginRequiredMixin, View):
+    """
+    Synchronization API of a Shopping list items for clients which keep a copy of
+    the list.
+
+    Without any argument the response is a full snapshot of items. With a
+    ``version`` argument (the ``version`` value from a previous response) or a
+    ``since`` argument (an ISO 8601 datetime) the response only contains the items
+    created or edited and the deleted items since then, with a query per kind
+    using the Shopping version and date indexes.
+
+    Response is a JSON object with:
+
+    * ``mode``: Either ``full`` or ``delta``;
+    * ``shopping``: The Shopping id;
+    * ``version``: The current Shopping version to use for the next request;
+    * ``done``: The Shopping ``done`` value;
+    * ``fields``: Names of item values;
+    * ``items``: A list of item values;
+    * ``deleted``: Only for delta mode, a list of item id, Product id and version
+      for each deleted item. A deleted item for a Product which has been added again
+      is not included.
+
+    Item changes are committed with the Shopping version, so the Shopping row is
+    locked while reading to get the items and deletions of this exact version.
+    """
+    model = Shopping
+    raise_exception = True
+    item_fields = ["id", "product_id", "quantity", "done", "version"]
+
+    def get_changes_filters(self):
+        """
+        Parse the change arguments to item and tombstone filters.
+
+        Returns:
+            tuple: Filters for items and filters for tombstones. Both are null if
+            there is no change arguments.
+
+        Raises:
+            ValueError: If an argument value is invalid.
+        """
+        version = self.request.GET.get("version")
+        since = self.request.GET.get("since")
+
+        if version is not None and since is not None:
+            raise ValueError("Arguments 'version' and 'since' are exclusive.")
+
+        if version is not None:
+            version = int(version)
+            return {"version__gt": version}, {"version__gt": version}
+
+        if since is not None:
+            since = parse_datetime(since)
+            if since is None:
+                raise ValueError("Argument 'since' is not a valid datetime.")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            return {"modified__gt": since}, {"deleted__gt": since}
+
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        try:
+            item_filters, tombstone_filters = self.get_changes_filters()
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        with transaction.atomic():
+            shopping = get_object_or_404(
+                self.model.objects.select_for_update().values("id", "version", "done"),
+                pk=self.kwargs.get("pk"),
+            )
+
+            items = ShoppingItem.objects.filter(shopping_id=shopping["id"])
+            if item_filters:
+                items = items.filter(**item_filters)
+            items = [list(v) for v in items.values_list(*self.item_fields)]
+
+            if item_filters:
+                tombstones = list(ShoppingItemTombstone.objects.filter(
+                    shopping_id=shopping["id"],
+                    **tombstone_filters
+                ).values_list("item", "product", "version"))
+
+        payload = {
+            "mode": "delta" if item_filters else "full",
+            "shopping": shopping["id"],
+            "version": shopping["version"],
+            "done": shopping["done"],
+            "fields": ["id", "product", "quantity", "done", "version"],
+            "items": items,
+        }
+
+        if item_filters:
+            # Version of changed items indexed on their product id, to ignore the
+            # deletions of products added again since
+            readded = {v[1]: v[4] for v in items}
+            payload["deleted"] = [
+                [item, product, version]
+                for item, product, version in tombstones
+                if readded.get(product, 0) < version
+            ]
+
+        return JsonResponse(payload)
+
+
+class ShoppinglistEventsView(View):
+    """
+    Server-Sent Events stream of the item changes of a Shopping list.
+
+    Each item change is sent as a tiny message named after the change (``add``,
+    ``edit``, ``delete`` or ``done``) with the item id, its Product id and for all
+    but deletions the item quantity and done values. A ``reset`` message means some
+    events have been lost and the client has to reload the list.
+
+    Events are received from the broker of setting ``ATOUM_SHOPPING_EVENTS_BROKER``.
+    This is an asynchronous view which holds the connection open, so it must be
+    served with ASGI. It responds with a HTTP 404 unless setting
+    ``ATOUM_SHOPPING_EVENTS_ENABLED`` is enabled, since under WSGI the stream would
+    be consumed until its end which never comes.
+    """
+    model = Shopping
+
+    async def stream(self, channel):
+        """
+        Yield the messages of channel events until the client disconnects.
+
+        Arguments:
+            channel (string): Channel name.
+
+        Returns:
+            AsyncGenerator: Messages.
+        """
+        subscription = get_event_broker().subscribe(channel)
+
+        try:
+            # Subscription is made, let the client know it is listening
+            yield ": listening\n\n"
+
+            while True:
+                event = await subscription.get(
+                    timeout=settings.ATOUM_SHOPPING_EVENTS_KEEPALIVE
+                )
+                yield ":\n\n" if event is None else format_server_event(event)
+        finally:
+            subscription.close()
+
+    async def get(self, request, *args, **kwargs):
+        """
+        GET verb opens the event stream.
+
+        Anonymous are not allowed and receive a HTTP 403 response.
+        """
+        if not settings.ATOUM_SHOPPING_EVENTS_ENABLED:
+            raise Http404
+
+        # Lazy user is loaded from a synchronous context, 'auser()' is only
+        # available since Django 5.0
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            raise PermissionDenied
+
+        if not await self.model.objects.filter(pk=self.kwargs.get("pk")).aexists():
+            raise Http404
+
+        response = StreamingHttpResponse(
+            self.stream(get_shopping_channel(self.kwargs["pk"])),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Disable buffering from Nginx proxy
+        response["X-Accel-Buffering"] = "no"
+
+        return response
@@ -1,31 +1,239 @@
-from django.views.generic import ListView
+import datetime
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import condition
+from django.utils.translation import gettext_lazy as _
+from django.views.generic import TemplateView, View
 
-from ..models import Consumable
+from ..models import Assortment, Category, Consumable, Product
+from ..utils.snapshot import get_catalog_version
+from ..utils.tree import CatalogTreeResolver, CatalogTreeStreamer
 
 
-class RecursiveTreeView(ListView):
+def tree_etag(request, *args, **kwargs):
     """
-    Full recursive tree of Atoum objects (excepted Brand).
+    Build the ETag of tree page from the catalog version.
+
+    Since the page layout also depends on the user and its opened shopping inventory
+    they are included.
+
+    Arguments:
+        request (object): A Django Request object.
+
+    Returns:
+        string: The ETag value.
+    """
+    return "catalog-{version}-{user}-{inventory}".format(
+        version=get_catalog_version(),
+        user=getattr(getattr(request, "user", None), "pk", None),
+        inventory=request.session.get("atoum_shopping_inventory"),
+    )
+
 
-    .. WARNING::
+def tree_last_modified(request, *args, **kwargs):
+    """
+    Return the datetime of the last catalog change from the catalog version.
 
-        This recursive tree is highly innefficient on database queries.
-        Usage of ``prefetch_related`` is not enough to avoid cascade of queryset for
-        products.
+    Arguments:
+        request (object): A Django Request object.
 
-        If this view is to be keeped, it will need to be optimized with a tree resolving
-        that would gather objects of respectively all consumables, assortments,
-        categories and then products.
+    Returns:
+        datetime.datetime: Last catalog change.
+    """
+    return datetime.datetime.fromtimestamp(
+        get_catalog_version() / 1000000000,
+        tz=datetime.timezone.utc,
+    )
+
+
+@method_decorator(
+    condition(etag_func=tree_etag, last_modified_func=tree_last_modified),
+    name="get",
+)
+class RecursiveTreeView(TemplateView):
+    """
+    Full recursive tree of Atoum objects (excepted Brand).
+
+    The tree is resolved with ``CatalogTreeResolver`` so the amount of queries is
+    always the same no matter how big is the catalog.
+
+    Rendered tree is cached for the current catalog version, it is only resolved
+    and rendered again once the catalog has changed. Response has ``ETag`` and
+    ``Last-Modified`` headers so clients can get a "Not modified" response.
 
     .. TODO::
-        At least if we can make this more efficient and needs to keep it, make it
-        restricted to staff users. And possibly cache it ?
+        Make it restricted to staff users.
     """
-    model = Consumable
     template_name = "atoum/recursivetree.html"
-    paginate_by = None
+    fragment_template_name = "atoum/partials/recursivetree.html"
+    resolver_class = CatalogTreeResolver
+
+    def get_tree_html(self):
+        """
+        Get the rendered tree from cache or render it.
+
+        Returns:
+            string: Rendered tree HTML.
+        """
+        key = "atoum-tree-{}".format(get_catalog_version())
+        html = cache.get(key)
+
+        if html is None:
+            html = render_to_string(
+                self.fragment_template_name,
+                {"object_list": self.resolver_class().resolve()},
+            )
+            cache.set(key, html, settings.ATOUM_TREE_CACHE_TIMEOUT)
+
+        return mark_safe(html)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["tree_html"] = self.get_tree_html()
+
+        return context
+
+
+class CatalogTreeExportView(View):
+    """
+    Stream the full catalog tree as JSON or NDJSON.
+
+    The format is selected with the ``format`` URL argument, either ``json`` (the
+    default) or ``ndjson``. Rows are read from database by chunks and rendered on
+    the fly so the memory usage does not depend on the catalog size.
+    """
+    streamer_class = CatalogTreeStreamer
+    content_types = {
+        "json": "application/json",
+        "ndjson": "application/x-ndjson",
+    }
+
+    def get(self, request, *args, **kwargs):
+        format_name = request.GET.get("format", "json")
+        if format_name not in self.content_types:
+            return HttpResponseBadRequest()
+
+        streamer = self.streamer_class(
+            chunk_size=settings.ATOUM_TREE_EXPORT_CHUNK_SIZE
+        )
+
+        return StreamingHttpResponse(
+            streamer.stream(format_name=format_name),
+            content_type=self.content_types[format_name],
+        )
+
+
+class LazyTreeView(TemplateView):
+    """
+    Catalog tree which only lists consumables, their children are loaded on demand
+    with htmx from ``LazyTreeChildrenView``.
+
+    Every level is listed with a single query and the children counter columns so
+    the amount of children is known without loading them.
+
+    Attributes:
+        LEVELS (tuple): Level definitions in hierarchy order, each item is a tuple
+            of level name, model, the field name of the foreign key to the parent
+            level and the field name of children counter.
+    """
+    template_name = "atoum/lazytree.html"
+    LEVELS = (
+        ("consumable", Consumable, None, "assortment_count"),
+        ("assortment", Assortment, "consumable_id", "category_count"),
+        ("category", Category, "assortment_id", "product_count"),
+        ("product", Product, "category_id", None),
+    )
+
+    def get_nodes(self, depth, parent_id=None):
+        """
+        Get nodes of a level.
+
+        Arguments:
+            depth (integer): Index of level from ``LEVELS``.
+
+        Keyword Arguments:
+            parent_id (integer): Parent object id to filter on, it is ignored for
+                the first level.
+
+        Returns:
+            Queryset: A ``values`` queryset for nodes with their ``id``, ``title``
+            and ``count`` items. Count is ``None`` for the last level.
+        """
+        name, model, parent_field, count_field = self.LEVELS[depth]
+
+        queryset = model.objects.order_by(*model.COMMON_ORDER_BY)
+        if parent_field:
+            queryset = queryset.filter(**{parent_field: parent_id})
+
+        return queryset.values(
+            "id",
+            "title",
+            **({"count": F(count_field)} if count_field else {})
+        )
+
+    def get_level_context(self, depth, parent_id=None):
+        """
+        Build context for a level.
+
+        Arguments:
+            depth (integer): Index of level from ``LEVELS``.
+
+        Keyword Arguments:
+            parent_id (integer): Parent object id.
+
+        Returns:
+            dict: Context with level name, nodes and if they are expandable.
+        """
+        name, model, parent_field, count_field = self.LEVELS[depth]
+
+        return {
+            "level": name,
+            "nodes": self.get_nodes(depth, parent_id=parent_id),
+            "expandable": count_field is not None,
+        }
+
+    def get_level(self):
+        """
+        Return the level to list.
+
+        Returns:
+            tuple: Level index from ``LEVELS`` and parent object id.
+        """
+        return 0, None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        depth, parent_id = self.get_level()
+        context.update(self.get_level_context(depth, parent_id=parent_id))
+
+        return context
+
+
+class LazyTreeChildrenView(LazyTreeView):
+    """
+    Children of a catalog tree node.
+
+    This has been done for usage from htmx so it won't return a proper HTML page
+    document.
+    """
+    template_name = "atoum/partials/lazytree_nodes.html"
+
+    def get_level(self):
+        """
+        Return the children level of the parent node given in URL arguments.
+
+        Returns:
+            tuple: Level index from ``LEVELS`` and parent object id.
+        """
+        names = [v[0] for v in self.LEVELS[:-1]]
+        if self.kwargs["level"] not in names:
+            raise Http404(_("Unknown tree level"))
 
-    def get_queryset(self):
-        q = self.model.objects.all().prefetch_related("assortment_set")
-        return q.order_by("title")
+        return names.index(self.kwargs["level"]) + 1, self.kwargs["pk"]
@@ -7,6 +7,7 @@ import pytest
 from freezegun import freeze_time
 
 from atoum.models import Shopping, ShoppingItem
+from atoum.utils.inventory import find_request_snapshot, get_request_snapshot
 from atoum.factories import (
     AssortmentFactory, ConsumableFactory, CategoryFactory, ProductFactory,
     ShoppingFactory
@@ -266,3 +267,445 @@ def test_get_status(db, django_assert_num_queries):
     assert done.done is True
     with django_assert_num_queries(1):
         assert done.get_status() == {"status": "done", "dones": 5, "opens": 0}
+
+    # Annotated queryset gives the same status for every object in a single query
+    with django_assert_num_queries(1):
+        shoppings = Shopping.objects.with_status().order_by("id")
+        assert [
+            (v.status, v.dones, v.opens, v.get_status()) for v in shoppings
+        ] == [
+            ("open", 0, 5, {"status": "open", "dones": 0, "opens": 5}),
+            ("ongoing", 2, 3, {"status": "ongoing", "dones": 2, "opens": 3}),
+            ("done", 5, 0, {"status": "done", "dones": 5, "opens": 0}),
+        ]
+
+    # Items are counted with subqueries instead of a grouped join so a slice only
+    # counts the items of its objects
+    assert "JOIN" not in str(Shopping.objects.with_status()[:2].query)
+    assert [
+        (v.status, v.dones, v.opens)
+        for v in Shopping.objects.with_status().order_by("-id")[:2]
+    ] == [("done", 5, 0), ("ongoing", 2, 3)]
+
+
+def test_item_index(db, django_assert_num_queries):
+    """
+    Item index should be built from a single query then stay coherent once items
+    are indexed or unindexed.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+
+    shopping = ShoppingFactory(fill_products=[
+        (romaine, {"quantity": 2}),
+    ])
+
+    with django_assert_num_queries(1):
+        index = shopping.current_item_index
+        assert list(index) == [romaine.id]
+        assert index[romaine.id].quantity == 2
+        assert index[romaine.id].done is False
+
+    # Added item is available without to query the items again
+    item = ShoppingItem.objects.create(shopping=shopping, product=arugula, quantity=3)
+    shopping.index_item(item)
+    with django_assert_num_queries(0):
+        assert shopping.is_product_shopped(arugula) is True
+        assert shopping.quantity_for_product(arugula) == 3
+        assert sorted(shopping.current_item_ids) == sorted([romaine.id, arugula.id])
+
+    # Edited item replaces the previous one
+    item.done = True
+    item.save()
+    shopping.index_item(item)
+    with django_assert_num_queries(0):
+        assert shopping.item_for_product(arugula).done is True
+
+    # Deleted item is removed
+    shopping.item_for_product(romaine).delete()
+    shopping.unindex_product(romaine)
+    with django_assert_num_queries(0):
+        assert shopping.is_product_shopped(romaine) is False
+        assert shopping.item_for_product(romaine) is None
+        assert shopping.current_item_ids == (arugula.id,)
+
+    # Item list is fetched again to follow changes
+    assert [v.product.id for v in shopping.current_items] == [arugula.id]
+
+
+def test_update_shopping_done(db, django_assert_num_queries):
+    """
+    Method should update the Shopping 'done' value from its items with a single
+    query and only when it does not match its items.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+
+    shopping = ShoppingFactory(fill_products=[
+        (romaine, {"quantity": 1, "done": True}),
+        (arugula, {"quantity": 1}),
+    ])
+    assert shopping.done is False
+
+    # Nothing to change while an item is undone, conditional update then read
+    with django_assert_num_queries(2):
+        assert shopping.update_shopping_done() is None
+    assert shopping.done is False
+
+    # Every items are done, only the conditional update is needed
+    ShoppingItem.objects.filter(shopping=shopping).update(done=True)
+    with django_assert_num_queries(1):
+        assert shopping.update_shopping_done() is True
+    assert shopping.done is True
+    shopping.refresh_from_db()
+    assert shopping.done is True
+
+    # Another instance with the outdated value can not revert it and gets the
+    # database value
+    outdated = Shopping.objects.get(pk=shopping.pk)
+    outdated.done = False
+    with django_assert_num_queries(2):
+        assert outdated.update_shopping_done() is None
+    assert outdated.done is True
+    shopping.refresh_from_db()
+    assert shopping.done is True
+
+    # Another instance with the outdated value still corrects the database value
+    # when an item has been undone
+    outdated = Shopping.objects.get(pk=shopping.pk)
+    outdated.done = False
+    ShoppingItem.objects.filter(shopping=shopping, product=romaine).update(
+        done=False
+    )
+    with django_assert_num_queries(3):
+        assert outdated.update_shopping_done() is False
+    assert outdated.done is False
+    shopping.refresh_from_db()
+    assert shopping.done is False
+    ShoppingItem.objects.filter(shopping=shopping).update(done=True)
+    shopping.update_shopping_done()
+    assert shopping.done is True
+
+    # An item is undone again
+    ShoppingItem.objects.filter(shopping=shopping, product=arugula).update(
+        done=False
+    )
+    with django_assert_num_queries(1):
+        assert shopping.update_shopping_done(commit=False) is False
+    assert shopping.done is False
+    shopping.refresh_from_db()
+    assert shopping.done is True
+
+    with django_assert_num_queries(1):
+        assert shopping.update_shopping_done() is False
+    shopping.refresh_from_db()
+    assert shopping.done is False
+
+
+def test_set_items_done(db, django_assert_num_queries):
+    """
+    Method should change all or selected items with a single update and update the
+    Shopping 'done' value.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+    beef = ProductFactory(title="Beef")
+
+    shopping = ShoppingFactory(fill_products=[
+        (romaine, {"quantity": 1}),
+        (arugula, {"quantity": 1, "done": True}),
+        (beef, {"quantity": 1}),
+    ])
+    romaine_item = ShoppingItem.objects.get(shopping=shopping, product=romaine)
+    arugula_item = ShoppingItem.objects.get(shopping=shopping, product=arugula)
+    beef_item = ShoppingItem.objects.get(shopping=shopping, product=beef)
+
+    # Savepoint, changed items, touch, update, savepoint release, done update and
+    # read since an item is still undone. Selected items only
+    with django_assert_num_queries(7):
+        assert shopping.set_items_done(True, product_ids=[romaine.id, arugula.id]) == [
+            (romaine_item.id, romaine.id),
+        ]
+    assert shopping.done is False
+
+    # All remaining items, the done update is enough
+    with django_assert_num_queries(6):
+        assert shopping.set_items_done(True) == [(beef_item.id, beef.id)]
+    assert shopping.done is True
+    shopping.refresh_from_db()
+    assert shopping.done is True
+
+    # Reset all items
+    assert sorted(shopping.set_items_done(False)) == sorted([
+        (romaine_item.id, romaine.id),
+        (arugula_item.id, arugula.id),
+        (beef_item.id, beef.id),
+    ])
+    assert shopping.done is False
+    assert [v.done for v in shopping.current_items] == [False, False, False]
+
+
+def test_snapshot(db, rf, django_assert_num_queries):
+    """
+    Request snapshot should load items once and give the same lookups and status
+    than the Shopping object.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+    beef = ProductFactory(title="Beef")
+
+    shopping = ShoppingFactory(fill_products=[
+        (romaine, {"quantity": 2, "done": True}),
+        (arugula, {"quantity": 1}),
+    ])
+    request = rf.get("/")
+
+    assert find_request_snapshot(request, shopping.id) is None
+
+    with django_assert_num_queries(1):
+        snapshot = get_request_snapshot(request, shopping)
+        assert [v.product.title for v in snapshot.current_items] == [
+            "Arugula", "Romaine"
+        ]
+        assert snapshot.get_status() == {"status": "ongoing", "dones": 1, "opens": 1}
+        assert snapshot.quantity_for_product(romaine) == 2
+        assert snapshot.is_product_shopped(beef) is False
+        assert str(snapshot) == str(shopping)
+
+    # Snapshot is shared for the same request
+    with django_assert_num_queries(0):
+        assert get_request_snapshot(request, shopping) is snapshot
+        assert find_request_snapshot(request, shopping.id) is snapshot
+
+    assert snapshot.get_status() == shopping.get_status()
+
+
+def test_version(db):
+    """
+    Shopping version and modification date should follow every change on the
+    Shopping object or its items.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+
+    with freeze_time("2012-10-15 10:00:00"):
+        shopping = ShoppingFactory(title="Foo")
+    assert shopping.version == 1
+
+    def get_values():
+        return Shopping.objects.filter(pk=shopping.pk).values_list(
+            "version", "modified"
+        ).get()
+
+    # Saving the object
+    with freeze_time("2012-10-16 10:00:00"):
+        shopping.title = "Bar"
+        shopping.save()
+    assert shopping.version == 2
+    assert get_values() == (
+        2, datetime.datetime(2012, 10, 16, 10, 0).replace(tzinfo=ZoneInfo("UTC"))
+    )
+
+    # Item changes
+    with freeze_time("2012-10-17 10:00:00"):
+        item = ShoppingItem.objects.create(
+            shopping=shopping, product=romaine, quantity=1
+        )
+    assert get_values() == (
+        3, datetime.datetime(2012, 10, 17, 10, 0).replace(tzinfo=ZoneInfo("UTC"))
+    )
+    item.quantity = 2
+    item.save()
+    assert get_values()[0] == 4
+    item.delete()
+    assert get_values()[0] == 5
+    shopping.products.add(arugula, through_defaults={"quantity": 1})
+    assert get_values()[0] == 6
+    shopping.set_items_done(True)
+    # Items and done value changes
+    assert get_values()[0] == 8
+
+    # Outdated object can not make the version go back
+    outdated = Shopping.objects.get(pk=shopping.pk)
+    Shopping.objects.filter(pk=shopping.pk).touch()
+    outdated.save(update_fields=["title"])
+    assert outdated.version == 10
+    assert get_values()[0] == 10
+
+
+@freeze_time("2012-10-15 10:00:00")
+def test_clone(db, django_assert_num_queries):
+    """
+    Method should create a new Shopping with a copy of items, with a single query
+    to read them and another one to insert them.
+    """
+    products = [ProductFactory() for i in range(150)]
+    shopping = ShoppingFactory(title="Weekly", fill_products=[
+        (product, {"quantity": i + 1, "done": i % 2 == 0})
+        for i, product in enumerate(products)
+    ])
+
+    # Savepoint, Shopping insert, items select, items insert in two batches because
+    # of the SQLite parameters limit and savepoint release
+    with django_assert_num_queries(6):
+        clone = shopping.clone()
+
+    assert clone.id != shopping.id
+    assert clone.title == "Weekly"
+    assert clone.done is False
+    assert clone.planning == datetime.datetime(2012, 10, 15, 10, 0).replace(
+        tzinfo=ZoneInfo("UTC")
+    )
+    items = ShoppingItem.objects.filter(shopping=clone).order_by("quantity")
+    assert [(v.product_id, v.quantity, v.done) for v in items] == [
+        (product.id, i + 1, False)
+        for i, product in enumerate(products)
+    ]
+    assert {v.version for v in items} == {clone.version}
+    # Original list is unchanged
+    assert shopping.shoppingitem_set.count() == 150
+
+    undone = shopping.clone(title="Undone", skip_done=True)
+    assert undone.title == "Undone"
+    assert sorted(undone.shoppingitem_set.values_list("product_id", flat=True)) == [
+        product.id for i, product in enumerate(products) if i % 2 == 1
+    ]
+
+
+@freeze_time("2012-10-15 10:00:00")
+def test_create_recurrence(db):
+    """
+    Method should create a list planned on template planning date then move this
+    date to the next recurrence, only once for a same recurrence.
+    """
+    romaine = ProductFactory(title="Romaine")
+    planning = datetime.datetime(2012, 10, 14, 10, 0).replace(tzinfo=ZoneInfo("UTC"))
+
+    # Not a recurring template
+    assert ShoppingFactory(template=True).create_recurrence() is None
+
+    template = ShoppingFactory(
+        title="Weekly",
+        template=True,
+        recurrence=7,
+        planning=planning,
+        fill_products=[(romaine, {"quantity": 2})],
+    )
+    outdated = Shopping.objects.get(pk=template.pk)
+
+    shopping = template.create_recurrence()
+    assert shopping.template is False
+    assert shopping.planning == planning
+    assert list(shopping.shoppingitem_set.values_list("product_id", "quantity")) == [
+        (romaine.id, 2),
+    ]
+    assert template.planning == planning + datetime.timedelta(days=7)
+
+    # Recurrence has already been created from another object
+    assert outdated.create_recurrence() is None
+    assert Shopping.objects.filter(template=False, title="Weekly").count() == 1
+
+
+def test_merge(db, django_assert_num_queries):
+    """
+    Method should merge items from other lists with summed quantities, with the
+    same number of queries whatever the number of lists and items.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+    beef = ProductFactory(title="Beef")
+    corn = ProductFactory(title="Corn")
+
+    target = ShoppingFactory(fill_products=[
+        (romaine, {"quantity": 1, "done": True}),
+        (corn, {"quantity": 5}),
+    ])
+    first = ShoppingFactory(fill_products=[
+        (romaine, {"quantity": 2, "done": True}),
+        (arugula, {"quantity": 3}),
+    ])
+    second = ShoppingFactory(fill_products=[
+        (arugula, {"quantity": 4, "done": True}),
+        (beef, {"quantity": 32000}),
+    ])
+    third = ShoppingFactory(fill_products=[
+        (beef, {"quantity": 1000}),
+    ])
+    target.refresh_from_db()
+    version = target.version
+
+    # Savepoint, aggregate, upsert, savepoint, touch, versions stamp, events select,
+    # both savepoint releases, done update and read
+    with django_assert_num_queries(11):
+        merged = target.merge([first, second.id, third, target])
+
+    assert sorted(merged) == sorted([romaine.id, arugula.id, beef.id])
+    assert sorted(
+        target.shoppingitem_set.values_list("product__title", "quantity", "done")
+    ) == [
+        ("Arugula", 7, False),
+        ("Beef", 32767, False),
+        ("Corn", 5, False),
+        ("Romaine", 3, True),
+    ]
+    # Merged items are stamped with the new version
+    target.refresh_from_db()
+    assert target.version > version
+    assert set(
+        target.shoppingitem_set.filter(product_id__in=merged).values_list(
+            "version", flat=True
+        )
+    ) == {target.version}
+    # Sources are unchanged
+    assert list(first.shoppingitem_set.values_list("quantity", flat=True)) == [3, 2]
+
+    # Nothing to merge
+    with django_assert_num_queries(0):
+        assert target.merge([target]) == []
+
+
+def test_add_items_quantities(db, django_assert_num_queries):
+    """
+    Method should add quantities to existing items from database and create the
+    missing ones, with the same number of queries whatever the number of items.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+    beef = ProductFactory(title="Beef")
+
+    shopping = ShoppingFactory(fill_products=[
+        (romaine, {"quantity": 1, "done": True}),
+        (beef, {"quantity": 32000}),
+    ])
+    # Quantities are added to the database values
+    ShoppingItem.objects.filter(shopping=shopping, product=romaine).update(quantity=4)
+    shopping.refresh_from_db()
+    version = shopping.version
+
+    # Savepoint, insert, increment, savepoint, touch, versions stamp, events select,
+    # both savepoint releases, done update and read
+    with django_assert_num_queries(11):
+        shopping.add_items({romaine.id: 2, arugula.id: 3, beef.id: 1000})
+
+    assert sorted(
+        shopping.shoppingitem_set.values_list("product__title", "quantity", "done")
+    ) == [
+        ("Arugula", 3, False),
+        ("Beef", 32767, False),
+        ("Romaine", 6, False),
+    ]
+    shopping.refresh_from_db()
+    assert shopping.version > version
+    assert set(
+        shopping.shoppingitem_set.values_list("version", flat=True)
+    ) == {shopping.version}
+
+    # Added quantities are limited before the addition
+    shopping.add_items({romaine.id: 10 ** 20, arugula.id: 32767})
+    assert sorted(
+        shopping.shoppingitem_set.values_list("product__title", "quantity")
+    ) == [("Arugula", 32767), ("Beef", 32767), ("Romaine", 32767)]
+
+    # Nothing to add
+    with django_assert_num_queries(0):
+        shopping.add_items({})
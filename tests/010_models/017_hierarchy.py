@@ -0,0 +1,179 @@
+from atoum.models import Assortment, Category, Product
+from atoum.factories import (
+    AssortmentFactory, CategoryFactory, ConsumableFactory, ProductFactory
+)
+
+
+def get_product_hierarchy(product):
+    """
+    Shortcut to get denormalized hierarchy values of a product directly from
+    database.
+    """
+    return Product.objects.filter(pk=product.pk).values_list(
+        "consumable_id", "assortment_id", "slug_path", "title_path"
+    ).get()
+
+
+def test_creation(db):
+    """
+    Denormalized hierarchy columns should be filled on creation.
+    """
+    consumable = ConsumableFactory(title="Food", slug="food")
+    assortment = AssortmentFactory(
+        consumable=consumable, title="Meats", slug="meats"
+    )
+    category = CategoryFactory(assortment=assortment, title="Beef", slug="beef")
+    product = ProductFactory(category=category, title="Steack", slug="steack")
+
+    assert category.consumable_id == consumable.id
+    assert category.slug_path == "food/meats/beef"
+    assert category.parenting_crumbs() == ["Food", "Meats", "Beef"]
+    assert category.parenting_slugs() == ["food", "meats", "beef"]
+
+    assert get_product_hierarchy(product) == (
+        consumable.id,
+        assortment.id,
+        "food/meats/beef/steack",
+        "Food\x1fMeats\x1fBeef\x1fSteack",
+    )
+    assert product.parenting_crumbs() == ["Food", "Meats", "Beef", "Steack"]
+    assert product.get_absolute_url() == (
+        "/consumables/food/meats/beef/steack/"
+    )
+
+
+def test_parent_renamed(db):
+    """
+    Renaming any parent should update the denormalized hierarchy columns of all its
+    children.
+    """
+    consumable = ConsumableFactory(title="Food", slug="food")
+    assortment = AssortmentFactory(
+        consumable=consumable, title="Meats", slug="meats"
+    )
+    category = CategoryFactory(assortment=assortment, title="Beef", slug="beef")
+    product = ProductFactory(category=category, title="Steack", slug="steack")
+
+    consumable.title = "Foods"
+    consumable.slug = "foods"
+    consumable.save()
+
+    assert get_product_hierarchy(product)[2:] == (
+        "foods/meats/beef/steack",
+        "Foods\x1fMeats\x1fBeef\x1fSteack",
+    )
+
+    assortment = Assortment.objects.get(pk=assortment.pk)
+    assortment.title = "Red meats"
+    assortment.slug = "red-meats"
+    assortment.save()
+
+    category = Category.objects.get(pk=category.pk)
+    assert category.slug_path == "foods/red-meats/beef"
+    assert category.parenting_crumbs() == ["Foods", "Red meats", "Beef"]
+    assert get_product_hierarchy(product)[2:] == (
+        "foods/red-meats/beef/steack",
+        "Foods\x1fRed meats\x1fBeef\x1fSteack",
+    )
+
+    category.title = "Cow"
+    category.slug = "cow"
+    category.save()
+
+    assert get_product_hierarchy(product)[2:] == (
+        "foods/red-meats/cow/steack",
+        "Foods\x1fRed meats\x1fCow\x1fSteack",
+    )
+
+
+def test_parent_moved(db):
+    """
+    Moving any parent should update the denormalized hierarchy columns of all its
+    children.
+    """
+    food = ConsumableFactory(title="Food", slug="food")
+    pets = ConsumableFactory(title="Pets", slug="pets")
+    meats = AssortmentFactory(consumable=food, title="Meats", slug="meats")
+    croquettes = AssortmentFactory(
+        consumable=pets, title="Croquettes", slug="croquettes"
+    )
+    beef = CategoryFactory(assortment=meats, title="Beef", slug="beef")
+    steack = ProductFactory(category=beef, title="Steack", slug="steack")
+
+    meats.consumable = pets
+    meats.save()
+
+    assert Category.objects.get(pk=beef.pk).consumable_id == pets.id
+    assert get_product_hierarchy(steack) == (
+        pets.id,
+        meats.id,
+        "pets/meats/beef/steack",
+        "Pets\x1fMeats\x1fBeef\x1fSteack",
+    )
+
+    beef = Category.objects.get(pk=beef.pk)
+    beef.assortment = croquettes
+    beef.save()
+
+    assert get_product_hierarchy(steack) == (
+        pets.id,
+        croquettes.id,
+        "pets/croquettes/beef/steack",
+        "Pets\x1fCroquettes\x1fBeef\x1fSteack",
+    )
+
+
+def test_unchanged_parent(db, django_assert_num_queries):
+    """
+    Saving a parent without hierarchy changes should not update its children.
+    """
+    category = CategoryFactory()
+    ProductFactory(category=category)
+
+    category = Category.objects.get(pk=category.pk)
+    category.assortment
+    category.assortment.consumable
+
+    # Only the save query, no update on products
+    with django_assert_num_queries(1):
+        category.save()
+
+
+def test_sort_keys(db):
+    """
+    Sort keys should be normalized from titles and follow parent changes.
+    """
+    food = ConsumableFactory(title="Épicerie", slug="epicerie")
+    pets = ConsumableFactory(title="Pets", slug="pets")
+    meats = AssortmentFactory(consumable=food, title="Meats", slug="meats")
+    beef = CategoryFactory(assortment=meats, title="Côtes", slug="cotes")
+    steack = ProductFactory(category=beef, title="Steack", slug="steack")
+    pate = ProductFactory(category=beef, title="Pâté Breton", slug="pate")
+
+    assert pate.title_key == "pate breton"
+    assert food.sort_key == "epicerie"
+    assert meats.sort_key == "epicerie\x1fmeats"
+    assert Product.objects.get(pk=steack.pk).sort_key == (
+        "epicerie\x1fmeats\x1fcotes\x1fsteack"
+    )
+
+    food.title = "Food"
+    food.save()
+
+    assert Assortment.objects.get(pk=meats.pk).sort_key == "food\x1fmeats"
+    assert Category.objects.get(pk=beef.pk).sort_key == "food\x1fmeats\x1fcotes"
+    assert Product.objects.get(pk=steack.pk).sort_key == (
+        "food\x1fmeats\x1fcotes\x1fsteack"
+    )
+
+    meats = Assortment.objects.get(pk=meats.pk)
+    meats.consumable = pets
+    meats.title = "Red Meats"
+    meats.save()
+
+    assert Product.objects.get(pk=steack.pk).sort_key == (
+        "pets\x1fred meats\x1fcotes\x1fsteack"
+    )
+    assert Assortment.objects.hierarchy_drift().count() == 0
+    assert Category.objects.hierarchy_drift().count() == 0
+    assert Product.objects.hierarchy_drift().count() == 0
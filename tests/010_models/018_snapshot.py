@@ -0,0 +1,69 @@
+from atoum.factories import AssortmentFactory, CategoryFactory, ConsumableFactory
+from atoum.models import Assortment, Consumable
+from atoum.utils.snapshot import (
+    ConsumableRow, get_hierarchy_generation, get_hierarchy_snapshot,
+)
+
+
+def test_snapshot_build(db, django_assert_num_queries):
+    """
+    Snapshot should be built with a single query then be reused without any query
+    until the hierarchy changes.
+    """
+    food = ConsumableFactory(title="Food", slug="food")
+
+    with django_assert_num_queries(1):
+        snapshot = get_hierarchy_snapshot()
+
+    assert snapshot.get_consumable(food.id) == ConsumableRow(food.id, "food", "Food")
+    assert snapshot.get_consumable(0) is None
+
+    with django_assert_num_queries(0):
+        assert get_hierarchy_snapshot() is snapshot
+
+
+def test_snapshot_invalidation(db, django_assert_num_queries,
+                               django_capture_on_commit_callbacks):
+    """
+    Generation should be bumped once Consumable creation, hierarchy changes and
+    deletion are committed only.
+    """
+    food = ConsumableFactory(title="Food", slug="food")
+    meats = AssortmentFactory(consumable=food, title="Meats", slug="meats")
+    snapshot = get_hierarchy_snapshot()
+    generation = get_hierarchy_generation()
+
+    # Saving without hierarchy change keeps the snapshot
+    food = Consumable.objects.get(pk=food.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        food.save()
+    assert get_hierarchy_generation() == generation
+    assert get_hierarchy_snapshot() is snapshot
+
+    # Lower levels are not in snapshot
+    with django_capture_on_commit_callbacks(execute=True):
+        CategoryFactory(assortment=meats)
+        meats.title = "Meat"
+        meats.save()
+    assert get_hierarchy_generation() == generation
+
+    food.title = "Foods"
+    with django_capture_on_commit_callbacks(execute=True):
+        food.save()
+        # Generation is not bumped until the change is committed
+        assert get_hierarchy_generation() == generation
+    assert get_hierarchy_generation() > generation
+
+    # Assortment labels follow the new snapshot without query on relation
+    meats = Assortment.objects.get(pk=meats.pk)
+    get_hierarchy_snapshot()
+    with django_assert_num_queries(0):
+        assert meats.parenting_crumbs() == ["Foods", "Meat"]
+        assert meats.get_absolute_url() == "/consumables/food/meats/"
+
+    generation = get_hierarchy_generation()
+    food_id = food.id
+    with django_capture_on_commit_callbacks(execute=True):
+        food.delete()
+    assert get_hierarchy_generation() > generation
+    assert get_hierarchy_snapshot().get_consumable(food_id) is None
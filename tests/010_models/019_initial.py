@@ -1,14 +1,26 @@
+from atoum.factories import (
+    AssortmentFactory, CategoryFactory, ConsumableFactory, ProductFactory
+)
+from atoum.utils.dataset import InitialCatalog
+
 from tests.initial import initial_catalog  # noqa: F401
 
 
-def test_factory_creation(db, initial_catalog):  # noqa: F811
+def test_factory_creation(db, initial_catalog,  # noqa: F811
+                          django_assert_num_queries):
     """
     Initial catalog should correctly create a catalog structure as expected.
 
     .. Todo::
         We should check also the Brands that are in their own tree.
     """
-    assert initial_catalog.get_ascii_tree() == (
+    # A single query for each level under consumables, without any filter on the
+    # ids of stored objects
+    with django_assert_num_queries(3) as captured:
+        tree = initial_catalog.get_ascii_tree()
+    assert [v["sql"] for v in captured.captured_queries if " IN (" in v["sql"]] == []
+
+    assert tree == (
         "───<Consumable: Food>\n"
         "   └─<Assortment: Meats>\n"
         "      └─<Category: Beef>\n"
@@ -34,3 +46,49 @@ def test_factory_creation(db, initial_catalog):  # noqa: F811
         "      └─<Category: Other category>\n"
         "         └─<Product: Other product>"
     )
+
+    # Trees from a parent object start from its children, one query for categories
+    # and another one for their products
+    with django_assert_num_queries(2):
+        tree = initial_catalog.get_category_tree(
+            assortment=initial_catalog.assortments["meats"],
+            attr="title",
+        )
+
+    assert tree == [
+        ("Beef", [("Steack", None), ("T-Bone", None), ("Tongue", None)]),
+        ("Chicken", [("Wing", None)]),
+        ("Pig", []),
+    ]
+
+
+def test_tree_childless_levels(db):
+    """
+    Nodes without children should have an empty tree even when a deeper level has
+    no object at all, only the last level of hierarchy has no children tree.
+    """
+    food = ConsumableFactory(title="Food")
+    hygiene = ConsumableFactory(title="Hygiene")
+    meats = AssortmentFactory(consumable=food, title="Meats")
+    beef = CategoryFactory(assortment=meats, title="Beef")
+
+    catalog = InitialCatalog(
+        consumables={"food": food, "hygiene": hygiene},
+        assortments={"meats": meats},
+        categories={"beef": beef},
+    )
+
+    assert catalog.get_consumable_tree(attr="title") == [
+        ("Food", [("Meats", [("Beef", [])])]),
+        ("Hygiene", []),
+    ]
+    assert catalog.get_category_tree(assortment=meats, attr="title") == [
+        ("Beef", []),
+    ]
+    assert catalog.get_category_tree(attr="title") == [("Beef", [])]
+
+    steack = ProductFactory(category=beef, title="Steack")
+    catalog.products["steack"] = steack
+    assert catalog.get_category_tree(attr="title") == [
+        ("Beef", [("Steack", None)]),
+    ]
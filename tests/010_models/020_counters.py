@@ -0,0 +1,147 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from atoum.factories import (
+    AssortmentFactory, CategoryFactory, ConsumableFactory, ProductFactory
+)
+from atoum.models import Assortment, Category, Consumable, Product
+
+
+def get_counters():
+    """
+    Shortcut to get product counters directly from database indexed on object slugs.
+    """
+    return {
+        "consumables": dict(Consumable.objects.order_by("slug").values_list(
+            "slug", "product_count"
+        )),
+        "assortments": dict(Assortment.objects.order_by("slug").values_list(
+            "slug", "product_count"
+        )),
+        "categories": dict(Category.objects.order_by("slug").values_list(
+            "slug", "product_count"
+        )),
+    }
+
+
+def test_counters_creation(db):
+    """
+    Counters of all parents should be updated when objects are created.
+    """
+    food = ConsumableFactory(slug="food")
+    meats = AssortmentFactory(consumable=food, slug="meats")
+    AssortmentFactory(consumable=food, slug="fruits")
+    beef = CategoryFactory(assortment=meats, slug="beef")
+    CategoryFactory(assortment=meats, slug="pig")
+    ProductFactory(category=beef)
+    ProductFactory(category=beef)
+
+    food = Consumable.objects.get(pk=food.pk)
+    assert (
+        food.assortment_count, food.category_count, food.product_count
+    ) == (2, 2, 2)
+
+    meats = Assortment.objects.get(pk=meats.pk)
+    assert (meats.category_count, meats.product_count) == (2, 2)
+
+    assert Category.objects.get(pk=beef.pk).product_count == 2
+
+
+def test_counters_move_and_delete(db, django_assert_num_queries):
+    """
+    Counters of previous and new parents should be updated when an object is moved
+    and counters of parents should be updated when an object is deleted.
+    """
+    food = ConsumableFactory(slug="food")
+    pets = ConsumableFactory(slug="pets")
+    meats = AssortmentFactory(consumable=food, slug="meats")
+    croquettes = AssortmentFactory(consumable=pets, slug="croquettes")
+    beef = CategoryFactory(assortment=meats, slug="beef")
+    chicken = CategoryFactory(assortment=croquettes, slug="chicken")
+    steack = ProductFactory(category=beef)
+    ProductFactory(category=beef)
+
+    steack = Product.objects.get(pk=steack.pk)
+    steack.category = chicken
+    steack.save()
+
+    assert get_counters() == {
+        "consumables": {"food": 1, "pets": 1},
+        "assortments": {"croquettes": 1, "meats": 1},
+        "categories": {"beef": 1, "chicken": 1},
+    }
+
+    # Saving without moving does not update counters, there is only the cover
+    # purge signal query and the save query
+    steack = Product.objects.get(pk=steack.pk)
+    steack.category
+    with django_assert_num_queries(2):
+        steack.save()
+
+    meats = Assortment.objects.get(pk=meats.pk)
+    meats.consumable = pets
+    meats.save()
+
+    assert get_counters()["consumables"] == {"food": 0, "pets": 2}
+    assert Consumable.objects.get(pk=pets.pk).assortment_count == 2
+
+    Category.objects.get(pk=beef.pk).delete()
+
+    assert get_counters() == {
+        "consumables": {"food": 0, "pets": 1},
+        "assortments": {"croquettes": 1, "meats": 0},
+        "categories": {"chicken": 1},
+    }
+    assert Assortment.objects.get(pk=meats.pk).category_count == 0
+    assert Consumable.objects.get(pk=pets.pk).category_count == 1
+
+
+def test_counters_bulk_delete(db):
+    """
+    Counters of parents should be updated once per parent model for a bulk or
+    cascading deletion, whatever the number of deleted objects.
+    """
+    food = ConsumableFactory(slug="food")
+    meats = AssortmentFactory(consumable=food, slug="meats")
+    fruits = AssortmentFactory(consumable=food, slug="fruits")
+    beef = CategoryFactory(assortment=meats, slug="beef")
+    pig = CategoryFactory(assortment=meats, slug="pig")
+    apple = CategoryFactory(assortment=fruits, slug="apple")
+    for category in (beef, beef, beef, pig, pig, apple):
+        ProductFactory(category=category)
+
+    def counter_updates(queries):
+        return [
+            v["sql"] for v in queries
+            if v["sql"].startswith("UPDATE") and "_count" in v["sql"]
+        ]
+
+    # A query per parent model
+    with CaptureQueriesContext(connection) as captured:
+        Product.objects.filter(category__in=[beef, pig]).delete()
+    assert len(counter_updates(captured.captured_queries)) == 3
+
+    assert get_counters() == {
+        "consumables": {"food": 1},
+        "assortments": {"fruits": 1, "meats": 0},
+        "categories": {"apple": 1, "beef": 0, "pig": 0},
+    }
+
+    for category in (beef, beef, pig):
+        ProductFactory(category=category)
+
+    # Products then categories parents are updated, then the consumable of the
+    # assortment
+    with CaptureQueriesContext(connection) as captured:
+        Assortment.objects.get(pk=meats.pk).delete()
+    assert len(counter_updates(captured.captured_queries)) == 3 + 2 + 1
+
+    assert get_counters() == {
+        "consumables": {"food": 1},
+        "assortments": {"fruits": 1},
+        "categories": {"apple": 1},
+    }
+    food = Consumable.objects.get(pk=food.pk)
+    assert (
+        food.assortment_count, food.category_count, food.product_count
+    ) == (1, 1, 1)
@@ -1,4 +1,5 @@
-from atoum.forms import ShoppingAdminForm
+from atoum.factories import ProductFactory, ShoppingFactory
+from atoum.forms import ShoppingAdminForm, ShoppingQuickAddForm
 from atoum.utils.tests import flatten_form_errors
 
 
@@ -14,3 +15,67 @@ def test_empty(db, settings):
         "created": ["This field is required."],
         "planning": ["This field is required."],
     }
+
+
+def test_quick_add(db, django_assert_num_queries):
+    """
+    Quick add form should resolve all lines with a single query and add matched
+    products with summed quantities in database.
+    """
+    milk = ProductFactory(title="Lait demi-écrémé")
+    bread = ProductFactory(title="Pain")
+    ProductFactory(title="Thé")
+    ProductFactory(title="The")
+    shopping = ShoppingFactory(fill_products=[(bread, {"quantity": 1, "done": True})])
+
+    f = ShoppingQuickAddForm(
+        {"text": "2 lait  DEMI-ECREME\n\n3x pain\nthe\n  unknown  \npain\n"},
+        shopping=shopping,
+    )
+    assert f.is_valid() is True
+    assert f.cleaned_data["text"][:2] == [
+        ("2 lait DEMI-ECREME", 2, "lait demi-ecreme"),
+        ("3x pain", 3, "pain"),
+    ]
+
+    # Products, savepoint, insert, increment, savepoint, touch, versions stamp,
+    # events select, both savepoint releases and done update
+    with django_assert_num_queries(11):
+        added, unmatched = f.save()
+
+    assert sorted(added) == sorted([milk.id, bread.id])
+    # Ambiguous and unknown names are not matched
+    assert unmatched == ["the", "unknown"]
+    assert sorted(
+        shopping.shoppingitem_set.values_list("product__title", "quantity", "done")
+    ) == [("Lait demi-écrémé", 2, False), ("Pain", 5, False)]
+
+
+def test_quick_add_empty(db):
+    """
+    Quick add form without any product line should not be valid.
+    """
+    f = ShoppingQuickAddForm({"text": " \n \n"}, shopping=ShoppingFactory())
+
+    assert f.is_valid() is False
+    assert flatten_form_errors(f) == {"text": ["This field is required."]}
+
+
+def test_quick_add_oversized(db):
+    """
+    Quick add form should refuse a quantity greater than the item quantity limit.
+    """
+    ProductFactory(title="Pain")
+
+    f = ShoppingQuickAddForm(
+        {"text": "2 pain\n99999999999999999999 pain\n32768x pain\n32767 pain"},
+        shopping=ShoppingFactory(),
+    )
+
+    assert f.is_valid() is False
+    assert flatten_form_errors(f) == {
+        "text": [
+            "Quantity can not be greater than 32767: 99999999999999999999 pain, "
+            "32768x pain"
+        ],
+    }
@@ -0,0 +1,250 @@
+import json
+
+from django.urls import reverse
+
+from atoum.factories import ProductFactory
+from atoum.utils.tests import html_pyquery
+from atoum.utils.tree import CatalogTreeResolver
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_resolver(db, initial_catalog,  # noqa: F811
+                  django_assert_num_queries):
+    """
+    Resolver should build the whole tree with a single query per level.
+    """
+    with django_assert_num_queries(4):
+        tree = CatalogTreeResolver().resolve()
+
+    assert [
+        (
+            repr(consumable),
+            [
+                (
+                    repr(assortment),
+                    [
+                        (repr(category), [repr(v) for v in category.children])
+                        for category in assortment.children
+                    ]
+                )
+                for assortment in consumable.children
+            ]
+        )
+        for consumable in tree
+    ] == [
+        ("<Consumable: Food>", [
+            ("<Assortment: Meats>", [
+                ("<Category: Beef>", [
+                    "<Product: Steack>", "<Product: T-Bone>", "<Product: Tongue>"
+                ]),
+                ("<Category: Chicken>", ["<Product: Wing>"]),
+                ("<Category: Pig>", []),
+            ]),
+            ("<Assortment: Sweat treats>", []),
+            ("<Assortment: Vegetables>", [
+                ("<Category: Reds>", ["<Product: Tomatoe>"]),
+                ("<Category: Yellows>", ["<Product: Corn>"]),
+            ]),
+        ]),
+        ("<Consumable: Hygiene>", []),
+        ("<Consumable: Other consumable>", [
+            ("<Assortment: Other assortment>", [
+                ("<Category: Other category>", ["<Product: Other product>"]),
+            ]),
+        ]),
+        ("<Consumable: Pets>", [
+            ("<Assortment: Croquettes>", [
+                ("<Category: Beef>", ["<Product: Sensitive>"]),
+            ]),
+        ]),
+    ]
+
+    # Depth allows to stop resolving before products
+    with django_assert_num_queries(2):
+        tree = CatalogTreeResolver(depth=2).resolve()
+
+    assert [len(v.children) for v in tree] == [3, 0, 1, 1]
+    assert tree[0].children[0].children == []
+
+
+def test_view(client, db, initial_catalog,  # noqa: F811
+              django_assert_num_queries, django_capture_on_commit_callbacks):
+    """
+    Tree view should render the full tree with a query per level, even when the
+    catalog grows.
+    """
+    url = reverse("atoum:tree")
+
+    with django_assert_num_queries(4):
+        response = client.get(url)
+
+    assert response.status_code == 200
+
+    dom = html_pyquery(response)
+    assert len(dom.find(".consumable-list > li")) == 4
+    assert len(dom.find(".assortment-list > li")) == 5
+    assert len(dom.find(".category-list > li")) == 7
+    assert len(dom.find(".product-list > li")) == 8
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for i in range(10):
+            ProductFactory(category=initial_catalog.categories["pig"])
+
+    with django_assert_num_queries(4):
+        response = client.get(url)
+
+    dom = html_pyquery(response)
+    assert len(dom.find(".product-list > li")) == 18
+
+
+def test_view_cache(client, db, initial_catalog,  # noqa: F811
+                    django_assert_num_queries, django_capture_on_commit_callbacks):
+    """
+    Rendered tree should be cached for the current catalog version and the response
+    should allow clients to revalidate it.
+    """
+    url = reverse("atoum:tree")
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert "Last-Modified" in response.headers
+
+    # Tree is not resolved again while catalog has not changed
+    with django_assert_num_queries(0):
+        response = client.get(url)
+
+    assert response.headers["ETag"] == etag
+    assert len(html_pyquery(response).find(".product-list > li")) == 8
+
+    response = client.get(url, headers={"if-none-match": etag})
+    assert response.status_code == 304
+
+    # Any committed catalog change makes a new version
+    product = initial_catalog.products["steack"]
+    product.title = "Bavette"
+    with django_capture_on_commit_callbacks(execute=True):
+        product.save()
+        response = client.get(url, headers={"if-none-match": etag})
+        assert response.status_code == 304
+
+    response = client.get(url, headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Bavette" in [
+        v.text.strip() for v in html_pyquery(response).find(".product-list > li")
+    ]
+
+
+def tree_as_dicts(nodes, keys=("assortments", "categories", "products")):
+    """
+    Shortcut to convert resolved tree nodes to the structure of the JSON export.
+    """
+    return [
+        dict(
+            {"id": node.id, "title": node.title, "slug": node.slug},
+            **({keys[0]: tree_as_dicts(node.children, keys[1:])} if keys else {})
+        )
+        for node in nodes
+    ]
+
+
+def test_export_view(client, db, initial_catalog,  # noqa: F811
+                     django_assert_num_queries):
+    """
+    Export view should stream the same tree than the resolver with a single query
+    per level.
+    """
+    url = reverse("atoum:tree-export")
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.streaming is True
+    assert response.headers["Content-Type"] == "application/json"
+
+    with django_assert_num_queries(4):
+        payload = json.loads(b"".join(response.streaming_content))
+
+    assert payload == tree_as_dicts(CatalogTreeResolver().resolve())
+
+    response = client.get(url, {"format": "ndjson"})
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+
+    lines = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert len(lines) == 4 + 5 + 7 + 8
+    assert lines[:2] == [
+        {
+            "model": "consumable",
+            "id": initial_catalog.consumables["foods"].id,
+            "title": "Food",
+            "slug": "foods",
+            "parent": None,
+        },
+        {
+            "model": "assortment",
+            "id": initial_catalog.assortments["meats"].id,
+            "title": "Meats",
+            "slug": "meats",
+            "parent": initial_catalog.consumables["foods"].id,
+        },
+    ]
+
+    response = client.get(url, {"format": "xml"})
+    assert response.status_code == 400
+
+
+def test_lazy_tree(client, db, initial_catalog,  # noqa: F811
+                   django_assert_num_queries):
+    """
+    Lazy tree should only list consumables and each children endpoint should list
+    the children of a node with their own children count, with a single query.
+    """
+    with django_assert_num_queries(1):
+        response = client.get(reverse("atoum:tree-lazy"))
+
+    dom = html_pyquery(response)
+    assert [
+        (v.cssselect(".badge")[0].text, v.cssselect(".count")[0].text)
+        for v in dom.find(".consumable-list > li")
+    ] == [
+        ("Food", "(3)"),
+        ("Hygiene", "(0)"),
+        ("Other consumable", "(1)"),
+        ("Pets", "(1)"),
+    ]
+    # Only nodes with children can be expanded
+    assert len(dom.find(".consumable-list > li button")) == 3
+
+    foods = initial_catalog.consumables["foods"]
+    url = reverse("atoum:tree-children", kwargs={"level": "consumable", "pk": foods.id})
+    with django_assert_num_queries(1):
+        response = client.get(url)
+
+    dom = html_pyquery(response, rooted=True)
+    assert [
+        (v.cssselect(".badge")[0].text, v.cssselect(".count")[0].text)
+        for v in dom.find(".assortment-list > li")
+    ] == [
+        ("Meats", "(3)"),
+        ("Sweat treats", "(0)"),
+        ("Vegetables", "(2)"),
+    ]
+
+    beef = initial_catalog.categories["beeffoods"]
+    url = reverse("atoum:tree-children", kwargs={"level": "category", "pk": beef.id})
+    with django_assert_num_queries(1):
+        response = client.get(url)
+
+    dom = html_pyquery(response, rooted=True)
+    assert [v.text.strip() for v in dom.find(".product-list > li")] == [
+        "Steack", "T-Bone", "Tongue"
+    ]
+    assert len(dom.find(".product-list > li button")) == 0
+
+    # Products have no children
+    url = reverse("atoum:tree-children", kwargs={"level": "product", "pk": 1})
+    assert client.get(url).status_code == 404
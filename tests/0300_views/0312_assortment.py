@@ -5,6 +5,7 @@ from atoum.factories import (
     ConsumableFactory,
     UserFactory,
 )
+from atoum.utils.snapshot import get_hierarchy_snapshot
 from atoum.utils.tests import html_pyquery
 
 from tests.initial import initial_catalog  # noqa: F401
@@ -30,8 +31,10 @@ def test_index_filled(client, db, initial_catalog,  # noqa: F811
     """
     url = reverse("atoum:assortment-index")
 
-    # Only a count queryset from pagination and the other one to list objects with
-    # their relation preloaded
+    # Parent titles come from the hierarchy snapshot which is built once
+    get_hierarchy_snapshot()
+
+    # Only a count queryset from pagination and the other one to list objects
     with django_assert_num_queries(2):
         response = client.get(url, follow=True)
 
@@ -66,6 +69,8 @@ def test_detail_filled(client, db, initial_catalog,  # noqa: F811
         }
     )
 
+    get_hierarchy_snapshot()
+
     # A queryset for the main object, another one to list its related objects and
     # another one for pagination
     with django_assert_num_queries(3):
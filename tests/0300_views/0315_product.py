@@ -8,6 +8,7 @@ from atoum.factories import (
     UserFactory,
 )
 from atoum.utils.tests import html_pyquery
+from atoum.views import ProductDetailView
 
 from tests.initial import initial_catalog  # noqa: F401
 
@@ -57,6 +58,45 @@ def test_index_filled(client, db, initial_catalog,  # noqa: F811
     ]
 
 
+def test_detail_lookup(client, db, initial_catalog,  # noqa: F811
+                       django_assert_num_queries):
+    """
+    Product detail object should be resolved from its slug path with a single query
+    and respond with a 404 if the path does not match exactly.
+    """
+    view = ProductDetailView()
+    view.kwargs = {
+        "consumable_slug": "foods",
+        "assortment_slug": "vegetables",
+        "category_slug": "reds",
+        "product_slug": "tomatoe",
+    }
+
+    # Breadcrumbs don't need any other query
+    with django_assert_num_queries(1):
+        view.object = view.get_object()
+        crumbs = view.crumbs
+
+    assert view.object == initial_catalog.products["tomatoe"]
+    assert crumbs[-1] == (
+        "Tomatoe",
+        "/consumables/foods/vegetables/reds/tomatoe/",
+    )
+
+    # Product exists but not in this category
+    url = reverse(
+        "atoum:product-detail",
+        kwargs={
+            "consumable_slug": "foods",
+            "assortment_slug": "vegetables",
+            "category_slug": "yellows",
+            "product_slug": "tomatoe",
+        }
+    )
+    response = client.get(url)
+    assert response.status_code == 404
+
+
 def test_detail_filled(admin_client, db, initial_catalog):  # noqa: F811
     """
     Product detail view should contain product detail informations.
@@ -7,6 +7,8 @@ from freezegun import freeze_time
 
 from atoum.utils.tests import html_pyquery
 from atoum.factories import ShoppingFactory, UserFactory
+from atoum.models import Shopping
+from atoum.views import ShoppinglistIndexView
 
 from tests.initial import initial_catalog  # noqa: F401
 
@@ -58,7 +60,9 @@ def test_index_filled(client, db, initial_catalog,  # noqa: F811
     ShoppingFactory(title="Foo", planning=tomorrow)
     ShoppingFactory(title="Bar", done=True)
 
-    with django_assert_num_queries(4):
+    # Session, user, ETag page rows and templates, shoppings and templates, there is
+    # no count for pagination
+    with django_assert_num_queries(6):
         response = client.get(url, follow=True)
 
     assert response.redirect_chain == []
@@ -72,6 +76,96 @@ def test_index_filled(client, db, initial_catalog,  # noqa: F811
     assert titles == ["Foo", "Fontessa", "Bar"]
 
 
+def test_index_progress(client, db, initial_catalog,  # noqa: F811
+                        django_assert_num_queries):
+    """
+    Shopping list index should display the item progress of each list without any
+    additional query per list.
+    """
+    user = UserFactory()
+    client.force_login(user)
+
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    steack = initial_catalog.products["steack"]
+
+    ShoppingFactory(title="Foo", fill_products=[
+        (corn, {"quantity": 1, "done": True}),
+        (wing, {"quantity": 1}),
+        (steack, {"quantity": 1}),
+    ])
+    ShoppingFactory(title="Bar", fill_products=[
+        (corn, {"quantity": 1}),
+    ])
+    ShoppingFactory(title="Empty")
+
+    url = reverse("atoum:shopping-list-index")
+    with django_assert_num_queries(6):
+        response = client.get(url, follow=True)
+
+    dom = html_pyquery(response)
+    progress = {
+        item.cssselect(".title")[0].text: item.cssselect(".progress-bar")[0].text
+        for item in dom.find(".shoppinglist-index .shoppinglists .item")
+    }
+    assert progress == {"Foo": "1/3", "Bar": "0/1", "Empty": "0/0"}
+
+
+def test_index_keyset_pagination(client, db, monkeypatch,
+                                 django_assert_num_queries):
+    """
+    Shopping list index pages should follow each other from their cursor with the
+    same amount of queries and in the index order, even with equal planning dates.
+    """
+    monkeypatch.setattr(ShoppinglistIndexView, "paginate_by", 2)
+
+    user = UserFactory()
+    client.force_login(user)
+
+    tomorrow = datetime.datetime(2012, 10, 16, 10, 0).replace(tzinfo=ZoneInfo("UTC"))
+    yesterday = datetime.datetime(2012, 10, 14, 10, 0).replace(tzinfo=ZoneInfo("UTC"))
+
+    ShoppingFactory(title="Old done", planning=yesterday, done=True)
+    ShoppingFactory(title="Foo", planning=yesterday)
+    ShoppingFactory(title="Bar", planning=yesterday)
+    ShoppingFactory(title="Next", planning=tomorrow)
+    ShoppingFactory(title="Next done", planning=tomorrow, done=True)
+
+    url = reverse("atoum:shopping-list-index")
+    pages = []
+    while url:
+        with django_assert_num_queries(6):
+            response = client.get(url)
+        assert response.status_code == 200
+
+        dom = html_pyquery(response)
+        pages.append([
+            v.text
+            for v in dom.find(".shoppinglist-index .shoppinglists .item .title")
+        ])
+        url = dom.find(".pagination .next").attr("href")
+        if url:
+            url = reverse("atoum:shopping-list-index") + url
+
+    assert pages == [
+        ["Next", "Bar"],
+        ["Foo", "Next done"],
+        ["Old done"],
+    ]
+
+    # ETag only depends on the displayed lists
+    url = reverse("atoum:shopping-list-index")
+    etag = client.get(url).headers["ETag"]
+    Shopping.objects.filter(title="Old done").touch()
+    assert client.get(url, headers={"if-none-match": etag}).status_code == 304
+    Shopping.objects.filter(title="Next").touch()
+    assert client.get(url, headers={"if-none-match": etag}).status_code == 200
+
+    # Invalid cursor
+    response = client.get(reverse("atoum:shopping-list-index"), {"after": "foo"})
+    assert response.status_code == 404
+
+
 def test_detail_filled(client, db, initial_catalog,  # noqa: F811
                        django_assert_num_queries):
     """
@@ -88,6 +182,7 @@ def test_detail_filled(client, db, initial_catalog,  # noqa: F811
 
     url = reverse("atoum:shopping-list-detail", kwargs={"pk": shopping.id})
 
+    # Session, user, ETag, shopping and its items
     with django_assert_num_queries(5):
         response = client.get(url, follow=True)
 
@@ -100,3 +195,91 @@ def test_detail_filled(client, db, initial_catalog,  # noqa: F811
         for v in dom.find(".shopping-detail .shopping-items .item .title")
     ]
     assert titles == ["Corn", "Steack", "Tomatoe"]
+
+
+def test_detail_opened_inventory(client, db, initial_catalog,  # noqa: F811
+                                 django_assert_num_queries):
+    """
+    Shopping list detail should share its items with the opened inventory and the
+    product controls so they are loaded with a single query.
+    """
+    user = UserFactory()
+    client.force_login(user)
+
+    corn = initial_catalog.products["corn"]
+    tomatoe = initial_catalog.products["tomatoe"]
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (tomatoe, {"quantity": 42}),
+    ])
+
+    session = client.session
+    session["atoum_shopping_inventory"] = shopping.id
+    session.save()
+
+    url = reverse("atoum:shopping-list-detail", kwargs={"pk": shopping.id})
+
+    # Session, user, ETag, shopping and its items
+    with django_assert_num_queries(5):
+        response = client.get(url, follow=True)
+
+    assert response.status_code == 200
+
+    dom = html_pyquery(response)
+    # Opened inventory rows
+    assert [
+        v.cssselect(".title")[0].text + ":" + v.cssselect(".quantity")[0].text
+        for v in dom.find("#shopping-inventory-{} tbody tr".format(shopping.id))
+    ] == ["Corn:1", "Tomatoe:42"]
+    # Product controls with the item quantities
+    assert [
+        dom.find("#id_shopping-product-{}_quantity".format(v.id)).attr("value")
+        for v in (corn, tomatoe)
+    ] == ["1", "42"]
+
+
+def test_conditional_get(client, db, initial_catalog,  # noqa: F811
+                         django_assert_num_queries):
+    """
+    Shopping pages should respond with an ETag and a "Not modified" response to a
+    request with a matching ETag until the Shopping has changed.
+    """
+    user = UserFactory()
+    client.force_login(user)
+
+    corn = initial_catalog.products["corn"]
+    shopping = ShoppingFactory(fill_products=[(corn, {"quantity": 1})])
+
+    session = client.session
+    session["atoum_shopping_inventory"] = shopping.id
+    session.save()
+
+    urls = [
+        reverse("atoum:shopping-list-index"),
+        reverse("atoum:shopping-list-detail", kwargs={"pk": shopping.id}),
+        reverse("atoum:shopping-list-inventory"),
+    ]
+
+    etags = []
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        etags.append(response.headers["ETag"])
+        # Strong ETag
+        assert not response.headers["ETag"].startswith("W/")
+
+    # Inventory fragment is the aside content
+    assert len(html_pyquery(response, rooted=True).find("#aside-shopping")) == 1
+
+    # Session, user and ETag only, index ETag reads the page rows and the templates
+    for url, etag, queries in zip(urls, etags, [4, 3, 3]):
+        with django_assert_num_queries(queries):
+            response = client.get(url, headers={"if-none-match": etag})
+        assert response.status_code == 304
+
+    # Item change leads to new ETags
+    shopping.item_for_product(corn).delete()
+    for url, etag in zip(urls, etags):
+        response = client.get(url, headers={"if-none-match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
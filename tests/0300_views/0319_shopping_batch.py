@@ -0,0 +1,220 @@
+from django.urls import reverse
+
+import pytest
+
+from atoum.factories import ShoppingFactory, UserFactory
+from atoum.models import Shopping, ShoppingItem
+from atoum.utils.tests import html_pyquery
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_anonymous(client, db, initial_catalog):  # noqa: F811
+    """
+    Anonymous are not allowed to perform a request on batch view.
+    """
+    shopping = ShoppingFactory()
+
+    url = reverse("atoum:shopping-list-batch", kwargs={"pk": shopping.id})
+    response = client.post(url, data={
+        "quantity-{}".format(initial_catalog.products["wing"].id): 1,
+    }, follow=True)
+    assert response.redirect_chain == []
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("data", [
+    {},
+    {"quantity-{corn}": "nope"},
+    {"quantity-{corn}": -1},
+    {"quantity-{corn}": ShoppingItem.MAX_QUANTITY + 1},
+    {"done-{corn}": "yes"},
+    {"quantity-{corn}": 1, "quantity-0": 1},
+])
+def test_invalid(client, db, initial_catalog, data):  # noqa: F811
+    """
+    Invalid values or unknown products lead to a HTTP 400 response without any
+    change.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+
+    shopping = ShoppingFactory(fill_products=[(wing, {"quantity": 1})])
+
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-batch", kwargs={"pk": shopping.id})
+    response = client.post(url, data={
+        k.format(corn=corn.id): v
+        for k, v in data.items()
+    })
+    assert response.status_code == 400
+
+    assert [
+        (v.product.title, v.quantity) for v in shopping.get_items()
+    ] == [("Wing", 1)]
+
+
+@pytest.mark.parametrize("opened_inventory", [True, False])
+def test_post(client, db, initial_catalog, django_assert_max_num_queries,  # noqa: F811
+              opened_inventory):
+    """
+    View applies all operations with a query per kind of change and respond with
+    out-of-band fragments for changed rows.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    steack = initial_catalog.products["steack"]
+    tomatoe = initial_catalog.products["tomatoe"]
+    tongue = initial_catalog.products["tongue"]
+    tbone = initial_catalog.products["tbone"]
+
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (wing, {"quantity": 1}),
+        (steack, {"quantity": 1}),
+    ])
+
+    client.force_login(user)
+
+    if opened_inventory:
+        session = client.session
+        session["atoum_shopping_inventory"] = shopping.id
+        session.save()
+
+    corn_item = ShoppingItem.objects.get(shopping=shopping, product=corn)
+    wing_item = ShoppingItem.objects.get(shopping=shopping, product=wing)
+    steack_item = ShoppingItem.objects.get(shopping=shopping, product=steack)
+
+    url = reverse("atoum:shopping-list-batch", kwargs={"pk": shopping.id})
+    with django_assert_max_num_queries(17):
+        response = client.post(url, data={
+            # Edition
+            "quantity-{}".format(corn.id): 4,
+            # Done state
+            "done-{}".format(wing.id): "true",
+            # Deletion
+            "quantity-{}".format(steack.id): 0,
+            # Additions
+            "quantity-{}".format(tomatoe.id): 2,
+            "quantity-{}".format(tongue.id): 1,
+            "done-{}".format(tongue.id): "true",
+            # Ignored since it does not exist
+            "done-{}".format(tbone.id): "true",
+        })
+    assert response.status_code == 200
+
+    assert [
+        (v.product.title, v.quantity, v.done) for v in shopping.get_items()
+    ] == [
+        ("Corn", 4, False),
+        ("Tomatoe", 2, False),
+        ("Tongue", 1, True),
+        ("Wing", 1, True),
+    ]
+
+    dom = html_pyquery(response, rooted=True)
+    inventory_ids = [
+        v.get("id")
+        for v in dom.find("[id^=shopping-inventory-]")
+    ]
+    tomatoe_item = ShoppingItem.objects.get(shopping=shopping, product=tomatoe)
+    tongue_item = ShoppingItem.objects.get(shopping=shopping, product=tongue)
+
+    if opened_inventory:
+        prefix = "shopping-inventory-{}-item-".format(shopping.id)
+        assert sorted(inventory_ids) == sorted([
+            prefix + str(corn_item.id),
+            prefix + str(corn_item.id) + "-done",
+            prefix + str(wing_item.id) + "-done",
+            prefix + str(steack_item.id),
+            prefix + str(tomatoe_item.id),
+            prefix + str(tomatoe_item.id) + "-done",
+            prefix + str(tongue_item.id),
+            prefix + str(tongue_item.id) + "-done",
+        ])
+    else:
+        assert inventory_ids == []
+
+    # Deleted row is removed from detail and status is updated once
+    detail_row = dom.find("#shopping-detail-{}-item-{}".format(
+        shopping.id, steack_item.id
+    ))
+    assert detail_row[0].get("hx-swap-oob") == "delete"
+    assert len(dom.find("#shopping-detail-{}-status".format(shopping.id))) == 1
+
+
+def test_post_done(client, db, initial_catalog):  # noqa: F811
+    """
+    Shopping 'done' value is updated from the changed items.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (wing, {"quantity": 1}),
+    ])
+    assert shopping.done is False
+
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-batch", kwargs={"pk": shopping.id})
+    response = client.post(url, data={
+        "done-{}".format(corn.id): "true",
+        "done-{}".format(wing.id): "true",
+    })
+    assert response.status_code == 200
+
+    shopping.refresh_from_db()
+    assert shopping.done is True
+
+
+def test_post_noop(client, db, initial_catalog,  # noqa: F811
+                   django_capture_on_commit_callbacks):
+    """
+    Operations without any effect on items should not change the Shopping version.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    tbone = initial_catalog.products["tbone"]
+
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (wing, {"quantity": 2, "done": True}),
+    ])
+    shopping.refresh_from_db()
+    version = shopping.version
+    modified = shopping.modified
+    items = [
+        (v.product.title, v.quantity, v.done, v.version)
+        for v in shopping.get_items()
+    ]
+
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-batch", kwargs={"pk": shopping.id})
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        response = client.post(url, data={
+            # Same values than the items
+            "quantity-{}".format(corn.id): 1,
+            "done-{}".format(corn.id): "false",
+            "quantity-{}".format(wing.id): 2,
+            "done-{}".format(wing.id): "true",
+            # Missing item
+            "quantity-{}".format(tbone.id): 0,
+        })
+    assert response.status_code == 200
+    assert callbacks == []
+
+    assert Shopping.objects.filter(pk=shopping.id).values_list(
+        "version", "modified"
+    ).get() == (version, modified)
+    assert [
+        (v.product.title, v.quantity, v.done, v.version)
+        for v in shopping.get_items()
+    ] == items
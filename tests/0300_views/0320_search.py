@@ -1,5 +1,6 @@
 from django.urls import reverse
 
+from atoum.utils.snapshot import get_hierarchy_snapshot
 from atoum.utils.tests import html_pyquery
 
 from tests.initial import initial_catalog, index_catalog  # noqa: F401
@@ -75,6 +76,9 @@ def test_index_models(client, db, initial_catalog, index_catalog,  # noqa: F811
     """
     url = reverse("atoum:search-results")
 
+    # Assortment parents come from the hierarchy snapshot which is built once
+    get_hierarchy_snapshot()
+
     # With all model enabled (default)
     # Use a queryset per model
     with django_assert_num_queries(4):
@@ -0,0 +1,113 @@
+from django.urls import reverse
+
+import pytest
+
+from atoum.factories import ShoppingFactory, UserFactory
+from atoum.models import ShoppingItem
+from atoum.utils.tests import html_pyquery
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_anonymous(client, db):
+    """
+    Anonymous are not allowed to perform a request on items done view.
+    """
+    shopping = ShoppingFactory()
+
+    url = reverse("atoum:shopping-list-items-done", kwargs={"pk": shopping.id})
+    response = client.post(url, data={"done": "true"}, follow=True)
+    assert response.redirect_chain == []
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("data", [
+    {},
+    {"done": "yes"},
+    {"done": "true", "product": "nope"},
+])
+def test_invalid(client, db, data):
+    """
+    Invalid values lead to a HTTP 400 response.
+    """
+    user = UserFactory()
+    shopping = ShoppingFactory()
+
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-items-done", kwargs={"pk": shopping.id})
+    response = client.post(url, data=data)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("opened_inventory", [True, False])
+def test_mark_all_done(client, db, initial_catalog,  # noqa: F811
+                       opened_inventory):
+    """
+    All items are marked as done and response contains the list status and the
+    fragments for changed items.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (wing, {"quantity": 1, "done": True}),
+    ])
+    corn_item = ShoppingItem.objects.get(shopping=shopping, product=corn)
+
+    client.force_login(user)
+
+    if opened_inventory:
+        session = client.session
+        session["atoum_shopping_inventory"] = shopping.id
+        session.save()
+
+    url = reverse("atoum:shopping-list-items-done", kwargs={"pk": shopping.id})
+    response = client.post(url, data={"done": "true"})
+    assert response.status_code == 200
+
+    assert [v.done for v in shopping.get_items()] == [True, True]
+    shopping.refresh_from_db()
+    assert shopping.done is True
+
+    dom = html_pyquery(response, rooted=True)
+    assert len(dom.find(".state-done")) == (2 if opened_inventory else 1)
+
+    # Only the changed item has fragments
+    checkboxes = dom.find("input[type=checkbox]")
+    assert [v.get("id") for v in checkboxes] == [
+        "shopping-detail-{}-item-{}-done".format(shopping.id, corn_item.id),
+    ]
+    assert checkboxes[0].get("checked") is not None
+    inventory_cells = dom.find("td[hx-swap-oob]")
+    assert len(inventory_cells) == (1 if opened_inventory else 0)
+
+
+def test_reset_selected(client, db, initial_catalog):  # noqa: F811
+    """
+    Only selected items are reset and the Shopping is undone.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1, "done": True}),
+        (wing, {"quantity": 1, "done": True}),
+    ])
+    assert shopping.done is True
+
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-items-done", kwargs={"pk": shopping.id})
+    response = client.post(url, data={"done": "false", "product": [wing.id]})
+    assert response.status_code == 200
+
+    assert [(v.product.title, v.done) for v in shopping.get_items()] == [
+        ("Corn", True),
+        ("Wing", False),
+    ]
+    shopping.refresh_from_db()
+    assert shopping.done is False
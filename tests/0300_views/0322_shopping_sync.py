@@ -0,0 +1,192 @@
+import datetime
+from zoneinfo import ZoneInfo
+
+from django.urls import reverse
+
+import pytest
+from freezegun import freeze_time
+
+from atoum.factories import ShoppingFactory, UserFactory
+from atoum.models import Shopping, ShoppingItem
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_anonymous(client, db):
+    """
+    Anonymous are not allowed to use the sync view.
+    """
+    shopping = ShoppingFactory()
+
+    url = reverse("atoum:shopping-list-sync", kwargs={"pk": shopping.id})
+    response = client.get(url, follow=True)
+    assert response.redirect_chain == []
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("params", [
+    {"version": "nope"},
+    {"since": "nope"},
+    {"version": 1, "since": "2012-10-15T10:00:00"},
+])
+def test_invalid(client, db, params):
+    """
+    Invalid arguments lead to a HTTP 400 response.
+    """
+    user = UserFactory()
+    shopping = ShoppingFactory()
+
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-sync", kwargs={"pk": shopping.id})
+    response = client.get(url, params)
+    assert response.status_code == 400
+
+
+def test_full(client, db, initial_catalog, django_assert_num_queries):  # noqa: F811
+    """
+    Without arguments, response is a full snapshot of items.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (wing, {"quantity": 3, "done": True}),
+    ])
+    shopping.refresh_from_db()
+    corn_item = ShoppingItem.objects.get(shopping=shopping, product=corn)
+    wing_item = ShoppingItem.objects.get(shopping=shopping, product=wing)
+
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-sync", kwargs={"pk": shopping.id})
+    # Session, user, savepoint, locked shopping, items and savepoint release
+    with django_assert_num_queries(6):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert response.json() == {
+        "mode": "full",
+        "shopping": shopping.id,
+        "version": shopping.version,
+        "done": False,
+        "fields": ["id", "product", "quantity", "done", "version"],
+        "items": [
+            [corn_item.id, corn.id, 1, False, corn_item.version],
+            [wing_item.id, wing.id, 3, True, wing_item.version],
+        ],
+    }
+
+
+def test_delta_version(client, db, initial_catalog,  # noqa: F811
+                       django_assert_num_queries):
+    """
+    With a version, response only contains the changes since this version.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    steack = initial_catalog.products["steack"]
+    tomatoe = initial_catalog.products["tomatoe"]
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (wing, {"quantity": 1}),
+        (steack, {"quantity": 1}),
+    ])
+
+    client.force_login(user)
+    url = reverse("atoum:shopping-list-sync", kwargs={"pk": shopping.id})
+    version = client.get(url).json()["version"]
+
+    # Nothing changed
+    with django_assert_num_queries(7):
+        response = client.get(url, {"version": version})
+    assert response.json()["items"] == []
+    assert response.json()["deleted"] == []
+
+    # Edit an item, delete another one and add a new one
+    corn_item = ShoppingItem.objects.get(shopping=shopping, product=corn)
+    corn_item.quantity = 2
+    corn_item.save()
+    wing_item = ShoppingItem.objects.get(shopping=shopping, product=wing)
+    wing_item_id = wing_item.id
+    wing_item.delete()
+    tomatoe_item = ShoppingItem.objects.create(
+        shopping=shopping, product=tomatoe, quantity=5
+    )
+    # Steack is deleted then added again
+    shopping.products.remove(steack)
+    shopping.products.add(steack, through_defaults={"quantity": 3})
+    steack_item = ShoppingItem.objects.get(shopping=shopping, product=steack)
+
+    payload = client.get(url, {"version": version}).json()
+    current = Shopping.objects.get(pk=shopping.pk).version
+    assert payload["mode"] == "delta"
+    assert payload["version"] == current
+    assert sorted([v[:4] for v in payload["items"]]) == sorted([
+        [corn_item.id, corn.id, 2, False],
+        [tomatoe_item.id, tomatoe.id, 5, False],
+        [steack_item.id, steack.id, 3, False],
+    ])
+    assert [v[:2] for v in payload["deleted"]] == [[wing_item_id, wing.id]]
+
+    # Next synchronization from the new version has nothing
+    payload = client.get(url, {"version": current}).json()
+    assert payload["items"] == []
+    assert payload["deleted"] == []
+
+
+def test_delta_since(client, db, initial_catalog):  # noqa: F811
+    """
+    With a datetime, response only contains the changes since this date.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+
+    with freeze_time("2012-10-15 10:00:00"):
+        shopping = ShoppingFactory(fill_products=[
+            (corn, {"quantity": 1}),
+            (wing, {"quantity": 1}),
+        ])
+
+    with freeze_time("2012-10-16 10:00:00"):
+        ShoppingItem.objects.get(shopping=shopping, product=wing).delete()
+
+    client.force_login(user)
+    url = reverse("atoum:shopping-list-sync", kwargs={"pk": shopping.id})
+
+    payload = client.get(url, {"since": "2012-10-15T12:00:00"}).json()
+    assert payload["items"] == []
+    assert [v[1] for v in payload["deleted"]] == [wing.id]
+
+    since = datetime.datetime(2012, 10, 14, 10, 0).replace(tzinfo=ZoneInfo("UTC"))
+    payload = client.get(url, {"since": since.isoformat()}).json()
+    assert [v[1] for v in payload["items"]] == [corn.id]
+    assert [v[1] for v in payload["deleted"]] == [wing.id]
+
+
+def test_delta_product_deletion(client, db, initial_catalog):  # noqa: F811
+    """
+    Items deleted by the cascade of a Product deletion should be recorded.
+    """
+    user = UserFactory()
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    shopping = ShoppingFactory(fill_products=[
+        (corn, {"quantity": 1}),
+        (wing, {"quantity": 1}),
+    ])
+    wing_item = ShoppingItem.objects.get(shopping=shopping, product=wing)
+    wing_id = wing.id
+
+    client.force_login(user)
+    url = reverse("atoum:shopping-list-sync", kwargs={"pk": shopping.id})
+    version = client.get(url).json()["version"]
+
+    wing.delete()
+
+    payload = client.get(url, {"version": version}).json()
+    assert payload["version"] > version
+    assert payload["items"] == []
+    assert [v[:2] for v in payload["deleted"]] == [[wing_item.id, wing_id]]
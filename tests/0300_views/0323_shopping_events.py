@@ -0,0 +1,212 @@
+import asyncio
+import threading
+
+from django.urls import reverse
+
+from asgiref.sync import async_to_sync
+
+from atoum.factories import ShoppingFactory, UserFactory
+from atoum.models import ShoppingItem
+from atoum.utils.events import (
+    LocalEventBroker, get_event_broker, get_shopping_channel,
+)
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_local_broker():
+    """
+    Local broker should send events published from any thread to the channel
+    subscribers only, until they unsubscribe.
+    """
+    broker = LocalEventBroker()
+
+    async def listen():
+        subscription = broker.subscribe("foo")
+        other = broker.subscribe("bar")
+
+        thread = threading.Thread(
+            target=broker.publish, args=("foo", {"event": "add", "data": {}})
+        )
+        thread.start()
+        thread.join()
+
+        received = [await subscription.get(timeout=1), await other.get(timeout=0.01)]
+
+        subscription.close()
+        other.close()
+
+        return received
+
+    assert asyncio.run(listen()) == [{"event": "add", "data": {}}, None]
+    assert broker.subscriptions == {}
+
+
+def test_local_broker_overflow():
+    """
+    Subscriber which does not consume events fast enough should lose them and
+    receive a reset event instead.
+    """
+    broker = LocalEventBroker()
+
+    async def listen():
+        subscription = broker.subscribe("foo")
+        subscription.queue = asyncio.Queue(maxsize=2)
+
+        for i in range(3):
+            broker.publish("foo", {"event": "edit", "data": {"item": i}})
+        # Let the loop run the scheduled callbacks
+        await asyncio.sleep(0)
+
+        received = [
+            await subscription.get(timeout=0.01),
+            await subscription.get(timeout=0.01),
+        ]
+        subscription.close()
+
+        return received
+
+    assert asyncio.run(listen()) == [{"event": "reset", "data": {}}, None]
+
+
+def test_published_events(client, db, initial_catalog, monkeypatch,  # noqa: F811
+                          django_capture_on_commit_callbacks):
+    """
+    Item changes should publish their events on the Shopping channel once
+    committed.
+    """
+    published = []
+    monkeypatch.setattr(
+        get_event_broker(), "publish",
+        lambda channel, event: published.append(
+            (channel, event["event"], event["data"])
+        ),
+    )
+
+    user = UserFactory()
+    client.force_login(user)
+
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    shopping = ShoppingFactory()
+    channel = get_shopping_channel(shopping.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        item = ShoppingItem.objects.create(shopping=shopping, product=corn, quantity=2)
+
+        item.quantity = 3
+        item.save()
+
+        item.done = True
+        item.save(update_fields=["done"])
+
+        shopping.set_items_done(False)
+
+        client.post(
+            reverse("atoum:shopping-list-batch", kwargs={"pk": shopping.id}),
+            {"quantity-{}".format(wing.id): 1, "quantity-{}".format(corn.id): 0},
+        )
+
+    wing_item = ShoppingItem.objects.get(shopping=shopping, product=wing)
+    wing_item_id = wing_item.id
+
+    with django_capture_on_commit_callbacks(execute=True):
+        wing_item.delete()
+
+    assert published == [
+        (channel, "add", {
+            "item": item.id, "product": corn.id, "quantity": 2, "done": False,
+        }),
+        (channel, "edit", {
+            "item": item.id, "product": corn.id, "quantity": 3, "done": False,
+        }),
+        (channel, "done", {
+            "item": item.id, "product": corn.id, "quantity": 3, "done": True,
+        }),
+        (channel, "done", {"item": item.id, "product": corn.id, "done": False}),
+        (channel, "add", {
+            "item": wing_item_id, "product": wing.id, "quantity": 1, "done": False,
+        }),
+        (channel, "delete", {"item": item.id, "product": corn.id}),
+        (channel, "delete", {"item": wing_item_id, "product": wing.id}),
+    ]
+
+
+def test_stream_disabled(client, async_client, db):
+    """
+    Event stream should not be available and shopping list detail should not
+    listen to it when events are disabled.
+    """
+    user = UserFactory()
+    shopping = ShoppingFactory()
+    async_client.force_login(user)
+    client.force_login(user)
+
+    url = reverse("atoum:shopping-list-events", kwargs={"pk": shopping.id})
+    response = async_to_sync(async_client.get)(url)
+    assert response.status_code == 404
+
+    response = client.get(
+        reverse("atoum:shopping-list-detail", kwargs={"pk": shopping.id})
+    )
+    assert "EventSource" not in response.content.decode()
+
+
+def test_stream_anonymous(async_client, db, settings):
+    """
+    Anonymous are not allowed to open the event stream.
+    """
+    settings.ATOUM_SHOPPING_EVENTS_ENABLED = True
+    shopping = ShoppingFactory()
+
+    url = reverse("atoum:shopping-list-events", kwargs={"pk": shopping.id})
+    response = async_to_sync(async_client.get)(url)
+    assert response.status_code == 403
+
+
+def test_stream(client, async_client, db, settings):
+    """
+    Event stream should send the events published on the Shopping channel.
+    """
+    settings.ATOUM_SHOPPING_EVENTS_ENABLED = True
+    user = UserFactory()
+    shopping = ShoppingFactory()
+    async_client.force_login(user)
+    client.force_login(user)
+
+    response = client.get(
+        reverse("atoum:shopping-list-detail", kwargs={"pk": shopping.id})
+    )
+    assert "EventSource" in response.content.decode()
+
+    url = reverse("atoum:shopping-list-events", kwargs={"pk": shopping.id})
+
+    async def listen():
+        response = await async_client.get(url)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+
+        messages = response.streaming_content.__aiter__()
+        # First message is sent once subscribed
+        received = [await messages.__anext__()]
+
+        get_event_broker().publish(
+            get_shopping_channel(shopping.id),
+            {"event": "done", "data": {"item": 1, "product": 2, "done": True}},
+        )
+        received.append(await messages.__anext__())
+        await messages.aclose()
+
+        return received
+
+    assert [
+        v.decode() if isinstance(v, bytes) else v
+        for v in async_to_sync(listen)()
+    ] == [
+        ": listening\n\n",
+        'event: done\ndata: {"item":1,"product":2,"done":true}\n\n',
+    ]
+    assert get_event_broker().subscriptions == {}
+
+    missing = reverse("atoum:shopping-list-events", kwargs={"pk": shopping.id + 1})
+    assert async_to_sync(async_client.get)(missing).status_code == 404
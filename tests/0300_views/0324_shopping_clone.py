@@ -0,0 +1,82 @@
+from django.urls import reverse
+
+from atoum.factories import ShoppingFactory, UserFactory
+from atoum.models import Shopping
+from atoum.utils.tests import html_pyquery
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_anonymous(client, db):
+    """
+    Anonymous are not allowed to clone a list.
+    """
+    shopping = ShoppingFactory()
+
+    url = reverse("atoum:shopping-list-clone", kwargs={"pk": shopping.id})
+    response = client.post(url, follow=True)
+    assert response.redirect_chain == []
+    assert response.status_code == 403
+    assert Shopping.objects.count() == 1
+
+
+def test_clone(client, db, initial_catalog):  # noqa: F811
+    """
+    Clone should create a new list with the items and redirect to it.
+    """
+    user = UserFactory()
+    client.force_login(user)
+
+    corn = initial_catalog.products["corn"]
+    wing = initial_catalog.products["wing"]
+    shopping = ShoppingFactory(title="Weekly", fill_products=[
+        (corn, {"quantity": 2}),
+        (wing, {"quantity": 1, "done": True}),
+    ])
+
+    url = reverse("atoum:shopping-list-clone", kwargs={"pk": shopping.id})
+
+    response = client.post(url)
+    clone = Shopping.objects.latest("id")
+    assert response.status_code == 302
+    assert response.url == clone.get_absolute_url()
+    assert sorted(
+        clone.shoppingitem_set.values_list("product_id", "quantity", "done")
+    ) == sorted([(corn.id, 2, False), (wing.id, 1, False)])
+
+    client.post(url, {"skip_done": "true"})
+    clone = Shopping.objects.latest("id")
+    assert list(
+        clone.shoppingitem_set.values_list("product_id", "quantity", "done")
+    ) == [(corn.id, 2, False)]
+
+    # Unknown list
+    response = client.post(
+        reverse("atoum:shopping-list-clone", kwargs={"pk": clone.id + 1})
+    )
+    assert response.status_code == 404
+
+
+def test_index_templates(client, db):
+    """
+    Templates should be listed apart from the lists to shop.
+    """
+    user = UserFactory()
+    client.force_login(user)
+
+    ShoppingFactory(title="Foo")
+    template = ShoppingFactory(title="Weekly", template=True, recurrence=7)
+
+    response = client.get(reverse("atoum:shopping-list-index"))
+    assert response.status_code == 200
+
+    dom = html_pyquery(response)
+    assert [
+        v.text for v in dom.find(".shoppinglist-index .shoppinglists .item .title")
+    ] == ["Foo"]
+    assert [
+        v.text for v in dom.find(".shoppinglist-index .shopping-templates .title")
+    ] == ["Weekly"]
+    assert dom.find(".shopping-templates form").attr("action") == reverse(
+        "atoum:shopping-list-clone", kwargs={"pk": template.id}
+    )
@@ -0,0 +1,61 @@
+from django.urls import reverse
+
+from atoum.factories import ProductFactory, ShoppingFactory, UserFactory
+from atoum.utils.tests import html_pyquery
+
+
+def test_anonymous(client, db):
+    """
+    Anonymous are not allowed and is redirect to login.
+    """
+    shopping = ShoppingFactory()
+
+    url = reverse("atoum:shopping-list-quick-add", kwargs={"pk": shopping.id})
+    response = client.get(url, follow=True)
+    assert response.redirect_chain == [
+        ("/admin/login/?next={}".format(url), 302)
+    ]
+
+
+def test_quick_add(client, db):
+    """
+    View should add matched products and give back the unmatched lines.
+    """
+    user = UserFactory()
+    client.force_login(user)
+
+    milk = ProductFactory(title="Lait demi-écrémé")
+    shopping = ShoppingFactory()
+
+    url = reverse("atoum:shopping-list-quick-add", kwargs={"pk": shopping.id})
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert html_pyquery(response).find(".shopping-quick-add .report") == []
+
+    response = client.post(url, {"text": "2 lait demi-écrémé\nfoo\nbar"})
+    assert response.status_code == 200
+
+    dom = html_pyquery(response)
+    assert dom.find(".report .added").text().startswith("1 product has been added.")
+    assert [v.text for v in dom.find(".report .unmatched li")] == ["foo", "bar"]
+    assert dom.find(".shopping-quick-add textarea").text() == "foo\nbar"
+
+    assert list(
+        shopping.shoppingitem_set.values_list("product_id", "quantity")
+    ) == [(milk.id, 2)]
+
+    # Invalid form
+    response = client.post(url, {"text": ""})
+    assert response.status_code == 200
+    dom = html_pyquery(response)
+    assert len(dom.find(".shopping-quick-add .invalid-feedback")) == 1
+
+    # Oversized quantity is an invalid form
+    response = client.post(url, {"text": "99999999999999999999 lait demi-écrémé"})
+    assert response.status_code == 200
+    dom = html_pyquery(response)
+    assert len(dom.find(".shopping-quick-add .invalid-feedback")) == 1
+    assert list(
+        shopping.shoppingitem_set.values_list("product_id", "quantity")
+    ) == [(milk.id, 2)]
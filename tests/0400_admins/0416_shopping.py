@@ -1,3 +1,6 @@
+import datetime
+from zoneinfo import ZoneInfo
+
 import pytest
 
 from atoum.factories import ProductFactory, ShoppingFactory
@@ -125,3 +128,60 @@ def test_admin_detail_inlines(db, admin_client, payload, expected):
     assert shopping.done is expected["shopping_done"]
     assert arugula_through.done is expected["arugula_done"]
     assert romaine_through.done is expected["romaine_done"]
+
+
+@pytest.mark.parametrize("action, expected", [
+    ("duplicate", [("Romaine", False), ("Arugula", False)]),
+    ("duplicate_undone", [("Romaine", False)]),
+])
+def test_admin_duplicate_action(db, admin_client, action, expected):
+    """
+    Duplicate actions should clone selected lists with their items.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+    shopping = ShoppingFactory(title="Weekly", fill_products=[
+        (romaine, {"quantity": 1}),
+        (arugula, {"quantity": 1, "done": True}),
+    ])
+
+    response = admin_client.post(
+        get_admin_list_url(Shopping),
+        {"action": action, "_selected_action": [shopping.id]},
+        follow=True,
+    )
+    assert response.status_code == 200
+
+    clone = Shopping.objects.exclude(pk=shopping.pk).get()
+    assert clone.title == "Weekly"
+    assert sorted(
+        clone.shoppingitem_set.values_list("product__title", "done")
+    ) == sorted(expected)
+
+
+def test_admin_merge_action(db, admin_client):
+    """
+    Merge action should merge selected lists into the latest planned one.
+    """
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+    older = ShoppingFactory(
+        planning=datetime.datetime(2012, 10, 14, 10, 0).replace(tzinfo=ZoneInfo("UTC")),
+        fill_products=[(romaine, {"quantity": 1}), (arugula, {"quantity": 2})],
+    )
+    latest = ShoppingFactory(
+        planning=datetime.datetime(2012, 10, 16, 10, 0).replace(tzinfo=ZoneInfo("UTC")),
+        fill_products=[(romaine, {"quantity": 3})],
+    )
+
+    response = admin_client.post(
+        get_admin_list_url(Shopping),
+        {"action": "merge", "_selected_action": [older.id, latest.id]},
+        follow=True,
+    )
+    assert response.status_code == 200
+
+    assert sorted(
+        latest.shoppingitem_set.values_list("product__title", "quantity")
+    ) == [("Arugula", 2), ("Romaine", 4)]
+    assert older.shoppingitem_set.count() == 2
@@ -1,5 +1,7 @@
-from atoum.factories import ShoppingFactory, UserFactory
+from atoum.factories import ProductFactory, ShoppingFactory, UserFactory
 from atoum.context_processors import session_data_processor
+from atoum.models import ShoppingItem
+from atoum.utils.inventory import ShoppingInventory
 
 
 def test_empty(client, db, rf):
@@ -50,3 +52,74 @@ def test_opened_dont_exists(client, db, rf):
     context = session_data_processor(rf)
 
     assert context["shopping_inventory"] is None
+
+
+def test_opened_cache(client, db, rf, django_assert_num_queries,
+                      django_capture_on_commit_callbacks):
+    """
+    Opened shopping list data is cached until the list or its items change.
+    """
+    user = UserFactory()
+    romaine = ProductFactory(title="Romaine")
+    arugula = ProductFactory(title="Arugula")
+    opened_shopping = ShoppingFactory(title="Foo", fill_products=[
+        (romaine, {"quantity": 2}),
+    ])
+
+    client.force_login(user)
+    rf.user = user
+
+    session = client.session
+    session["atoum_shopping_inventory"] = opened_shopping.id
+    session.save()
+    rf.session = session
+
+    with django_assert_num_queries(2):
+        inventory = session_data_processor(rf)["shopping_inventory"]
+
+    assert isinstance(inventory, ShoppingInventory)
+    assert str(inventory) == "Foo"
+    assert [
+        (v.product.title, v.quantity, v.done) for v in inventory.current_items
+    ] == [("Romaine", 2, False)]
+    assert inventory.quantity_for_product(romaine) == 2
+    assert inventory.is_product_shopped(arugula) is False
+
+    # Cache hit does not perform any query
+    with django_assert_num_queries(0):
+        session_data_processor(rf)
+
+    # Item changes invalidate the data once committed
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        ShoppingItem.objects.create(
+            shopping=opened_shopping, product=arugula, quantity=1
+        )
+        with django_assert_num_queries(0):
+            session_data_processor(rf)
+    assert len(callbacks) > 0
+    inventory = session_data_processor(rf)["shopping_inventory"]
+    assert [v.product.title for v in inventory.current_items] == [
+        "Arugula", "Romaine"
+    ]
+
+    # Bulk change from model method invalidate the data also
+    with django_capture_on_commit_callbacks(execute=True):
+        opened_shopping.set_items_done(True)
+    inventory = session_data_processor(rf)["shopping_inventory"]
+    assert inventory.done is True
+    assert [v.done for v in inventory.current_items] == [True, True]
+
+    # Shopping changes invalidate the data
+    opened_shopping.title = "Bar"
+    with django_capture_on_commit_callbacks(execute=True):
+        opened_shopping.save()
+    assert str(session_data_processor(rf)["shopping_inventory"]) == "Bar"
+
+    # Product changes invalidate the data
+    romaine.title = "Lettuce"
+    with django_capture_on_commit_callbacks(execute=True):
+        romaine.save()
+    inventory = session_data_processor(rf)["shopping_inventory"]
+    assert [v.product.title for v in inventory.current_items] == [
+        "Arugula", "Lettuce"
+    ]
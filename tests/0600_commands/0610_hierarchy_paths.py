@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from atoum.models import Category, Product
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_verify(db, initial_catalog):  # noqa: F811
+    """
+    Verification should fail only when there are outdated hierarchy columns.
+    """
+    out = StringIO()
+    call_command("hierarchy_paths", "--verify", stdout=out)
+    assert "- Category object(s) with outdated hierarchy: 0" in out.getvalue()
+    assert "- Product object(s) with outdated hierarchy: 0" in out.getvalue()
+
+    # Corrupt some columns without using model save
+    Product.objects.filter(slug="steack").update(slug_path="nope")
+    Category.objects.filter(slug="pig").update(title_path="", consumable=None)
+
+    out = StringIO()
+    with pytest.raises(CommandError):
+        call_command("hierarchy_paths", "--verify", stdout=out)
+
+    assert "- Category object(s) with outdated hierarchy: 1" in out.getvalue()
+    assert "- Product object(s) with outdated hierarchy: 1" in out.getvalue()
+
+
+def test_rebuild(db, initial_catalog):  # noqa: F811
+    """
+    Rebuild should restore all outdated hierarchy columns.
+    """
+    Category.objects.update(title_path="", consumable=None)
+    Product.objects.filter(slug="steack").update(slug_path="nope")
+
+    out = StringIO()
+    call_command("hierarchy_paths", stdout=out)
+    assert "- Category object(s) rebuilt: 7" in out.getvalue()
+    assert "- Product object(s) rebuilt: 8" in out.getvalue()
+
+    assert Category.objects.hierarchy_drift().count() == 0
+    assert Product.objects.hierarchy_drift().count() == 0
+    assert Product.objects.get(slug="steack").slug_path == "foods/meats/beef/steack"
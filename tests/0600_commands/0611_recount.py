@@ -0,0 +1,57 @@
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from atoum.models import Assortment, Category, Consumable
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_verify(db, initial_catalog):  # noqa: F811
+    """
+    Verification should fail only when there are wrong counters.
+    """
+    out = StringIO()
+    call_command("recount", "--verify", stdout=out)
+    assert "- Consumable object(s) with wrong counters: 0" in out.getvalue()
+    assert "- Assortment object(s) with wrong counters: 0" in out.getvalue()
+    assert "- Category object(s) with wrong counters: 0" in out.getvalue()
+
+    # Corrupt some counters without using model save
+    Consumable.objects.filter(slug="foods").update(product_count=42)
+    Category.objects.filter(slug="pig").update(product_count=1)
+
+    out = StringIO()
+    with pytest.raises(CommandError):
+        call_command("recount", "--verify", stdout=out)
+
+    assert "- Consumable object(s) with wrong counters: 1" in out.getvalue()
+    assert "- Assortment object(s) with wrong counters: 0" in out.getvalue()
+    assert "- Category object(s) with wrong counters: 1" in out.getvalue()
+
+
+def test_recount(db, initial_catalog):  # noqa: F811
+    """
+    Recount should repair all wrong counters.
+    """
+    Consumable.objects.update(assortment_count=0, product_count=0)
+    Assortment.objects.update(category_count=9)
+    Category.objects.update(product_count=9)
+
+    out = StringIO()
+    call_command("recount", stdout=out)
+    assert "- Consumable object(s) recounted: 4" in out.getvalue()
+    assert "- Assortment object(s) recounted: 5" in out.getvalue()
+    assert "- Category object(s) recounted: 7" in out.getvalue()
+
+    assert Consumable.objects.counter_drift().count() == 0
+    assert Assortment.objects.counter_drift().count() == 0
+    assert Category.objects.counter_drift().count() == 0
+
+    foods = Consumable.objects.get(slug="foods")
+    assert (
+        foods.assortment_count, foods.category_count, foods.product_count
+    ) == (3, 5, 6)
@@ -0,0 +1,39 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+
+from atoum.utils.tree import CatalogTreeStreamer
+
+from tests.initial import initial_catalog  # noqa: F401
+
+
+def test_export_stdout(db, initial_catalog):  # noqa: F811
+    """
+    Export should be written to the standard output with the same content than the
+    streamer, whatever the chunk size is.
+    """
+    out = StringIO()
+    call_command("tree_export", "--chunk-size=2", stdout=out)
+
+    assert json.loads(out.getvalue()) == json.loads(
+        "".join(CatalogTreeStreamer().stream())
+    )
+
+
+def test_export_file(db, tmp_path, initial_catalog):  # noqa: F811
+    """
+    Export should be written to the given file path.
+    """
+    destination = tmp_path / "tree.ndjson"
+    call_command("tree_export", "--format=ndjson", "--output", str(destination))
+
+    lines = destination.read_text().splitlines()
+    assert len(lines) == 4 + 5 + 7 + 8
+    assert json.loads(lines[-1]) == {
+        "model": "product",
+        "id": initial_catalog.products["sensitive"].id,
+        "title": "Sensitive",
+        "slug": "sensitive",
+        "parent": initial_catalog.categories["beefpets"].id,
+    }
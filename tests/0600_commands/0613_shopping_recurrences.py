@@ -0,0 +1,53 @@
+import datetime
+from io import StringIO
+from zoneinfo import ZoneInfo
+
+from django.core.management import call_command
+
+from freezegun import freeze_time
+
+from atoum.factories import ProductFactory, ShoppingFactory
+from atoum.models import Shopping
+
+
+@freeze_time("2012-10-15 10:00:00")
+def test_recurrences(db):
+    """
+    Command should create every missing list of due recurring templates.
+    """
+    romaine = ProductFactory(title="Romaine")
+    planning = datetime.datetime(2012, 10, 1, 10, 0).replace(tzinfo=ZoneInfo("UTC"))
+
+    template = ShoppingFactory(
+        title="Weekly",
+        template=True,
+        recurrence=7,
+        planning=planning,
+        fill_products=[(romaine, {"quantity": 2})],
+    )
+    # Not a recurring template
+    ShoppingFactory(title="Other", template=True, planning=planning)
+
+    out = StringIO()
+    call_command("shopping_recurrences", stdout=out)
+    assert "Created list(s): 3" in out.getvalue()
+
+    assert list(
+        Shopping.objects.filter(template=False).order_by("planning").values_list(
+            "title", "planning"
+        )
+    ) == [
+        ("Weekly", planning + datetime.timedelta(days=v))
+        for v in (0, 7, 14)
+    ]
+    template.refresh_from_db()
+    assert template.planning == planning + datetime.timedelta(days=21)
+
+    # Nothing is due anymore except with the ahead option
+    out = StringIO()
+    call_command("shopping_recurrences", stdout=out)
+    assert "Created list(s): 0" in out.getvalue()
+
+    out = StringIO()
+    call_command("shopping_recurrences", "--ahead=7", stdout=out)
+    assert "Created list(s): 1" in out.getvalue()
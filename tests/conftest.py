@@ -78,3 +78,15 @@ def tests_settings():
                 print(tests_settings.format("Application version: {VERSION}"))
     """
     return FixturesSettingsTestMixin()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Clear the default cache before each test so cached data from a previous test
+    can not be used, since catalog versions are only bumped once committed and test
+    transactions are never committed.
+    """
+    from django.core.cache import cache
+
+    cache.clear()